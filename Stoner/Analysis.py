@@ -1,7 +1,9 @@
 """Stoner .Analysis provides a subclass of :class:`.Data` that has extra analysis routines builtin."""
 
 __all__ = ["AnalysisMixin", "GetAffineTransform", "ApplyAffineTransform"]
-from inspect import getfullargspec
+from inspect import getfullargspec, signature
+from weakref import WeakKeyDictionary
+
 import numpy as np
 import numpy.ma as ma
 
@@ -11,11 +13,83 @@ from scipy.optimize import curve_fit
 from .tools import isIterable, isTuple
 from .compat import string_types
 from .core.exceptions import assertion
-from .analysis.utils import threshold as _threshold, ApplyAffineTransform, GetAffineTransform
+from .analysis.utils import crossings, ApplyAffineTransform, GetAffineTransform
+
+try:  # numba is an optional dependency
+    from numba import njit
+except ImportError:
+    njit = None
+
+_TRIAL_ROWS = 5  # Size of the block of rows used to test whether a function will vectorise
+_jit_loops = WeakKeyDictionary()
 
 # from matplotlib.pylab import * #Surely not?
 
 
+def _vectorises(func, data, expected, kargs):
+    """Check whether calling func on a block of rows gives the same answer as calling it row by row.
+
+    Args:
+        func (callable):
+            The function being applied.
+        data (DataArray):
+            The first few rows of data.
+        expected (ndarray):
+            The result of calling *func* on each row of *data* in turn.
+        kargs (dict):
+            Keyword arguments for *func*.
+
+    Returns:
+        (bool):
+            True if *func* can be called with the whole data array.
+    """
+    try:
+        trial = func(data, **kargs)
+        trial = np.ma.filled(np.ma.asarray(trial, dtype=float), np.nan)
+    except Exception:  # pylint: disable=broad-except
+        return False
+    if trial.shape != expected.shape:
+        return False
+    return np.allclose(trial, np.ma.filled(expected, np.nan), equal_nan=True)
+
+
+def _jit_apply(func, data, out, kargs):
+    """Apply a function to each row of data with a loop compiled by numba.
+
+    Args:
+        func (callable):
+            The function to apply to each row - this will be passed plain 1D numpy arrays.
+        data (ndarray):
+            The data to work through.
+        out (ndarray):
+            The array to write the results into.
+        kargs (dict):
+            Keyword arguments for *func*, these are passed to the compiled function positionally.
+
+    Returns:
+        (bool):
+            True if the function could be compiled and run, False otherwise.
+    """
+    if njit is None:
+        return False
+    try:
+        bound = signature(func).bind(None, **kargs)
+        bound.apply_defaults()
+        args = tuple(bound.arguments.values())[1:]
+        if func not in _jit_loops:
+            row_func = njit(func)
+
+            def _loop(data, out, args):
+                for ix in range(data.shape[0]):
+                    out[ix] = row_func(data[ix], *args)
+
+            _jit_loops[func] = njit(_loop)
+        _jit_loops[func](np.ascontiguousarray(np.ma.getdata(data), dtype=float), out, args)
+    except Exception:  # pylint: disable=broad-except
+        return False
+    return True
+
+
 class AnalysisMixin:
 
     """A mixin calss designed to work with :py:class:`Stoner.Core.DataFile` to provide additional analysis methods."""
@@ -28,7 +102,7 @@ class AnalysisMixin:
         attr = list(set(attr))
         return sorted(attr)
 
-    def apply(self, func, col=None, replace=True, header=None, **kargs):
+    def apply(self, func, col=None, replace=True, header=None, vectorised=None, jit=False, **kargs):
         """Apply the given function to each row in the data set and adds to the data set.
 
         Args:
@@ -42,6 +116,16 @@ class AnalysisMixin:
                 Either replace the existing column/complete data or create a new column or data file.
             header (string or None):
                 The new column header(s) (defaults to the name of the function func
+            vectorised (bool or None):
+                If True, *func* is called once with the whole of the data and should return the column (or all the
+                rows) of results. If False, *func* is called for each row in turn. If None (the default), *func* is
+                tried on a small block of rows and the whole data is passed to it if that gives the same answer as
+                calling it row by row. Detection calls *func* on the first few rows, then once on a block of those
+                rows and once on the whole data, so functions with side effects should set *vectorised* explicitly.
+            jit (bool):
+                If True and numba is installed, compile *func* and the loop over the rows. The compiled function is
+                passed plain numpy arrays for each row, so cannot use the column assignment attributes. If the
+                function cannot be compiled, it is applied as normal.
 
         Note:
             If any extra keyword arguments are supplied then these are passed to the function directly. If
@@ -59,35 +143,43 @@ class AnalysisMixin:
             value to be a new datafile, leaving the original unchanged. The *headers* parameter can give the complete
             column headers for the new data file.
 
+            Functions that only use numpy operations, such as::
+
+                def func(row, omega=1.0):
+                    return np.sin(row.y * omega)
+
+            will work equally well on the whole 2D data array, where *row.y* is the y column, and are evaluated in
+            a single call. A function that replaces a single existing column writes its result straight into that
+            column without reallocating the data.
+
         Returns:
             (:py:class:`Stoner.Data`):
                 The newly modified Data object.
         """
         if col is None:
-            col = self.setas.get("y", [0])[0]
+            setas = self.setas.to_list()
+            col = setas.index("y") if "y" in setas else 0
         col = self.find_col(col)
         kargs.update(kargs.pop("_extra", dict()))
-        # Check the dimension of the output
-        ret = func(next(self.rows()), **kargs)
-        try:
-            next(self.rows(reset=True))
-        except (RuntimeError, StopIteration):
-            pass
-        if isIterable(ret):
-            nc = np.zeros((len(self), len(ret)))
+        if vectorised:
+            nc = np.ma.asarray(func(self.data, **kargs), dtype=float)
+            if nc.ndim == 0:
+                nc = np.ma.resize(nc, len(self))
+            if nc.shape[0] != len(self):
+                raise ValueError(f"Vectorised function returned {nc.shape[0]} rows of results for {len(self)} rows")
         else:
-            nc = np.zeros(len(self))
-        # Evaluate the data row by row
-        for ix, r in enumerate(self.rows()):
-            ret = func(r, **kargs)
-            if isIterable(ret) and not isinstance(ret, np.ndarray):
-                ret = np.ma.MaskedArray(ret)
-            nc[ix] = ret
+            nc = self._apply_rows(func, vectorised is None, jit, kargs)
         # Work out how to handle the result
         if nc.ndim == 1:
             if header is None:
                 header = func.__name__
-            self.add_column(nc, header=header, index=col, replace=replace, setas=self.setas[col])
+            if replace and col < self.shape[1]:  # Write straight into the existing column
+                self.data[:, col] = nc
+                headers = self.column_headers
+                headers[col] = header
+                self.column_headers = headers
+            else:
+                self.add_column(nc, header=header, index=col, replace=replace, setas=self.setas[col])
             ret = self
         else:
             if not replace:
@@ -99,6 +191,51 @@ class AnalysisMixin:
                 ret.column_headers = header
         return ret
 
+    def _apply_rows(self, func, detect, jit, kargs):
+        """Evaluate a function for each row of the data for :py:meth:`AnalysisMixin.apply`.
+
+        Args:
+            func (callable):
+                The function to apply.
+            detect (bool):
+                Whether to check if *func* will work with the whole data array at once.
+            jit (bool):
+                Whether to try compiling the loop over the rows with numba.
+            kargs (dict):
+                Keyword arguments for *func*.
+
+        Returns:
+            (ndarray):
+                A 1D array if *func* returns a single value, or a 2D array if it returns rows.
+        """
+        trial = min(len(self), _TRIAL_ROWS)
+        head = []
+        # Check the dimension of the output from the first few rows
+        for ix, r in enumerate(self.rows()):
+            if ix >= (trial if detect else 1):
+                break
+            head.append(func(r, **kargs))
+        ret = head[0]
+        if isIterable(ret):
+            nc = np.zeros((len(self), len(ret)))
+        else:
+            nc = np.zeros(len(self))
+        if detect and trial > 1:
+            expected = np.ma.array([np.ma.MaskedArray(r) if isIterable(r) else r for r in head], dtype=float)
+            if _vectorises(func, self.data[:trial], expected, kargs):
+                result = np.ma.asarray(func(self.data, **kargs), dtype=float)
+                if result.shape == nc.shape:  # Otherwise it only looked vectorised on the trial rows
+                    return result
+        if jit and _jit_apply(func, self.data, nc, kargs):
+            return nc
+        # Evaluate the data row by row, reusing the results for the rows that have already been done
+        for ix, r in enumerate(self.rows()):
+            ret = head[ix] if ix < len(head) else func(r, **kargs)
+            if isIterable(ret) and not isinstance(ret, np.ndarray):
+                ret = np.ma.MaskedArray(ret)
+            nc[ix] = ret
+        return nc
+
     def clip(self, clipper, column=None):
         """Clips the data based on the column and the clipper value.
 
@@ -473,8 +610,9 @@ class AnalysisMixin:
                 Value to look for in column col
 
         Keyword Arguments:
-            col (index):
-                Column index to look for data in
+            col (index or list of indices):
+                Column index to look for data in. If a list of several columns is given, they are all searched
+                together and a list of the results for each column is returned.
             rising (bool):
                 look for case where the data is increasing in value (defaukt True)
             falling (bool):
@@ -497,6 +635,9 @@ class AnalysisMixin:
             If you don't sepcify a col value or set it to None, then the assigned columns via the
             :py:attr:`DataFile.setas` attribute will be used.
 
+            The crossings for all the columns, or for all the values of an iterable *threshold*, are found in a
+            single pass over the data.
+
         Warning:
             There has been an API change. Versions prior to 0.1.9 placed the column before the threshold in the
             positional argument list. In order to support the use of assigned columns, this has been swapped to the
@@ -505,7 +646,8 @@ class AnalysisMixin:
         DataArray = type(self.data)
         col = kargs.pop("col", None)
         xcol = kargs.pop("xcol", None)
-        _ = self._col_args(xcol=xcol, ycol=col)
+        several = isIterable(col) and not isinstance(col, string_types) and len(col) > 1
+        _ = self._col_args(xcol=xcol, ycol=col, scalar=not several)
 
         col = _.ycol
         if xcol is None and _.has_xcol:
@@ -515,16 +657,24 @@ class AnalysisMixin:
         falling = kargs.pop("falling", False)
         all_vals = kargs.pop("all_vals", False)
 
+        if several:
+            assertion(not isIterable(threshold), "Only a single threshold can be used with several columns")
+            found, roots = crossings(threshold, self.column(col), rising=rising, falling=falling)
+            return [self._threshold_result(roots[found == ix], xcol, all_vals) for ix in range(len(col))]
+
         current = self.column(col)
 
-        # Recursively call if we've got an iterable threshold
+        # Find the crossings of all the thresholds together if we've got an iterable threshold
         if isIterable(threshold):
             if isinstance(xcol, bool) and not xcol:
                 ret = np.zeros((len(threshold), self.shape[1]))
             else:
                 ret = np.zeros_like(threshold).view(type=DataArray)
-            for ix, th in enumerate(threshold):
-                ret[ix] = self.threshold(th, col=col, xcol=xcol, rising=rising, falling=falling, all_vals=all_vals)
+            found, roots = crossings(
+                0.0, np.subtract.outer(current, np.asarray(threshold, dtype=float)), rising=rising, falling=falling
+            )
+            for ix in range(len(threshold)):
+                ret[ix] = self._threshold_result(roots[found == ix], xcol, all_vals)
             # Now we have to clean up the  retujrn list into a DataArray
             if isinstance(xcol, bool) and not xcol:  # if xcol was False we got a complete row back
                 ch = self.column_headers
@@ -542,7 +692,12 @@ class AnalysisMixin:
                     ret.column_headers = ["Index"]
                     ret.isrow = False
             return ret
-        ret = _threshold(threshold, current, rising=rising, falling=falling)
+        ret = crossings(threshold, current, rising=rising, falling=falling)[1]
+        return self._threshold_result(ret, xcol, all_vals)
+
+    def _threshold_result(self, ret, xcol, all_vals):
+        """Build the result of :py:meth:`AnalysisMixin.threshold` from fractional row indices of the crossings."""
+        DataArray = type(self.data)
         if not all_vals:
             ret = [ret[0]] if np.any(ret) else []
 
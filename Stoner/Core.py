@@ -29,16 +29,17 @@ from numpy import ma
 
 from .compat import string_types, int_types, index_types, _pattern_type
 from .tools import all_type, isIterable, isLikeList, get_option
-from .tools.file import get_file_name_type, auto_load_classes
+from .tools.file import get_file_name_type, auto_load_classes, load_selects, row_index
 
 from .core.exceptions import StonerLoadError, StonerSetasError
 from .core import _setas, regexpDict, typeHintedDict, metadataObject
-from .core.array import DataArray
+from .core.array import DataArray, _RowBuffer
 from .core.operators import DataFileOperatorsMixin
 from .core.property import DataFilePropertyMixin
 from .core.interfaces import DataFileInterfacesMixin
 from .core.methods import DataFileSearchMixin
 from .core.utils import copy_into, tab_delimited
+from .core.stream import TDIStreamReader
 from .tools.classes import subclasses
 from .tools.file import file_dialog
 
@@ -437,6 +438,8 @@ class DataFile(
         result = cls.__new__(cls)
         memo[id(self)] = result
         for k, v in self.__dict__.items():
+            if k in ["_row_buffer", "_interpolants"]:  # Spare row capacity and cached interpolants are not copied
+                continue
             try:
                 setattr(result, k, copy.deepcopy(v, memo))
             except (TypeError, ValueError, RecursionError):
@@ -562,10 +565,51 @@ class DataFile(
     def _getattr_col(self, name):
         """Get a column using the setas attribute."""
         try:
-            return self._data.__getattr__(name)
+            return self.data.__getattr__(name)
         except StonerSetasError:
             return None
 
+    def _insert_rows(self, row, new_data, mask=None):
+        """Insert rows of data through a buffer with spare capacity so that growing the data row by row is cheap.
+
+        Args:
+            row (int):
+                Data row to insert the new rows before - len(self) appends them.
+            new_data (2D array):
+                The new rows of data, with the same number of columns as the main data array.
+
+        Keyword Arguments:
+            mask (bool or array, None):
+                The mask for the new rows. Default is to use the mask of *new_data*, if any.
+
+        Notes:
+            :py:attr:`DataFile.data` is left as a view onto the occupied part of a :py:class:`_RowBuffer` which
+            doubles its capacity when it fills up. If the data has been replaced since the last insert the buffer
+            is rebuilt from the current data first. The buffer is also copied rather than changed in place once the
+            data has been handed out through :py:attr:`DataFile.data`, so that rows never change underneath another
+            reference.
+        """
+        data = self._data
+        new_data = np.atleast_2d(new_data)
+        if data.ndim != 2 or new_data.ndim != 2 or new_data.shape[1] != data.shape[1]:
+            self.data = np.insert(self.data, row, new_data, 0)
+            return self
+        rows = data.shape[0]
+        if row < 0:
+            row += rows
+        if not 0 <= row <= rows:
+            raise IndexError(f"Row {row} is out of bounds for data with {rows} rows.")
+        mask = ma.getmaskarray(new_data) if mask is None else mask
+        dtype = np.result_type(data.dtype, ma.getdata(new_data).dtype)
+        buffer = self.__dict__.get("_row_buffer", None)
+        if buffer is None or buffer.data.dtype != dtype or not buffer.owns(data) or buffer.exported:
+            buffer = _RowBuffer(data, rows + new_data.shape[0], dtype)
+        buffer.insert(row, ma.getdata(new_data), mask)
+        # Bypass __setattr__ - the buffer and the view it hands out are already in the right form
+        self.__dict__["_row_buffer"] = buffer
+        object.__setattr__(self, "_data", buffer.view(data._setas, data.fill_value if dtype == data.dtype else None))
+        return self
+
     def _interesting_cols(self, cols):
         """Workout which columns the user might be interested in in the basis of the setas.
 
@@ -618,13 +662,69 @@ class DataFile(
                 col_assignments.append("")
         return interesting, col_assignments, cols
 
-    def _load(self, filename, *args, **kargs):
+    def _load_columns(self, column_headers, columns):
+        """Work out which columns of a file to read for the *columns* argument to :py:meth:`load`.
+
+        Args:
+            column_headers (list of str):
+                The column headers in the file.
+            columns (index types or None):
+                The columns to load, using the same rules as :py:meth:`find_col`.
+
+        Returns:
+            (list of int or None):
+                The indices of the columns to read, or None to read all the columns.
+        """
+        if columns is None:
+            return None
+        finder = DataArray(np.zeros((0, len(column_headers))))
+        finder.column_headers = list(column_headers)
+        ret = []
+        for col in finder._setas.find_col(columns, force_list=True):
+            ret.extend(col if isinstance(col, list) else [col])
+        return ret
+
+    def _select(self, columns=None, rows=None):
+        """Keep just some of the columns and rows of newly loaded data.
+
+        Keyword Arguments:
+            columns (index types or None):
+                The columns to keep, using the same rules as :py:meth:`find_col`.
+            rows (int, slice, sequence of int or None):
+                The rows to keep.
+
+        Returns:
+            (DataFile):
+                This object with just the selected data.
+
+        Notes:
+            This is used by :py:meth:`load` for file formats whose *_load* method does not take *columns* and *rows*
+            keyword arguments to read just the data that was asked for.
+        """
+        if columns is not None:
+            cols = self._load_columns(self.column_headers, columns)
+            headers = self.column_headers
+            setas = self.setas.to_list()
+            self.data = self.data[:, cols]
+            self.column_headers = [headers[ix] for ix in cols]
+            self.setas = [setas[ix] for ix in cols]
+        if rows is not None:
+            self.data = self.data[row_index(rows)]
+        return self
+
+    def _load(self, filename, *args, columns=None, rows=None, **kargs):
         """Actually load the data from disc assuming a .tdi file format.
 
         Args:
             filename (str):
                 Path to filename to be loaded. If None or False, a dialog bax is raised to ask for the filename.
 
+        Keyword Arguments:
+            columns (index types or None):
+                If given, only read these columns from the file.
+            rows (int, slice, sequence of int or None):
+                If given, only keep these rows of data.
+
         Returns:
             DataFile:
                 A copy of the newly loaded :py:class`DataFile` object.
@@ -667,6 +767,12 @@ class DataFile(
                 if "=" in metadata[0]:
                     self.metadata.import_key(metadata[0])
         col_headers_tmp = [x.strip() for x in row[1:]]
+        col_headers_tmp += [f"Column {ix}" for ix in range(len(col_headers_tmp), cols - 1)]  # Unnamed columns
+        usecols = self._load_columns(col_headers_tmp, columns)
+        if usecols is None:
+            usecols = range(cols - 1)
+        else:
+            col_headers_tmp = [col_headers_tmp[ix] for ix in usecols]
         with warnings.catch_warnings():
             warnings.filterwarnings("ignore", "Some errors were detected !")
             data = np.genfromtxt(
@@ -674,13 +780,15 @@ class DataFile(
                 skip_header=1,
                 usemask=True,
                 delimiter="\t",
-                usecols=range(1, cols),
+                usecols=[ix + 1 for ix in usecols],
                 invalid_raise=False,
                 comments="\0",
                 missing_values=[""],
                 filling_values=[np.nan],
                 max_rows=max_rows,
             )
+        if data.ndim < 2 and len(usecols) == 1:  # A single column comes back as 1D
+            data = data.reshape(-1, 1)
         if data.ndim < 2:
             breakpoint()
             data = np.ma.atleast_2d(data)
@@ -689,7 +797,7 @@ class DataFile(
         self["TDI Format"] = fmt
         if self.data.ndim == 2 and self.data.shape[1] > 0:
             self.column_headers = col_headers_tmp
-        return self
+        return self._select(rows=rows)
 
     # def _parse_metadata(self, key, value):
     #     """Parse the metadata string, removing the type hints into a separate dictionary from the metadata.
@@ -1337,6 +1445,8 @@ class DataFile(
             self:
                 A copy of the modified :py:class:`DataFile` object
         """
+        if isinstance(row, int_types):
+            return self._insert_rows(row, new_data)
         self.data = np.insert(self.data, row, new_data, 0)
         return self
 
@@ -1353,6 +1463,11 @@ class DataFile(
                 load the file
             filetype (:py:class:`DataFile`, str):
                 If not none then tries using filetype as the loader.
+            columns (index types):
+                Only load these columns of the file, using the same rules as :py:meth:`find_col` with the column
+                headers in the file.
+            rows (int, slice, sequence of int):
+                Only load these rows of data from the file.
 
         Returns:
             (DataFile):
@@ -1369,28 +1484,33 @@ class DataFile(
             can have higher priority levels. Classes should return a suitable expcetion if they fail to load the file.
 
             If not class can load a file successfully then a RunttimeError exception is raised.
+
+            Formats whose *_load* method takes *columns* and *rows* keyword arguments read just the selected data
+            from the file, for other formats the rest of the data is dropped straight after the file is read.
         """
         filename = kargs.pop("filename", args[0] if len(args) > 0 else None)
         filetype = kargs.pop("filetype", None)
         auto_load = kargs.pop("auto_load", filetype is None)
+        selection = {key: kargs.pop(key) for key in ("columns", "rows") if kargs.get(key, None) is not None}
 
         filename, filetype = get_file_name_type(filename, filetype, DataFile)
         cls = type(self)
         if auto_load:  # We're going to try every subclass we canA
-            copy_into(auto_load_classes(filename, DataFile, debug=False, args=args, kargs=kargs), self)
+            test = auto_load_classes(filename, DataFile, debug=False, args=args, kargs=kargs, selection=selection)
         else:
             if issubclass(filetype, DataFile):
                 test = filetype()
-                test = test._load(filename, *args, **kargs)
-                copy_into(test, self)
-                self["Loaded as"] = filetype.__name__
             elif filetype is None or isinstance(filetype, DataFile):
                 test = DataFile()
-                test = test._load(filename, *args, **kargs)
-                copy_into(test, self)
-                self["Loaded as"] = DataFile.__name__
             else:
                 raise ValueError(f"Unable to load {filename}")
+            extra = selection if load_selects(type(test)) else {}
+            test = test._load(filename, *args, **kargs, **extra)
+        if selection and not load_selects(type(test)):
+            test._select(**selection)
+        copy_into(test, self)
+        if not auto_load:
+            self["Loaded as"] = type(test).__name__
 
         for k, i in kargs.items():
             if not callable(getattr(self, k, lambda x: False)):
@@ -1539,6 +1659,27 @@ class DataFile(
         self.filename = filename
         return self
 
+    def stream(self, filename=None, chunk_size=1 << 20):
+        """Follow a TDI file that is still being written, loading only the new rows each time it is read.
+
+        Args:
+            filename (str or None):
+                The file to follow. If None, then the current filename is used.
+            chunk_size (int):
+                The largest number of bytes of the file to read and parse at once.
+
+        Returns:
+            (TDIStreamReader):
+                A reader that loads the rows appended to the file into this object through its :py:meth:`read`
+                method, or yields the new rows as they arrive from its :py:meth:`follow` generator or
+                :py:meth:`afollow` asynchronous generator.
+
+        Notes:
+            Unlike :py:meth:`load`, the file is never re-read from the start, so this is suitable for live plotting
+            and analysis of large log files. The current data of this object is replaced when the header is read.
+        """
+        return TDIStreamReader(self, filename, chunk_size)
+
     def swap_column(self, *swp, **kargs):
         """Swap pairs of columns in the data.
 
@@ -19,6 +19,7 @@ import numpy as _np_
 
 from .compat import string_types, bytes2str, get_filedialog, path_types
 from .Core import StonerLoadError, metadataObject, DataFile
+from .tools.file import row_index
 from .folders import DataFolder
 from .Image.core import ImageFile, ImageArray
 
@@ -45,6 +46,47 @@ def close_file(f, filename):
     return ret
 
 
+def _read_hyperslab(data, rows=None, cols=None):
+    """Read just the rows and columns wanted from a 2D h5py dataset.
+
+    Args:
+        data (h5py.Dataset):
+            The dataset to read from.
+
+    Keyword Arguments:
+        rows (slice, sequence of int or None):
+            The rows to read, all of them if None.
+        cols (list of int or None):
+            The columns to read (in this order), all of them if None.
+
+    Returns:
+        (ndarray):
+            The selected part of the dataset.
+
+    Notes:
+        Slices of rows and sorted, unique lists of columns are passed to h5py so that only the selected part of the
+        dataset is read from the file. Anything else is read in that form and then re-indexed in memory.
+    """
+    if data.ndim != 2:
+        ret = data[...]
+        return ret if rows is None else ret[rows]
+    row_sel = rows if rows is None or isinstance(rows, slice) else _np_.asarray(rows)
+    if isinstance(row_sel, slice) and row_sel.step not in (None, 1):  # h5py can't do negative steps
+        row_sel = _np_.arange(data.shape[0])[row_sel]
+    if isinstance(row_sel, _np_.ndarray):
+        row_read = _np_.unique(row_sel % max(data.shape[0], 1))
+        row_sel = _np_.searchsorted(row_read, row_sel % max(data.shape[0], 1))
+    else:
+        row_read, row_sel = (slice(None) if row_sel is None else row_sel), slice(None)
+    col_read = sorted(set(cols)) if cols is not None else slice(None)
+    col_sel = [col_read.index(c) for c in cols] if cols is not None else slice(None)
+    if isinstance(row_read, _np_.ndarray) and cols is not None:  # h5py only allows one list index at a time
+        ret = data[:, col_read][row_read]
+    else:
+        ret = data[row_read, col_read]
+    return ret[row_sel][:, col_sel]
+
+
 def confirm_hdf5(filename):
     """Sniff a file to look for the HDF5 signature.
 
@@ -153,13 +195,19 @@ class HDF5File(DataFile):
         if grp is not None:
             self._load(grp, **kargs)
 
-    def _load(self, filename, *args, **kargs):
+    def _load(self, filename, *args, columns=None, rows=None, **kargs):
         """Load data from a hdf5 file.
 
         Args:
             h5file (string or h5py.Group):
                 Either a string or an h5py Group object to load data from
 
+        Keyword Arguments:
+            columns (index types or None):
+                If given, only read these columns of the data.
+            rows (int, slice, sequence of int or None):
+                If given, only read these rows of the data.
+
         Returns:
             self:
                 This object after having loaded the data
@@ -192,13 +240,22 @@ class HDF5File(DataFile):
         if loader is None:
             _raise_error(f, message="Could not et loader for {bytes2str(f.attrs['module'])}.{typ}")
 
+        if typ == type(self).__name__:
+            kargs.update(columns=columns, rows=rows)
         loader(f, *args, instance=self, **kargs)
+        if typ != type(self).__name__:
+            self._select(columns=columns, rows=rows)
         return self
 
     @classmethod
     def read_HDF(cls, filename, *args, **kargs):  # pylint: disable=unused-argument
-        """Create a new HDF5File from an actual HDF file."""
+        """Create a new HDF5File from an actual HDF file.
+
+        The *columns* and *rows* keyword arguments select the part of the *data* dataset to read from the file.
+        """
         self = kargs.pop("instance", cls())
+        columns = kargs.pop("columns", None)
+        rows = row_index(kargs.pop("rows", None))
         if filename is None or not filename:
             self.get_filename("r")
             filename = self.filename
@@ -215,8 +272,13 @@ class HDF5File(DataFile):
             _raise_error(f, message=f"Couldn't interpret {filename} as a valid HDF5 file or group or filename")
 
         data = f["data"]
+        if "column_headers" in f.attrs:
+            column_headers = [bytes2str(x) for x in f.attrs["column_headers"]]
+        else:
+            column_headers = []
+        usecols = self._load_columns(column_headers, columns)
         if _np_.product(_np_.array(data.shape)) > 0:
-            self.data = data[...]
+            self.data = _read_hyperslab(data, rows, usecols)
         else:
             self.data = [[]]
         metadata = f.require_group("metadata")
@@ -230,6 +292,8 @@ class HDF5File(DataFile):
             if isinstance(self.column_headers, string_types):
                 self.column_headers = self.metadata.string_to_type(self.column_headers)
             self.column_headers = [bytes2str(x) for x in self.column_headers]
+            if usecols is not None:
+                self.column_headers = [self.column_headers[ix] for ix in usecols]
         else:
             raise StonerLoadError("Couldn't work out where my column headers were !")
         for i in sorted(metadata.attrs):
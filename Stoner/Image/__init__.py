@@ -19,9 +19,32 @@ __all__ = [
     "KerrStack",
     "MaskStack",
 ]
-from .core import ImageArray, ImageFile
-from .folders import ImageFolder
-from .stack import ImageStack
-from .kerr import KerrArray, KerrStack, MaskStack
-from . import attrs
-from . import widgets
+from importlib import import_module
+
+# Where to find each of the public names - they are only imported when first used (PEP 562).
+_lazy_attrs = {
+    "ImageArray": ".core",
+    "ImageFile": ".core",
+    "ImageFolder": ".folders",
+    "ImageStack": ".stack",
+    "KerrArray": ".kerr",
+    "KerrStack": ".kerr",
+    "MaskStack": ".kerr",
+}
+
+
+def __getattr__(name):
+    """Import the submodules and image classes on first access."""
+    if name in _lazy_attrs:
+        value = getattr(import_module(_lazy_attrs[name], __name__), name)
+    elif name in __all__:
+        value = import_module(f".{name}", __name__)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Include the lazily imported names in the module's dir()."""
+    return sorted(set(globals()) | set(__all__))
@@ -332,7 +332,7 @@ class ImageArray(np.ma.MaskedArray, metadataObject):
         setattr(self, "_optinfo", copy(_extra_attributes))
         for k, v in list(_extra_attributes.items()):
             try:
-                setattr(self, k, getattr(obj, k, v))
+                setattr(self, k, getattr(obj, k) if hasattr(obj, k) else copy(v))  # Never share the default dict
             except AttributeError:  # Some versions of  python don't like this
                 pass
         super().__array_finalize__(obj)
@@ -6,6 +6,8 @@ from importlib import import_module
 from os import path
 from json import loads, dumps
 from copy import deepcopy, copy
+from itertools import islice, repeat
+from os import cpu_count
 
 from skimage.viewer import CollectionViewer
 import numpy as np
@@ -15,9 +17,80 @@ from PIL import Image
 
 from .core import ImageArray
 from ..Folders import DiskBasedFolderMixin, baseFolder
+from ..folders.utils import get_pool
 from ..compat import string_types, int_types
 from . import ImageFile
 
+class _RunningMoments:
+
+    """Accumulate the pixel-wise weighted mean and sum of squared deviations of a sequence of images.
+
+    Images are added one at a time with West's weighted form of Welford's algorithm and partial results are
+    combined with Chan et al.'s pairwise update, so only three image sized arrays are ever held in memory.
+    Masked pixels contribute zero weight.
+
+    Attributes:
+        weight (ndarray):
+            The sum of the weights for each pixel.
+        mean (ndarray):
+            The weighted running mean of each pixel.
+        m2 (ndarray):
+            The weighted sum of squared deviations from the mean for each pixel.
+    """
+
+    def __init__(self):
+        """Start with an empty accumulator."""
+        self.weight = None
+        self.mean = None
+        self.m2 = None
+
+    def push(self, image, weight=1.0):
+        """Add a single image with a scalar or per-pixel weight."""
+        data = np.ma.getdata(image).astype(float)
+        weight = np.where(np.ma.getmaskarray(image), 0.0, weight)
+        if self.weight is None:
+            self.weight = np.zeros(data.shape)
+            self.mean = np.zeros(data.shape)
+            self.m2 = np.zeros(data.shape)
+        total = self.weight + weight
+        delta = data - self.mean
+        self.mean += delta * np.divide(weight, total, out=np.zeros_like(total), where=total != 0)
+        self.m2 += weight * delta * (data - self.mean)
+        self.weight = total
+        return self
+
+    def push_block(self, data, weight):
+        """Add a block of images stacked along the last axis with matching per-pixel weights."""
+        total = weight.sum(axis=-1)
+        other = _RunningMoments()
+        other.weight = total
+        other.mean = np.divide((weight * data).sum(axis=-1), total, out=np.zeros(total.shape), where=total != 0)
+        other.m2 = (weight * (data - other.mean[..., None]) ** 2).sum(axis=-1)
+        return self.merge(other)
+
+    def merge(self, other):
+        """Combine the partial result held in *other* into this accumulator."""
+        if other.weight is None:
+            return self
+        if self.weight is None:
+            self.weight, self.mean, self.m2 = other.weight, other.mean, other.m2
+            return self
+        total = self.weight + other.weight
+        delta = other.mean - self.mean
+        ratio = np.divide(other.weight, total, out=np.zeros_like(total), where=total != 0)
+        self.mean += delta * ratio
+        self.m2 += other.m2 + delta**2 * self.weight * ratio
+        self.weight = total
+        return self
+
+
+def _accumulate(chunk):
+    """Reduce a list of (image, weight) pairs to a :py:class:`_RunningMoments` - used as a pool worker."""
+    moments = _RunningMoments()
+    for image, weight in chunk:
+        moments.push(image, weight)
+    return moments
+
 
 class ImageFolderMixin:
 
@@ -131,6 +204,14 @@ class ImageFolderMixin:
         Returns:
             The aligned ImageFolder.
         """
+        ref_data = self._align_reference(*args)
+        # Call align on each object
+        self.each.align(ref_data, **kargs)
+        self._align_limits()
+        return self
+
+    def _align_reference(self, *args):
+        """Work out the reference image data for an align call from the positional arguments."""
         if len(args) == 1:
             ref = args[0]
         elif len(args) == 0:
@@ -155,8 +236,10 @@ class ImageFolderMixin:
                     raise TypeError()
             except (TypeError, ValueError) as err:
                 raise TypeError(f"Cannot interpret {type(ref)} as reference image data.") from err
-        # Call align on each object
-        self.each.align(ref_data, **kargs)
+        return ref_data
+
+    def _align_limits(self):
+        """Set the folder's translation_limits and align_box metadata from the individual images' limits."""
         limits = self.metadata.slice("translation_limits", output="array")
         stack_limits = np.zeros(4)
         stack_limits[::2] = limits.max(axis=0)[::2]
@@ -165,7 +248,6 @@ class ImageFolderMixin:
         stack_limits[::2] = np.ceil(stack_limits)[::2]
         stack_limits[1::2] = np.floor(stack_limits)[1::2]
         self.metadata["align_box"] = tuple(stack_limits.astype(int))
-        return self
 
     def apply_all(self, func, *args, **kargs):
         """Apply function to all images in the stack.
@@ -182,12 +264,87 @@ class ImageFolderMixin:
         warn("apply_all is depricated and will be removed in a future version. Use ImageFolder.each() instead")
         return self.each(func, *args, **kargs)
 
-    def average(self, weights=None, _box=False, _metadata="first"):
-        """Get an array of average pixel values for the stack.
+    def _moments(self, weights=None, _serial=False, _chunk=8):
+        """Stream the images through a :py:class:`_RunningMoments` accumulator.
 
-        Pass through to numpy average
+        Keyword Arguments:
+            weights (list of float or ndarray, None):
+                One weight per image - either a scalar or an array the same shape as the images.
+            _serial (bool):
+                If True, do not use a multiprocessing pool even if the multiprocessing option is set.
+            _chunk (int):
+                The number of images given to each worker when running in parallel.
+
+        Returns:
+            (_RunningMoments):
+                The combined weighted mean and sum of squared deviations of the images.
+        """
+        if weights is None:
+            weights = repeat(1.0)
+        elif len(weights) != len(self):
+            raise ValueError(f"Need one weight per image, got {len(weights)} weights for {len(self)} images.")
+        jobs = zip(self._stream_images(), weights)
+        moments = _RunningMoments()
+        p, imap = get_pool(_serial)
+        if p is None:
+            for image, weight in jobs:
+                moments.push(image, weight)
+        else:
+            # Hand out a bounded number of chunks at a time so the pool does not read the whole folder in at once
+            batch = cpu_count() or 1
+            while True:
+                chunks = [chunk for chunk in (list(islice(jobs, _chunk)) for _ in range(batch)) if chunk]
+                if not chunks:
+                    break
+                for part in imap(_accumulate, chunks):
+                    moments.merge(part)
+            p.close()
+            p.join()
+        if moments.weight is None:
+            raise RuntimeError("Cannot average an empty Imagefolder")
+        return moments
+
+    def _stream_images(self):
+        """Iterate over the images without keeping the ones that had to be read from disk in memory.
+
+        Raises:
+            RuntimeError:
+                If the images are not all the same shape.
+        """
+        unload = getattr(self, "unload", None)
+        shape = None
+        for name in self.__names__():
+            loaded = not isinstance(self.__getter__(name, instantiate=None), string_types)
+            img = self.__getter__(name, instantiate=True)
+            if img is None:
+                continue
+            img = img if isinstance(img, np.ndarray) else img.image
+            if shape is None:
+                shape = img.shape
+            elif img.shape != shape:
+                raise RuntimeError("Cannot average Imagefolder if images have different sizes")
+            yield img
+            if not loaded and unload is not None:
+                unload(name)
+
+    def _reduced(self, result, weight, _box=False, _metadata="first"):
+        """Wrap up the result of a reduction over the images as an image of the folder's type."""
+        ret = result.view(ImageArray)
+        if np.any(weight == 0):  # Pixels that were masked in every image
+            ret.mask = weight == 0
+        if _metadata == "common":
+            ret.metadata = self.metadata.common_metadata
+        elif _metadata == "first":
+            ret.metadata = deepcopy(self[0].metadata)
+        return self._type(ret[ret._box(_box)])
+
+    def average(self, weights=None, _box=False, _metadata="first", _serial=False):
+        """Get an array of average pixel values for the stack.
 
         Keyword Arguments:
+            weights (list of float or ndarray, None):
+                One weight per image - either a scalar or an array the same shape as the images. Default equal
+                weights.
             _box (crop box):
                 Specifies the region of the array to be averaged. Default - entire image
             _metadata (str):
@@ -195,21 +352,20 @@ class ImageFolderMixin:
                 - "first": Just ise the first image's metadata
                 - "common": Find the common metadata across all images
                 - "none': no metadata from images.
+            _serial (bool):
+                If True, never use a multiprocessing pool for the partial sums.
 
         Returns:
             average(ImageArray):
                 average values
+
+        Notes:
+            The images are read one at a time and reduced with a running (Welford) mean, so memory use does not
+            grow with the number of images. Masked pixels are left out of the average; pixels that are masked in
+            every image are masked in the result.
         """
-        if not self.size:
-            raise RuntimeError("Cannot average Imagefolder if images have different sizes")
-        stack = np.stack(list(self.images), axis=0)
-        average = np.average(stack, axis=0, weights=weights)
-        ret = average.view(ImageArray)
-        if _metadata == "common":
-            ret.metadata = self.metadata.common_metadata
-        elif _metadata == "first":
-            ret.metadata = deepcopy(self[0].metadata)
-        return self._type(ret[ret._box(_box)])
+        moments = self._moments(weights, _serial=_serial)
+        return self._reduced(moments.mean, moments.weight, _box=_box, _metadata=_metadata)
 
     def loadgroup(self):
         """Load all files from this group into memory."""
@@ -275,7 +431,7 @@ class ImageFolderMixin:
         for img in self:
             img.mask.select(_selection=sel)
 
-    def mean(self, _box=False, _metadata="first"):
+    def mean(self, _box=False, _metadata="first", _serial=False):
         """Calculate the mean value of all the images in the stack.
 
         Keyword Arguments:
@@ -286,10 +442,12 @@ class ImageFolderMixin:
                 - "first": Just ise the first image's metadata
                 - "common": Find the common metadata across all images
                 - "none': no metadata from images.
+            _serial (bool):
+                If True, never use a multiprocessing pool for the partial sums.
 
         Actually a synonym for self.average with not weights
         """
-        return self.average(_box=_box, _metadata=_metadata)
+        return self.average(_box=_box, _metadata=_metadata, _serial=_serial)
 
     def montage(self, *args, **kargs):
         """Call the plot method for each metadataObject, but switching to a subplot each time.
@@ -377,10 +535,13 @@ class ImageFolderMixin:
         tight_layout()
         return ret
 
-    def stddev(self, weights=None, _box=False, _metadata="first"):
+    def stddev(self, weights=None, _box=False, _metadata="first", _serial=False):
         """Calculate weighted standard deviation for stack.
 
         Keyword Arguments:
+            weights (list of float or ndarray, None):
+                One weight per image - either a scalar or an array the same shape as the images. Default equal
+                weights.
             _box (crop box):
                 Specifies the region of the array to be averaged. Default - entire image
             _metadata (str):
@@ -388,25 +549,25 @@ class ImageFolderMixin:
                 - "first": Just ise the first image's metadata
                 - "common": Find the common metadata across all images
                 - "none': no metadata from images.
+            _serial (bool):
+                If True, never use a multiprocessing pool for the partial sums.
 
-        This is a biased standard deviation, may not be appropriate for small sample sizes
+        This is a biased standard deviation, may not be appropriate for small sample sizes. The sum of squared
+        deviations is accumulated in a single pass over the images (Welford's algorithm).
         """
-        weights = np.ones(len(self)) if weights is None else weights
-        avs = self.average(weights=weights)
-        if not isinstance(avs, np.ndarray) and hasattr(avs, "image"):
-            avs = avs.image
-        sumsqdev = np.zeros_like(avs)
-        for ix, img in enumerate(self.images):
-            sumsqdev += weights[ix] * (img - avs) ** 2
-        sumsqdev = np.sqrt(sumsqdev) / np.sum(weights, axis=0)
-        ret = sumsqdev.view(ImageArray)
-        ret.metadata = self.metadata.common_metadata
-        return self._type(ret[ret._box(_box)])
+        moments = self._moments(weights, _serial=_serial)
+        sumsqdev = np.divide(
+            np.sqrt(moments.m2), moments.weight, out=np.zeros_like(moments.m2), where=moments.weight != 0
+        )
+        return self._reduced(sumsqdev, moments.weight, _box=_box, _metadata=_metadata)
 
-    def stderr(self, weights=None, _box=False, _metadata="first"):
+    def stderr(self, weights=None, _box=False, _metadata="first", _serial=False):
         """Calculate standard error in the stack average.
 
         Keyword Arguments:
+            weights (list of float or ndarray, None):
+                One weight per image - either a scalar or an array the same shape as the images. Default equal
+                weights.
             _box (crop box):
                 Specifies the region of the array to be averaged. Default - entire image
             _metadata (str):
@@ -414,8 +575,10 @@ class ImageFolderMixin:
                 - "first": Just ise the first image's metadata
                 - "common": Find the common metadata across all images
                 - "none': no metadata from images.
+            _serial (bool):
+                If True, never use a multiprocessing pool for the partial sums.
         """
-        serr = self.stddev(weights=weights, _box=_box, _metadata=_metadata) / np.sqrt(len(self))
+        serr = self.stddev(weights=weights, _box=_box, _metadata=_metadata, _serial=_serial) / np.sqrt(len(self))
         return serr
 
     def to_tiff(self, filename):
@@ -49,6 +49,7 @@ __all__ = [
 import warnings
 import os
 import io
+from functools import lru_cache
 
 import numpy as np
 from scipy.interpolate import griddata
@@ -64,7 +65,9 @@ from Stoner.tools import isTuple, isIterable, make_Data
 
 # from .core import ImageArray
 from ..core.base import metadataObject
+from ..analysis.utils import regrid
 from .util import sign_loss, _dtype2, _supported_types, prec_loss, dtype_range, _dtype, _scale as im_scale
+from .util import geometry_cache, poly_basis, fit_profile, fft_spectrum
 from ..tools.decorators import changes_size, keep_return_type
 from .widgets import LineSelect
 from ..compat import string_types, get_filedialog  # Some things to help with Python2 and Python3 compatibility
@@ -120,6 +123,39 @@ def _scale(coord, scale=1.0, to_pixel=True):
     return coord
 
 
+def _radial_grid(shape, centre=(None, None), pixel_size=(1, 1)):
+    """Return cached complex, distance and angle co-ordinates for an image of a given shape.
+
+    Args:
+        shape (2-tuple):
+            The (rows, columns) of the image.
+
+    Keyword Arguments:
+        centre (2-tuple):
+            Co-ordinates of centre point - None for the middle of the image.
+        pixel_size (2-tuple):
+            The size of one pixel in (dx by dy).
+
+    Returns:
+        (ndarray,ndarray,ndarray):
+            Read-only arrays of the complex co-ordinates, their absolute values and their angles.
+    """
+    r, c = shape
+    cx, cy = centre
+    cx = c / 2 if cx is None else cx
+    cy = r / 2 if cy is None else cy
+    dx, dy = pixel_size
+
+    def _grid():
+        x_r = dx * (np.linspace(0, c - 1, c) - cx)
+        y_r = dy * (np.linspace(0, r - 1, r) - cy)
+        Y, X = np.meshgrid(x_r, y_r)
+        Z = -Y + (0 + 1j) * X
+        return Z, np.abs(Z), np.angle(Z)
+
+    return geometry_cache(("radial", (r, c), (float(cx), float(cy)), (float(dx), float(dy))), _grid)
+
+
 def adjust_contrast(im, lims=(0.1, 0.9), percent=True):
     """Rescale the intensity of the image.
 
@@ -510,7 +546,7 @@ def subtract_image(im, background, contrast=16, clip=True, offset=0.5):
     return im
 
 
-def fft(im, shift=True, phase=False, remove_dc=False, gaussian=None, window=None):
+def fft(im, shift=True, phase=False, remove_dc=False, gaussian=None, window=None, real=False, workers=None):
     """Perform a 2d fft of the image and shift the result to get zero frequency in the centre.
 
     Keyword Args:
@@ -527,32 +563,23 @@ def fft(im, shift=True, phase=False, remove_dc=False, gaussian=None, window=None
         window (None or str):
             If not None (default) the image is multiplied by the given window function before the fft is calculated.
             This avpoids leaking some signal into the higher frequency bands due to discontinuities at the image edges.
+        real (bool):
+            If True use a real-to-complex transform that only calculates the non-negative horizontal frequencies,
+            so the result has columns//2+1 columns. Default False.
+        workers (int or None):
+            Maximum number of threads to use for the transform (-1 for all the CPUs). Default None for one.
 
     Return:
         fft of the image, preserving metadata.
+
+    Notes:
+        The transform is done by :py:func:`Stoner.Image.util.fft_spectrum`, which caches the window function for
+        each shape of image and uses pyFFTW's planned transforms if pyFFTW is installed.
     """
-    if window:
-        window = filters.window(window, im.shape)
-        im = im.clone * window
-    r = np.fft.fft2(im)
-
-    if remove_dc:
-        fill = r.mean()
-        r[0, 0] = fill
-        r[-1, 0] = fill
-        r[-1, -1] = fill
-        r[0, -1] = fill
-    if shift:
-        r = np.fft.fftshift(r)
-    if phase is None:
-        pass
-    if not phase:
-        r = np.abs(r)
-    else:
-        r = np.angle(r)
+    r = fft_spectrum(im, shift, phase, remove_dc, window, real, workers)
     r = r.view(type(im))
     if isinstance(gaussian, (float, int)):
-        r.gaussian(gaussian)
+        r = r.gaussian(gaussian)
 
     r.metadata.update(im.metadata)
     return r
@@ -593,6 +620,10 @@ def gridimage(im, points=None, xi=None, method="linear", fill_value=None, rescal
 
         The metadata used in this case is then adjusted as well to ensure that repeated application of this method
         doesn't change the image after it has been corrected once.
+
+        Unless *rescale* is True, the interpolation is done with :py:func:`Stoner.analysis.utils.regrid`, which
+        caches the triangulation of the points, so gridding a series of images with the same sampled co-ordinates
+        only triangulates them once.
     """
     if points is None:
         points = np.column_stack((im["actual_x"].ravel(), im["actual_y"].ravel()))
@@ -605,7 +636,11 @@ def gridimage(im, points=None, xi=None, method="linear", fill_value=None, rescal
     if callable(fill_value):
         fill_value = fill_value(im)
 
-    im2 = griddata(points, im.ravel(), xi, method, fill_value, rescale)
+    if rescale:
+        im2 = griddata(points, im.ravel(), xi, method, fill_value, rescale)
+    else:
+        im2 = regrid(np.asarray(points), np.asarray(im).ravel(), tuple(xi), method)
+        im2[np.isnan(im2)] = fill_value
     im2 = type(im)(im2)
     im2.metadata = im.metadata
     im2.metadata["actual_x"] = xi[0]
@@ -720,35 +755,30 @@ def level_image(im, poly_vert=1, poly_horiz=1, box=None, poly=None, mode="clip")
     is defined then level the *entire* image according to the
     gradient within the box. The polynomial subtracted is added to the
     metadata as 'poly_vert_subtract' and 'poly_horiz_subtract'
+
+    The polynomials are fitted with :py:func:`Stoner.Image.util.fit_profile`, which factorises the basis once for
+    each length and order and leaves masked pixels out of the fit. The powers of the pixel co-ordinates used to
+    evaluate the polynomials are cached for each image size.
     """
     if box is None:
         box = im.max_box
     cim = im.crop(box=box)
-    (vertl, horizl) = cim.shape
     p_horiz = 0
     p_vert = 0
     if poly_horiz > 0:
-        comp_vert = np.average(cim, axis=0)  # average (compress) the vertical values
         if poly is not None:
             p_horiz = poly[0]
-        else:
-            p_horiz = np.polyfit(np.arange(horizl), comp_vert, poly_horiz)  # fit to the horizontal
-            av = np.average(comp_vert)  # get the average pixel height
-            p_horiz[-1] = p_horiz[-1] - av  # maintain the average image height
-        horizcoord = np.indices(im.shape)[1]  # now apply level to whole image
-        for i, c in enumerate(p_horiz):
-            im = im - c * horizcoord ** (len(p_horiz) - i - 1)
+        else:  # fit to the average (compressed) vertical values, maintaining the average image height
+            p_horiz = fit_profile(cim, 0, poly_horiz)
+        basis = poly_basis(im.shape[1], len(p_horiz) - 1)  # now apply level to whole image
+        im = im - (np.asarray(p_horiz) @ basis)[None, :]
     if poly_vert > 0:
-        comp_horiz = np.average(cim, axis=1)  # average the horizontal values
         if poly is not None:
             p_vert = poly[1]
         else:
-            p_vert = np.polyfit(np.arange(vertl), comp_horiz, poly_vert)
-            av = np.average(comp_horiz)
-            p_vert[-1] = p_vert[-1] - av  # maintain the average image height
-        vertcoord = np.indices(im.shape)[0]
-        for i, c in enumerate(p_vert):
-            im = im - c * vertcoord ** (len(p_vert) - i - 1)
+            p_vert = fit_profile(cim, 1, poly_vert)
+        basis = poly_basis(im.shape[0], len(p_vert) - 1)
+        im = im - (np.asarray(p_vert) @ basis)[:, None]
     im.metadata["poly_sub"] = (p_horiz, p_vert)
     if mode == "clip":
         im = im.clip_intensity()  # saturate any pixels outside allowed range
@@ -923,23 +953,19 @@ def radial_coordinates(im, centre=(None, None), pixel_size=(1, 1), angle=False):
 
     Returns:
         An array of the same class as the input, but with values corresponding to the radial co-ordinates.
+
+    Notes:
+        The co-ordinates are calculated once for each image shape, centre and pixel size and then cached in
+        :py:data:`Stoner.Image.util.geometry_cache`, so the returned array is a copy that can be changed freely.
     """
-    cx, cy = centre
-    r, c = im.shape
-    dx, dy = pixel_size
-    cx = c / 2 if cx is None else cx
-    cy = r / 2 if cy is None else cy
-    x_r = dx * (np.linspace(0, c - 1, c) - cx)
-    y_r = dy * (np.linspace(0, r - 1, r) - cy)
-    Y, X = np.meshgrid(x_r, y_r)
-    Z = -Y + (0 + 1j) * X
+    Z, dist, theta = _radial_grid(im.shape, centre, pixel_size)
     if angle is None:
         pass
     elif not angle:
-        Z = np.abs(Z)
+        Z = dist
     else:
-        Z = np.angle(Z)
-    Z = Z.view(type(im))
+        Z = theta
+    Z = Z.copy().view(type(im))
     Z.metadata = im.metadata
     return Z
 
@@ -966,7 +992,7 @@ def radial_profile(im, angle=None, r=None, centre=(None, None), pixel_size=(1, 1
         (Data):
             A py:class:`Stoner.Data` object with a column for r and columns for mean, std, and number of pixels.
     """
-    coords = im.radial_coordinates(centre=centre, pixel_size=pixel_size, angle=None)
+    coords, dist, theta = _radial_grid(im.shape, centre, pixel_size)
     if r is None:  # Identify the minimum edge value
         edges = np.append(coords[:, 0], coords[-1, :])
         edges = np.append(edges, coords[:, -1])
@@ -977,18 +1003,16 @@ def radial_profile(im, angle=None, r=None, centre=(None, None), pixel_size=(1, 1
     r_h = r[1:]
     r_m = (r_l + r_h) / 2
     if angle is None:
-        angle_select = np.ones_like(coords).astype(bool)
+        angle_select = np.ones(coords.shape, dtype=bool)
     elif isinstance(angle, tuple):
-        angle_low = np.angle(coords) >= angle[0]
-        angle_high = np.angle(coords) <= angle[1]
-        angle_select = np.logical_and(angle_low, angle_high)
+        angle_select = np.logical_and(theta >= angle[0], theta <= angle[1])
     elif isinstance(angle, (int, float)):
-        angle_select = np.isclose(np.angle(coords), angle)
+        angle_select = np.isclose(theta, angle)
     else:
         raise TypeError(f"angle should be a float, tuple of two floats or None not a {type(angle)}")
     ret = make_Data()
     for low, high, mid in zip(r_l, r_h, r_m):
-        r_select = np.logical_and(np.abs(coords) >= low, np.abs(coords) < high)
+        r_select = np.logical_and(dist >= low, dist < high)
         data = im[np.logical_and(r_select, angle_select)]
         if data.size == 0:
             continue
@@ -1140,33 +1164,19 @@ def rotate(im, angle, resize=False, center=None, order=1, mode="constant", cval=
     return ret
 
 
-def sgolay2d(img, points=15, poly=1, derivative=None):
-    """Implements a 2D Savitsky Golay Filter for a 2D array (e.g. image).
-
-    Arguments:
-        img (ImageArray or ImageFile):
-            image to be filtered
+@lru_cache(maxsize=32)
+def _sgolay2d_kernels(points, poly):
+    """Calculate the 2D Savitsky-Golay filter kernels for a window size and polynomial order.
 
-    Keyword Arguments:
+    Args:
         points (int):
-            The number of points in the window aperture. Must be an odd number. (default 15)
+            The number of points in the window aperture.
         poly (int):
-            Degree of polynomial to use in the filter. (defatult 1)
-        derivative (str or None):
-            Type of defivative to calculate. Can be:
-                None - smooth only (default)
-                "x","y" - calculate dIntentity/dx or dIntensity/dy
-                "both" - calculate the full derivative and return magnitud and angle.
+            Degree of polynomial to use in the filter.
 
-    ReturnsL
-        (imageArray or ImageFile):
-            filtered image.
-
-    Raises:
-        ValueError if points, order or derivative are incorrect.
-
-    Notes:
-        Adapted from code on the scipy cookbook : https://scipy-cookbook.readthedocs.io/items/SavitzkyGolay.html
+    Returns:
+        (tuple of 3 arrays):
+            The smoothing, x-derivative and y-derivative convolution kernels. These are cached and read-only.
     """
     # number of terms in the polynomial expression
     n_terms = (poly + 1) * (poly + 2) / 2.0
@@ -1197,57 +1207,107 @@ def sgolay2d(img, points=15, poly=1, derivative=None):
     for i, exp in enumerate(exps):
         A[:, i] = (dx ** exp[0]) * (dy ** exp[1])
 
-    # pad input array with appropriate values at the four borders
-    new_shape = img.shape[0] + 2 * half_size, img.shape[1] + 2 * half_size
+    # solve system - the x and y derivative terms are only present if poly>0
+    solution = np.linalg.pinv(A)
+    solution = np.row_stack([solution, np.zeros((3 - len(exps), points ** 2))]) if len(exps) < 3 else solution
+    kernels = tuple(sign * row.reshape((points, -1)) for sign, row in zip((1, -1, -1), solution[:3]))
+    for kernel in kernels:
+        kernel.flags.writeable = False
+    return kernels
+
+
+def _sgolay2d_pad(img, half_size):
+    """Pad the last two axes of an array by reflecting the image about its edge values."""
+    new_shape = img.shape[:-2] + (img.shape[-2] + 2 * half_size, img.shape[-1] + 2 * half_size)
     Z = np.zeros((new_shape))
     # top band
-    band = img[0, :]
-    Z[:half_size, half_size:-half_size] = band - np.abs(np.flipud(img[1 : half_size + 1, :]) - band)
+    band = img[..., :1, :]
+    Z[..., :half_size, half_size:-half_size] = band - np.abs(np.flip(img[..., 1 : half_size + 1, :], -2) - band)
     # bottom band
-    band = img[-1, :]
-    Z[-half_size:, half_size:-half_size] = band + np.abs(np.flipud(img[-half_size - 1 : -1, :]) - band)
+    band = img[..., -1:, :]
+    Z[..., -half_size:, half_size:-half_size] = band + np.abs(np.flip(img[..., -half_size - 1 : -1, :], -2) - band)
     # left band
-    band = np.tile(img[:, 0].reshape(-1, 1), [1, half_size])
-    Z[half_size:-half_size, :half_size] = band - np.abs(np.fliplr(img[:, 1 : half_size + 1]) - band)
+    band = img[..., :, :1]
+    Z[..., half_size:-half_size, :half_size] = band - np.abs(np.flip(img[..., :, 1 : half_size + 1], -1) - band)
     # right band
-    band = np.tile(img[:, -1].reshape(-1, 1), [1, half_size])
-    Z[half_size:-half_size, -half_size:] = band + np.abs(np.fliplr(img[:, -half_size - 1 : -1]) - band)
+    band = img[..., :, -1:]
+    Z[..., half_size:-half_size, -half_size:] = band + np.abs(np.flip(img[..., :, -half_size - 1 : -1], -1) - band)
     # central band
-    Z[half_size:-half_size, half_size:-half_size] = img
+    Z[..., half_size:-half_size, half_size:-half_size] = img
 
     # top left corner
-    band = img[0, 0]
-    Z[:half_size, :half_size] = band - np.abs(np.flipud(np.fliplr(img[1 : half_size + 1, 1 : half_size + 1])) - band)
+    band = img[..., :1, :1]
+    Z[..., :half_size, :half_size] = band - np.abs(
+        np.flip(img[..., 1 : half_size + 1, 1 : half_size + 1], (-2, -1)) - band
+    )
     # bottom right corner
-    band = img[-1, -1]
-    Z[-half_size:, -half_size:] = band + np.abs(
-        np.flipud(np.fliplr(img[-half_size - 1 : -1, -half_size - 1 : -1])) - band
+    band = img[..., -1:, -1:]
+    Z[..., -half_size:, -half_size:] = band + np.abs(
+        np.flip(img[..., -half_size - 1 : -1, -half_size - 1 : -1], (-2, -1)) - band
     )
 
     # top right corner
-    band = Z[half_size, -half_size:]
-    Z[:half_size, -half_size:] = band - np.abs(np.flipud(Z[half_size + 1 : 2 * half_size + 1, -half_size:]) - band)
+    band = Z[..., half_size : half_size + 1, -half_size:]
+    Z[..., :half_size, -half_size:] = band - np.abs(
+        np.flip(Z[..., half_size + 1 : 2 * half_size + 1, -half_size:], -2) - band
+    )
     # bottom left corner
-    band = Z[-half_size:, half_size].reshape(-1, 1)
-    Z[-half_size:, :half_size] = band - np.abs(np.fliplr(Z[-half_size:, half_size + 1 : 2 * half_size + 1]) - band)
+    band = Z[..., -half_size:, half_size : half_size + 1]
+    Z[..., -half_size:, :half_size] = band - np.abs(
+        np.flip(Z[..., -half_size:, half_size + 1 : 2 * half_size + 1], -1) - band
+    )
+    return Z
+
+
+def sgolay2d(img, points=15, poly=1, derivative=None):
+    """Implements a 2D Savitsky Golay Filter for a 2D array (e.g. image).
+
+    Arguments:
+        img (ImageArray or ImageFile):
+            image to be filtered. A 3D array is treated as a stack of images that are all filtered in one go.
+
+    Keyword Arguments:
+        points (int):
+            The number of points in the window aperture. Must be an odd number. (default 15)
+        poly (int):
+            Degree of polynomial to use in the filter. (defatult 1)
+        derivative (str or None):
+            Type of defivative to calculate. Can be:
+                None - smooth only (default)
+                "x","y" - calculate dIntentity/dx or dIntensity/dy
+                "both" - calculate the full derivative and return magnitud and angle.
 
-    # solve system and convolve
+    ReturnsL
+        (imageArray or ImageFile):
+            filtered image.
+
+    Raises:
+        ValueError if points, order or derivative are incorrect.
+
+    Notes:
+        Adapted from code on the scipy cookbook : https://scipy-cookbook.readthedocs.io/items/SavitzkyGolay.html
+
+        The filter kernels are cached for each combination of *points* and *poly*. The convolution is done directly
+        for small kernels and with FFTs for large ones.
+    """
+    if derivative not in [None, "x", "y", "both"]:
+        raise ValueError(f"Unknown derivative mode {derivative}")
+    m, c, r = _sgolay2d_kernels(points, poly)
+    Z = _sgolay2d_pad(np.asarray(img, dtype=float), points // 2)
+    if Z.ndim > 2:  # Stack of images, so extend the kernels to match
+        m, c, r = [kernel.reshape((1,) * (Z.ndim - 2) + kernel.shape) for kernel in (m, c, r)]
+
+    # convolve
     if derivative is None:
-        m = np.linalg.pinv(A)[0].reshape((points, -1))
-        ret = signal.fftconvolve(Z, m, mode="valid").view(type(img))
+        ret = signal.convolve(Z, m, mode="valid").view(type(img))
     elif derivative == "x":
-        c = np.linalg.pinv(A)[1].reshape((points, -1))
-        ret = signal.fftconvolve(Z, -c, mode="valid").view(type(img))
+        ret = signal.convolve(Z, c, mode="valid").view(type(img))
     elif derivative == "y":
-        r = np.linalg.pinv(A)[2].reshape((points, -1))
-        ret = signal.fftconvolve(Z, -r, mode="valid").view(type(img))
-    elif derivative == "both":
-        c = np.linalg.pinv(A)[1].reshape((points, -1))
-        r = np.linalg.pinv(A)[2].reshape((points, -1))
-        ret = signal.fftconvolve(Z, -r, mode="valid"), signal.fftconvolve(Z, -c, mode="valid").view(type(img))
+        ret = signal.convolve(Z, r, mode="valid").view(type(img))
     else:
-        raise ValueError(f"Unknown derivative mode {derivative}")
-    ret.metadata.update(img.metadata)
+        ret = signal.convolve(Z, r, mode="valid"), signal.convolve(Z, c, mode="valid").view(type(img))
+    if hasattr(img, "metadata"):
+        ret.metadata.update(img.metadata)
     return ret
 
 
@@ -9,11 +9,16 @@ Derivatives of ImageArray and ImageStack specific to processing Kerr images.
 __all__ = ["KerrArray", "KerrStack", "MaskStack"]
 
 import os
+from concurrent.futures import ThreadPoolExecutor
+from copy import deepcopy
+from functools import partial
 
 import numpy as np
+from skimage.restoration import denoise_tv_chambolle
 
 from ..Image import ImageArray, ImageStack, ImageFile
 from ..tools import make_Data
+from ..compat import which
 from ..tools.decorators import class_modifier, image_file_adaptor
 from . import kerrfuncs
 
@@ -31,6 +36,41 @@ AN_IM_SIZE = (554, 672)  # Kerr image with annotation not cropped
 pattern_file = os.path.join(os.path.dirname(__file__), "kerr_patterns.txt")
 
 
+def _tiled(func, frame, tile=None, overlap=16):
+    """Apply a function to a frame in overlapping tiles and put the centres of the results together.
+
+    Args:
+        func (callable):
+            Function that takes a 2D array and returns a 2D array of the same shape.
+        frame (2D array):
+            The image to process.
+
+    Keyword Arguments:
+        tile (int, tuple of int or None):
+            The size of the tiles (rows, columns), or None to process the whole frame at once.
+        overlap (int):
+            Extra pixels around each tile that are processed but not kept, to reduce edge effects at the joins.
+
+    Returns:
+        (2D array):
+            The processed frame.
+    """
+    if tile is None:
+        return func(frame)
+    rows, cols = frame.shape
+    tile_r, tile_c = (tile, tile) if isinstance(tile, int) else tile
+    out = None
+    for r0 in range(0, rows, tile_r):
+        for c0 in range(0, cols, tile_c):
+            r1, c1 = min(r0 + tile_r, rows), min(c0 + tile_c, cols)
+            a0, b0 = max(r0 - overlap, 0), max(c0 - overlap, 0)
+            part = func(frame[a0 : min(r1 + overlap, rows), b0 : min(c1 + overlap, cols)])
+            if out is None:
+                out = np.empty(frame.shape, dtype=part.dtype)
+            out[r0:r1, c0:c1] = part[r0 - a0 : r1 - a0, c0 - b0 : c1 - b0]
+    return out
+
+
 @class_modifier(kerrfuncs)
 class KerrArray(ImageArray):
 
@@ -161,6 +201,42 @@ class KerrStackMixin:
         self._resize_stack(new_size)
         return self
 
+    def ocr_metadata(self, field_only=False, workers=None):
+        """Read the metadata from the annotations of all the images in the stack at once.
+
+        Keyword Arguments:
+            field_only (bool):
+                Only read the field value.
+            workers (int or None):
+                Maximum number of tesseract programs to run at once.
+
+        Returns:
+            (KerrStack):
+                The stack with the ocr metadata of each annotated image added to its metadata.
+
+        The text boxes are cropped from every annotated image first and then read together - see
+        :py:func:`Stoner.Image.kerrfuncs.ocr_metadata`. Boxes that have been seen before, or that are made up of
+        characters that tesseract has already read consistently in other boxes of the stack, are read without
+        tesseract, and the rest are read by several tesseract programs running in parallel, with identical boxes
+        only read once.
+        """
+        frames = []
+        boxes = []
+        for idx, name in enumerate(self.__names__()):
+            r, c = self._sizes[idx]
+            if (r, c) != AN_IM_SIZE:  # can't do anything without an annotated image
+                continue
+            image = np.ma.getdata(self._stack[:r, :c, idx])
+            text_areas, sb_length = kerrfuncs._text_areas(image, field_only)
+            frames.append((name, list(text_areas), sb_length))
+            boxes.extend(image[ymin:ymax, xmin:xmax] for xmin, xmax, ymin, ymax in text_areas.values())
+        tesseract = which("tesseract") if _tesseractable else None
+        texts = iter(kerrfuncs._recognise(boxes, tesseract, workers))
+        for name, keys, sb_length in frames:
+            found = {key: next(texts) for key in keys}
+            self._metadata[name].update(kerrfuncs._ocr_results(found, sb_length, field_only))
+        return self
+
     def hysteresis(self, mask=None):
         """Make a hysteresis loop of the average intensity in the given images.
 
@@ -196,21 +272,97 @@ class KerrStackMixin:
         fieldvals = np.take(self.fields, index_map)
         return ImageArray(fieldvals)
 
-    def denoise_thresh(self, denoise_weight=0.1, thresh=0.5, invert=False):
+    def _map_frames(self, func, workers=None):
+        """Call func(index, frame) for each image of the stack in a pool of threads.
+
+        The frames are views of the stack, trimmed to the size of each image. The scikit-image routines used to
+        process the frames release the GIL for much of their work, so the frames are processed in parallel.
+
+        Returns:
+            (list):
+                The return values of *func* for each frame.
+        """
+        frames = np.ma.getdata(self._stack)
+        jobs = [(ix, frames[:r, :c, ix]) for ix, (r, c) in enumerate(self._sizes)]
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            return list(pool.map(lambda job: func(*job), jobs))
+
+    def _mask_stack(self, masks):
+        """Make a MaskStack from a 3D boolean array (images, rows, columns) with a copy of our metadata."""
+        ret = MaskStack(masks)
+        ret._metadata = deepcopy(self._metadata)
+        ret._names = list(self._names)
+        ret._sizes = self._sizes.copy()
+        return ret
+
+    def denoise_thresh(self, denoise_weight=0.1, thresh=0.5, invert=False, workers=None, tile=None):
         """Apply denoise then threshold images.
 
+        Keyword Arguments:
+            denoise_weight (float):
+                The weight for the total variation denoising (see :py:func:`skimage.restoration.denoise_tv_chambolle`)
+            thresh (float):
+                The threshold to apply to the denoised images.
+            invert (bool):
+                Invert the masks.
+            workers (int or None):
+                The maximum number of images to process at once.
+            tile (int, tuple of int or None):
+                If given, denoise each image in tiles of this size (rows, columns) with a small overlap - this
+                reduces the working memory for large images, but is not quite the same as denoising the whole image.
+
         Return:
             (ndarray) MaskStack:
                 True for values greater than thresh, False otherwise
                 else return True for values between thresh and 1
+
+        Notes:
+            The frames are denoised directly from the stack in a pool of threads and thresholded straight into a
+            preallocated boolean stack, so no image objects or denoised copy of the stack are made. As before, the
+            pixels at the maximum value of the whole denoised stack are not included in the masks.
         """
-        masks = self.clone
-        masks.each.denoise(weight=denoise_weight)
-        masks.each.threshold_minmax(threshmin=thresh, threshmax=np.max(masks.imarray))
-        masks = MaskStack(masks)
+        masks = np.zeros(self.imarray.shape, dtype=bool)
+        denoise = partial(_tiled, partial(denoise_tv_chambolle, weight=denoise_weight), tile=tile)
+
+        def _frame(ix, frame):
+            denoised = denoise(frame)
+            masks[ix, : frame.shape[0], : frame.shape[1]] = denoised > thresh
+            top = denoised.max()
+            return top, np.nonzero(denoised == top)
+
+        peaks = self._map_frames(_frame, workers)
+        top = max(peak for peak, _ in peaks)
+        for ix, (peak, where) in enumerate(peaks):  # Like threshold_minmax with the maximum of the whole stack
+            if peak == top:
+                masks[ix][where] = False
         if invert:
-            masks.stack = ~masks.stack
-        return masks
+            masks = ~masks
+        return self._mask_stack(masks)
+
+    def defect_mask(self, thresh=0.6, corner_thresh=0.05, radius=1, workers=None):
+        """Make masks of the typical defects in each image of the stack.
+
+        Keyword Arguments:
+            thresh, corner_thresh, radius:
+                As for :py:func:`Stoner.Image.kerrfuncs.defect_mask`.
+            workers (int or None):
+                The maximum number of images to process at once.
+
+        Returns:
+            (MaskStack):
+                The masks of the defects in each image.
+
+        The images are processed directly from the stack in a pool of threads and the masks written into a
+        preallocated boolean stack.
+        """
+        masks = np.zeros(self.imarray.shape, dtype=bool)
+
+        def _frame(ix, frame):
+            mask = kerrfuncs._defect_mask(frame.view(KerrArray), thresh, corner_thresh, radius)[0]
+            masks[ix, : frame.shape[0], : frame.shape[1]] = mask
+
+        self._map_frames(_frame, workers)
+        return self._mask_stack(masks)
 
     def find_threshold(self, testim=None, mask=None):
         """Try to find the threshold value at which the image switches.
@@ -4,6 +4,9 @@
 import os
 import subprocess  # nosec
 import tempfile
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
 
 import numpy as np
 from skimage import exposure, io, transform
@@ -11,6 +14,7 @@ from skimage import exposure, io, transform
 from ..core.base import typeHintedDict
 from ..compat import which
 from ..core.exceptions import assertion, StonerAssertionError
+from ..analysis.utils import _fingerprint
 
 GRAY_RANGE = (0, 65535)  # 2^16
 IM_SIZE = (512, 672)  # Standard Kerr image size
@@ -31,6 +35,107 @@ _useful_keys = [
 ]
 _test_keys = ["X-B-2d", "field: units"]  # minimum keys in data to assert that it is a standard file output
 
+OCR_CACHE_SIZE = 4096  # Number of recognised text boxes to remember
+OCR_BATCH = 8  # Number of text boxes read by tesseract between each update of the glyph templates
+_ocr_cache = OrderedDict()
+
+
+class _GlyphTemplates:
+
+    """Read text in the fixed font of the Kerr microscope annotations by matching glyph bitmaps.
+
+    Each glyph is a run of columns of a black and white text box that have some white pixels in them. The
+    templates are learnt from boxes that tesseract has read where the number of characters matches the number of
+    glyphs. A glyph only becomes a template once tesseract has read it as the same character in *agree* different
+    boxes, and never if it has been read as different characters, so a single misreading is not copied to every
+    other box. Once a character has been adopted, boxes that only use known characters can be read without
+    tesseract.
+
+    Attributes:
+        templates (dict):
+            Maps glyph shapes to a list of flattened glyph bitmaps and a list of the matching characters.
+        candidates (dict):
+            Maps glyph shapes to a list of flattened glyph bitmaps that are not templates yet and a list of
+            dictionaries of how many times each one has been read as each character.
+        tolerance (float):
+            Fraction of the pixels of a glyph that can differ from a template and still match.
+        agree (int):
+            Number of boxes that must agree on a character before its glyph is adopted as a template.
+        adopted (int):
+            Number of templates adopted so far.
+    """
+
+    def __init__(self, tolerance=0.05, agree=2):
+        """Start without any templates."""
+        self.templates = {}
+        self.candidates = {}
+        self.tolerance = tolerance
+        self.agree = agree
+        self.adopted = 0
+
+    @staticmethod
+    def glyphs(binary):
+        """Split a black and white text box into the bitmaps of its glyphs."""
+        edges = np.flatnonzero(np.diff(np.concatenate(([0], binary.any(axis=0).astype(int), [0]))))
+        return [binary[:, start:stop] for start, stop in edges.reshape(-1, 2)]
+
+    def _closest(self, table, glyph):
+        """Return the index of the bitmap in *table* that a glyph matches, or None."""
+        if glyph.shape not in table:
+            return None
+        diff = (np.array(table[glyph.shape][0]) != glyph.ravel()).sum(axis=1)
+        best = np.argmin(diff)
+        return best if diff[best] <= self.tolerance * glyph.size else None
+
+    def match(self, glyph):
+        """Return the character for a glyph bitmap or None if it does not match any template."""
+        best = self._closest(self.templates, glyph)
+        return None if best is None else self.templates[glyph.shape][1][best]
+
+    def read(self, binary):
+        """Read a black and white text box, returning None if any of its glyphs are not known."""
+        chars = []
+        for glyph in self.glyphs(binary):
+            char = self.match(glyph)
+            if char is None:
+                return None
+            chars.append(char)
+        return "".join(chars)
+
+    def learn(self, binary, text):
+        """Count a reading of the glyphs in a text box as *text* and adopt the glyphs that have been agreed on.
+
+        Each distinct box should only be learnt from once, so that the agreement comes from separate readings.
+
+        Returns:
+            (bool):
+                True if the glyphs and characters could be matched up.
+        """
+        text = "".join(text.split())
+        glyphs = self.glyphs(binary)
+        if not glyphs or len(glyphs) != len(text):
+            return False
+        voted = set()
+        for glyph, char in zip(glyphs, text):
+            if self.match(glyph) is not None:
+                continue
+            best = self._closest(self.candidates, glyph)
+            bitmaps, votes = self.candidates.setdefault(glyph.shape, ([], []))
+            if best is None:
+                best = len(bitmaps)
+                bitmaps.append(glyph.ravel())
+                votes.append({})
+            if (glyph.shape, best) in voted:  # The same glyph twice in one box is only one reading
+                continue
+            voted.add((glyph.shape, best))
+            votes[best][char] = votes[best].get(char, 0) + 1
+            if len(votes[best]) == 1 and votes[best][char] >= self.agree:
+                templates, chars = self.templates.setdefault(glyph.shape, ([], []))
+                templates.append(bitmaps[best])
+                chars.append(char)
+                self.adopted += 1
+        return True
+
 
 def _parse_text(text, key=None):
     """Parse text which has been recognised from an image if key is given specific hints may be applied."""
@@ -119,6 +224,21 @@ def _tesseract_image(kerr_im, key):
     key is the metadata key we're trying to find, it may give a
     hint for parsing the text generated.
     """
+    data = _tesseract_text(kerr_im, which("tesseract") if kerr_im.tesseractable else None)
+
+    # parse the reading
+    if len(data) == 0:
+        print(f"No data read for {key}")
+    data = _parse_text(data, key=key)
+    return data
+
+
+def _tesseract_text(kerr_im, tesseract):
+    """Run the tesseract program on a cropped image of some text and return the first line it reads.
+
+    If *tesseract* is None, an empty string is returned.
+    """
+    kerr_im = np.asarray(kerr_im, dtype=float)
     # first set up temp files to work with
     tmpdir = tempfile.mkdtemp()
     textfile = os.path.join(tmpdir, "tmpfile.txt")
@@ -137,8 +257,7 @@ def _tesseract_image(kerr_im, key):
     )  # python imaging library will save according to file extension
 
     # call tesseract
-    if kerr_im.tesseractable:
-        tesseract = which("tesseract")
+    if tesseract is not None:
         with open(stdoutfile, "w") as stdout:
             subprocess.call(  # nosec
                 [tesseract, imagefile, textfile[:-4]], stdout=stdout, stderr=subprocess.STDOUT
@@ -151,14 +270,143 @@ def _tesseract_image(kerr_im, key):
     os.remove(textfile)
     os.remove(imagefile)
     os.rmdir(tmpdir)
-
-    # parse the reading
-    if len(data) == 0:
-        print(f"No data read for {key}")
-    data = _parse_text(data, key=key)
     return data
 
 
+def _binarise(box):
+    """Turn a cropped text box into a black and white image in the same way as for tesseract."""
+    box = np.asarray(box, dtype=float)
+    top = box.max() if box.size else 0.0
+    if top <= 0:
+        return np.zeros(box.shape, dtype=bool)
+    return box >= 0.495 * top
+
+
+def _recognise(boxes, tesseract, workers=None, glyphs=True):
+    """Read the text in a list of cropped text boxes.
+
+    Each box is looked up in a cache of boxes that have already been read. The boxes that are left are read by
+    running tesseract on :py:data:`OCR_BATCH` boxes at once in a pool of threads, with identical boxes only being
+    read once. After each batch the glyph templates learn from what tesseract read, and any remaining boxes that
+    can now be read from the templates are read without tesseract. Boxes that tesseract could not read anything
+    from are not cached.
+
+    Args:
+        boxes (list of 2D arrays):
+            The cropped text boxes.
+        tesseract (str or None):
+            Path to the tesseract program, or None if it is not available.
+
+    Keyword Arguments:
+        workers (int or None):
+            Maximum number of tesseract programs to run at once - defaults to the :py:class:`ThreadPoolExecutor`
+            default.
+        glyphs (_GlyphTemplates, bool or None):
+            The glyph templates to use. If True (the default) a new set of templates is learnt for just this call,
+            and if False or None tesseract is used for every box.
+
+    Returns:
+        (list of str):
+            The raw text read from each box.
+    """
+    if glyphs is True:
+        glyphs = _GlyphTemplates()
+    texts = [""] * len(boxes)
+    pending = OrderedDict()
+    for ix, box in enumerate(boxes):
+        binary = _binarise(box)
+        stamp = _fingerprint(binary)
+        if stamp in _ocr_cache:
+            _ocr_cache.move_to_end(stamp)
+            texts[ix] = _ocr_cache[stamp]
+        elif tesseract is not None:
+            pending.setdefault(stamp, (box, binary, []))[2].append(ix)
+
+    def _found(stamp, text, indices):
+        """Record the text read from a box."""
+        if text.strip():
+            _ocr_cache[stamp] = text
+        for ix in indices:
+            texts[ix] = text
+
+    if pending:
+        adopted = 0
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            while pending:
+                if glyphs and glyphs.adopted > adopted:  # Some new characters can be read from the templates
+                    adopted = glyphs.adopted
+                    for stamp, (_, binary, indices) in list(pending.items()):
+                        text = glyphs.read(binary)
+                        if text is not None:
+                            del pending[stamp]
+                            _found(stamp, text, indices)
+                batch = [pending.popitem(last=False) for _ in range(min(len(pending), OCR_BATCH))]
+                results = pool.map(partial(_tesseract_text, tesseract=tesseract), [p[1][0] for p in batch])
+                for (stamp, (_, binary, indices)), text in zip(batch, results):
+                    if glyphs:
+                        glyphs.learn(binary, text)
+                    _found(stamp, text, indices)
+    while len(_ocr_cache) > OCR_CACHE_SIZE:
+        _ocr_cache.popitem(last=False)
+    return texts
+
+
+def _text_areas(kerr_im, field_only=False):
+    """Work out the boxes (xmin, xmax, ymin, ymax) that hold each item of metadata on an annotated image.
+
+    Returns:
+        (dict, int or None):
+            The boxes for each ocr metadata key and the length of the scale bar in pixels.
+    """
+    if field_only:
+        return {"ocr_field": (110, 165, 527, 540)}, None  # (This is just the number area not the unit)
+    text_areas = {
+        "ocr_field": (110, 165, 527, 540),
+        "ocr_date": (542, 605, 512, 527),
+        "ocr_time": (605, 668, 512, 527),
+        "ocr_subtract": (237, 260, 527, 540),
+        "ocr_average": (303, 350, 527, 540),
+    }
+    try:
+        sb_length = get_scalebar(kerr_im)
+    except (StonerAssertionError, AssertionError, IndexError):
+        sb_length = None
+    if sb_length is not None:
+        text_areas.update(
+            {
+                "ocr_scalebar_length_microns": (sb_length + 10, sb_length + 27, 514, 527),
+                "ocr_lens": (sb_length + 51, sb_length + 97, 514, 527),
+                "ocr_zoom": (sb_length + 107, sb_length + 149, 514, 527),
+            }
+        )
+    return text_areas, sb_length
+
+
+def _ocr_results(texts, sb_length, field_only=False):
+    """Parse the text read from each box and work out the derived metadata.
+
+    Args:
+        texts (dict):
+            The raw text read for each ocr metadata key.
+        sb_length (int or None):
+            The length of the scale bar in pixels.
+
+    Returns:
+        (dict):
+            The ocr metadata.
+    """
+    metadata = {key: _parse_text(text, key=key) for key, text in texts.items()}
+    if not field_only:
+        metadata["ocr_scalebar_length_pixels"] = sb_length
+        if isinstance(metadata.get("ocr_scalebar_length_microns", None), float):
+            metadata["ocr_microns_per_pixel"] = metadata["ocr_scalebar_length_microns"] / sb_length
+            metadata["ocr_pixels_per_micron"] = 1 / metadata["ocr_microns_per_pixel"]
+            metadata["ocr_field_of_view_microns"] = np.array(IM_SIZE) * metadata["ocr_microns_per_pixel"]
+    if not isinstance(metadata["ocr_field"], (int, float)):
+        metadata["ocr_field"] = np.nan  # didn't read the field properly
+    return metadata
+
+
 def get_scalebar(kerr_im):
     """Get the length in pixels of the image scale bar."""
     im = kerr_im[519:520, :419]
@@ -198,47 +446,19 @@ def ocr_metadata(kerr_im, field_only=False):
     Returns:
         metadata: dict
             updated metadata dictionary
+
+    Notes:
+        Text boxes that have been read before, or that only contain characters that tesseract has already read
+        consistently in other boxes of the same image, are read without running tesseract again. To read the metadata
+        of a whole stack of images at once use :py:meth:`Stoner.Image.kerr.KerrStack.ocr_metadata`.
     """
-    if kerr_im.shape != AN_IM_SIZE:
-        pass  # can't do anything without an annotated image
-
-    # now we have to crop the image to the various text areas and try tesseract
-    elif field_only:
-        fbox = (110, 165, 527, 540)  # (This is just the number area not the unit)
-        im = kerr_im.crop(box=fbox, copy=True)
-        field = kerr_im._tesseract_image(im, "ocr_field")
-        kerr_im.metadata["ocr_field"] = field
-    else:
-        text_areas = {
-            "ocr_field": (110, 165, 527, 540),
-            "ocr_date": (542, 605, 512, 527),
-            "ocr_time": (605, 668, 512, 527),
-            "ocr_subtract": (237, 260, 527, 540),
-            "ocr_average": (303, 350, 527, 540),
-        }
-        try:
-            sb_length = kerr_im.get_scalebar()
-        except (StonerAssertionError, AssertionError):
-            sb_length = None
-        if sb_length is not None:
-            text_areas.update(
-                {
-                    "ocr_scalebar_length_microns": (sb_length + 10, sb_length + 27, 514, 527),
-                    "ocr_lens": (sb_length + 51, sb_length + 97, 514, 527),
-                    "ocr_zoom": (sb_length + 107, sb_length + 149, 514, 527),
-                }
-            )
-
-        metadata = {}  # now go through and process all keys
-        for key in text_areas:
-            im = kerr_im.crop(box=text_areas[key], copy=True)
-            metadata[key] = _tesseract_image(kerr_im, key)
-        metadata["ocr_scalebar_length_pixels"] = sb_length
-        if isinstance(metadata["ocr_scalebar_length_microns"], float):
-            metadata["ocr_microns_per_pixel"] = metadata["ocr_scalebar_length_microns"] / sb_length
-            metadata["ocr_pixels_per_micron"] = 1 / metadata["ocr_microns_per_pixel"]
-            metadata["ocr_field_of_view_microns"] = np.array(IM_SIZE) * metadata["ocr_microns_per_pixel"]
-        kerr_im.metadata.update(metadata)
+    if kerr_im.shape == AN_IM_SIZE:  # can't do anything without an annotated image
+        # now we have to crop the image to the various text areas and try to read them
+        text_areas, sb_length = _text_areas(kerr_im, field_only)
+        tesseract = which("tesseract") if kerr_im.tesseractable else None
+        boxes = [np.asarray(kerr_im)[ymin:ymax, xmin:xmax] for xmin, xmax, ymin, ymax in text_areas.values()]
+        texts = dict(zip(text_areas, _recognise(boxes, tesseract)))
+        kerr_im.metadata.update(_ocr_results(texts, sb_length, field_only))
     if "ocr_field" in kerr_im.metadata.keys() and not isinstance(kerr_im.metadata["ocr_field"], (int, float)):
         kerr_im.metadata["ocr_field"] = np.nan  # didn't read the field properly
     return kerr_im.metadata
@@ -269,6 +489,17 @@ def defect_mask(kerr_im, thresh=0.6, corner_thresh=0.05, radius=1, return_extra=
     info (*optional* dict):
         dictionary of intermediate calculation steps
     """
+    totmask, info = _defect_mask(kerr_im, thresh, corner_thresh, radius)
+    if return_extra:
+        return totmask, info
+    return totmask
+
+
+def _defect_mask(kerr_im, thresh, corner_thresh, radius):
+    """Work out the defect mask of an image and the intermediate steps for :py:func:`defect_mask`.
+
+    This only needs an :py:class:`Stoner.Image.ImageArray`, so that it can be used on the frames of a stack.
+    """
     im = kerr_im.asfloat()
     im = im.level_image(poly_vert=3, poly_horiz=3)
     th = im.threshold_minmax(0, thresh)
@@ -282,10 +513,8 @@ def defect_mask(kerr_im, thresh=0.6, corner_thresh=0.05, radius=1, return_extra=
             int(np.round(x - radius)) : int(np.round(x + radius)),
         ] = 1.0
     totmask = np.logical_or(q, th)
-    if return_extra:
-        info = {"flattened_image": im, "corner_fast": cor, "corner_points": blobs, "corner_mask": q, "thresh_mask": th}
-        return totmask, info
-    return totmask
+    info = {"flattened_image": im, "corner_fast": cor, "corner_points": blobs, "corner_mask": q, "thresh_mask": th}
+    return totmask, info
 
 
 def defect_mask_subtract_image(kerr_im, threshmin=0.25, threshmax=0.9, denoise_weight=0.1, return_extra=False):
@@ -2,17 +2,24 @@
 """Provide variants of :class:`Stoner.Image.ImageFolder` that store images efficiently in 3D numpy arrays."""
 __all__ = ["ImageStackMixin", "ImageStack", "ImageStack"]
 import warnings
+from copy import deepcopy
+from functools import partial
+from tempfile import TemporaryFile
 
 import numpy as np
+from scipy import ndimage as ndi
 
 from ..compat import string_types, int_types
-from ..core.exceptions import assertion
+from ..tools import isIterable
+from ..folders.utils import get_pool
 
 from ..Core import regexpDict, typeHintedDict
 from ..Folders import DiskBasedFolderMixin, baseFolder
 
 from .core import ImageArray, ImageFile
-from .folders import ImageFolder, ImageFolderMixin
+from .folders import ImageFolder, ImageFolderMixin, _RunningMoments
+from .imagefuncs import translate_limits
+from .util import dtype_range, fit_profile, poly_basis, fft_spectrum
 
 IM_SIZE = (512, 672)  # Standard Kerr image size
 AN_IM_SIZE = (554, 672)  # Kerr image with annotation not cropped
@@ -24,15 +31,79 @@ def _load_ImageArray(f, **kargs):
     return ImageArray(f, **kargs)
 
 
+def _upsampled_dft(data, region_size, upsample_factor, offsets):
+    """Calculate a matrix multiply DFT of *data* over a small upsampled region about *offsets*.
+
+    This follows Guizar-Sicairos et al., Opt. Lett. 33, 156 (2008) and is equivalent to zero-padding the
+    cross-power spectrum by *upsample_factor* but only evaluating the region_size x region_size points needed.
+    """
+    for n_items, offset in reversed(list(zip(data.shape, offsets))):
+        kernel = (np.arange(region_size) - offset)[:, None] * np.fft.fftfreq(n_items, upsample_factor)
+        data = np.tensordot(np.exp(-2j * np.pi * kernel), data, axes=(1, -1))
+    return data
+
+
+def _register_frame(job, upsample_factor=50, do_shift=True, **kargs):
+    """Refine the shift for one frame to sub-pixel accuracy and optionally apply it.
+
+    Args:
+        job (tuple of (frame, product, coarse)):
+            The full frame image data, the cross-power spectrum of the reference and the (cropped) frame and the
+            whole pixel shift found from the peak of the cross-correlation.
+
+    Keyword Arguments:
+        upsample_factor (int):
+            Register to within 1/upsample_factor of a pixel.
+        do_shift (bool):
+            If True, return the shifted frame as well as the shift vector.
+        **kargs:
+            Other keywords are passed to :py:func:`scipy.ndimage.shift`.
+
+    Returns:
+        (shift, frame):
+            The (row, column) translation vector and the shifted frame (or None if *do_shift* is False).
+    """
+    frame, product, shift = job
+    if upsample_factor > 1:
+        shift = np.round(shift * upsample_factor) / upsample_factor
+        region_size = np.ceil(upsample_factor * 1.5)
+        dftshift = np.fix(region_size / 2.0)
+        cross_corr = _upsampled_dft(
+            product.conj(), int(region_size), upsample_factor, dftshift - shift * upsample_factor
+        ).conj()
+        maxima = np.array(np.unravel_index(np.argmax(np.abs(cross_corr)), cross_corr.shape), dtype=float)
+        shift = shift + (maxima - dftshift) / upsample_factor
+    if not do_shift:
+        return shift, None
+    if kargs.get("cval", None) is None:
+        kargs["cval"] = frame.mean()
+    return shift, ndi.shift(frame, shift, **kargs)
+
+
 class ImageStackMixin:
 
-    """Implement an interface for a baseFolder to store images in a 3D numpy array for faster access."""
+    """Implement an interface for a baseFolder to store images in a 3D numpy array for faster access.
 
-    _defaults = {"type": ImageFile}
+    Keyword Arguments:
+        backing_store (bool, str or None):
+            If False or None (default) the images are stored in memory. If True the images are stored in a
+            temporary memory mapped file in the system temporary directory, or if a string then the temporary file
+            is created in this directory. This allows stacks to be larger than the available memory.
+
+    Notes:
+        The images are held in a 3D backing store array with space for extra images that grows geometrically as
+        images are added, so that appending an image does not need to copy the whole stack. The *_stack* attribute
+        is a view of the part of the backing store that is in use. The mask for the backing store is only allocated
+        once a mask is set or the stack, or one of its images, is accessed in a way that could set a mask.
+    """
+
+    _defaults = {"type": ImageFile, "backing_store": None}
 
     def __init__(self, *args, **kargs):
         """Initialise an ImageStack's pricate data and provide a type argument."""
-        self._stack = np.ma.atleast_3d(ImageArray([])).reshape((0, 0, 0)).view(ImageArray)
+        self._buffer = np.zeros((0, 0, 0))
+        self._mask_buffer = None
+        self._stack_shape = (0, 0, 0)
         self._metadata = regexpDict()
         self._public_attrs_store = regexpDict()
         self._names = list()
@@ -44,7 +115,9 @@ class ImageStackMixin:
         other = args[0]
         if isinstance(other, ImageStackMixin):
             super().__init__(*args[1:], **kargs)
-            self._stack = other._stack
+            self._buffer = other._buffer
+            self._mask_buffer = other._mask_buffer
+            self._stack_shape = other._stack_shape
             self._metadata = other._metadata
             self._names = other._names
             self._sizes = other._sizes
@@ -67,8 +140,6 @@ class ImageStackMixin:
             super().__init__(*args[1:], **kargs)
             for ot in other:
                 self.append(ot)
-            del self[-1]  # Bit of a hack to get rid of initialised zeros data -
-            # this poss needs changing in the append method
         else:
             super().__init__(*args, **kargs)
 
@@ -85,10 +156,8 @@ class ImageStackMixin:
             We're in the base class here, so we don't call super() if we can't handle this, then we're stuffed!
         """
         if isinstance(name, int_types):
-            try:
-                self._stack[:, :, name]
-            except IndexError as err:
-                raise KeyError(f"{name} is out of range for accessing the ImageStack.") from err
+            if not -self._stack_shape[2] <= name < self._stack_shape[2]:
+                raise KeyError(f"{name} is out of range for accessing the ImageStack.")
             return name
         if name not in self.__names__():
             name = self._metadata.__lookup__(name)
@@ -146,6 +215,7 @@ class ImageStackMixin:
         Note:
             We're in the base class here, so we don't call super() if we can't handle this, then we're stuffed!
         """
+        self._forget_metadata()
         if isinstance(name, int_types):
             try:
                 name = self.__names__()[name]
@@ -174,7 +244,6 @@ class ImageStackMixin:
             _public_attrs[attr] = getattr(value, attr, None)
         self._public_attrs_store[name] = _public_attrs
         value = getattr(value, "image", value)
-        mask = getattr(value, "mask", np.zeros_like(value, dtype=bool))
         row, col = value.shape
         pag = len(self._sizes)
         new_size = self.max_size + (pag,)
@@ -183,9 +252,8 @@ class ImageStackMixin:
         else:
             dtype = None
         self._resize_stack(new_size, dtype=dtype)
-        self._stack[:row, :col, idx] = value
-        self._stack.mask = np.ma.getmaskarray(self._stack)
-        self._stack.mask[:row, :col, idx] = mask
+        self._buffer[:row, :col, idx] = np.ma.getdata(value)
+        self._set_frame_mask(idx, np.ma.getmask(value), row, col)
 
     def __inserter__(self, ix, name, value):
         """Provide an efficient insert into the stack.
@@ -193,6 +261,7 @@ class ImageStackMixin:
         The default implementation is rather slow about inserting since it has to clear the data folder and then
         rebuild it entry by entry. This does
         a simple insert."""
+        self._forget_metadata()
         value = ImageFile(value)  # ensure we have some metadata
         self._names.insert(ix, name)
         self._metadata[name] = value.metadata
@@ -202,14 +271,18 @@ class ImageStackMixin:
             dtype = value.dtype
         else:
             dtype = None
+        pag = self._stack_shape[2]
         self._resize_stack(new_size, dtype=dtype)
-        stack_mask = np.insert(np.ma.getmaskarray(self._stack), ix, np.zeros(self.max_size, dtype=bool), axis=2)
-        self._stack = np.insert(self._stack, ix, np.zeros(self.max_size), axis=2).view(ImageArray)
-        self._stack.mask = stack_mask
+        ix = min(max(ix if ix >= 0 else pag + ix + 1, 0), pag)
+        if ix < pag:  # Move the following images up one place in the backing store
+            for buffer in (self._buffer, self._mask_buffer):
+                if buffer is not None:
+                    buffer[:, :, ix + 1 : pag + 1] = buffer[:, :, ix:pag]
+                    buffer[:, :, ix] = 0
         value = value.data
         row, col = value.shape
-        self._stack[:row, :col, ix] = value
-        self._stack.mask[:row, :col, ix] = np.ma.getmaskarray(value)
+        self._buffer[:row, :col, ix] = np.ma.getdata(value)
+        self._set_frame_mask(ix, np.ma.getmask(value), row, col)
         _public_attrs = {}
         for attr in value._public_attrs.keys():
             if attr in ["data", "image", "metadata"]:
@@ -227,12 +300,17 @@ class ImageStackMixin:
             We're in the base class here, so we don't call super() if we can't handle this, then we're stuffed!
 
         """
-        idx = self.__lookup__(ix)
+        self._forget_metadata()
+        row, col, pag = self._stack_shape
+        idx = self.__lookup__(ix) % pag
         name = list(self.__names__())[idx]
         del self._metadata[name]
-        self._stack = np.delete(self._stack, idx, axis=2)
+        for buffer in (self._buffer, self._mask_buffer):  # Close the gap in the backing store
+            if buffer is not None:
+                buffer[:, :, idx : pag - 1] = buffer[:, :, idx + 1 : pag]
+        self._stack_shape = (row, col, pag - 1)
         del self._names[idx]
-        self._sizes = np.delete(self._sizes, ix, axis=0)
+        self._sizes = np.delete(self._sizes, idx, axis=0)
 
     def __clear__(self):
         """Clear all stored :py:class:`Stoner.Core.metadataObject` instances stored.
@@ -241,8 +319,11 @@ class ImageStackMixin:
             We're in the base class here, so we don't call super() if we can't handle this, then we're stuffed!
 
         """
+        self._forget_metadata()
         self._metadata = regexpDict()
-        self._stack = np.ma.atleast_3d(ImageArray([])).reshape((0, 0, 0)).view(ImageArray)
+        self._buffer = np.zeros((0, 0, 0))
+        self._mask_buffer = None
+        self._stack_shape = (0, 0, 0)
 
     ###########################################################################
     ###################      Special methods     ##############################
@@ -276,13 +357,14 @@ class ImageStackMixin:
     def _instantiate(self, idx):
         """Reconstructs the data type."""
         r, c = self._sizes[idx]
+        name = self.__names__()[idx]
+        frame = self._stack[:r, :c, idx]
         if issubclass(
             self.type, ImageArray
         ):  # IF the underlying type is an ImageArray, then return as a view with extra metadata
-            tmp = self._stack[:r, :c, idx].view(type=self.type)
+            tmp = frame.view(type=self.type)
         else:  # Otherwise it must be something with a data attribute
-            tmp = self.type(self._stack[:r, :c, idx])
-        name = self.__names__()[idx]
+            tmp = self.type(frame)
         tmp.metadata = self._metadata[name]
         tmp._fromstack = True
         if name in self._public_attrs_store:
@@ -292,22 +374,133 @@ class ImageStackMixin:
             tmp.filename = self.__names__()[idx]
         return tmp
 
+    def _moments(self, weights=None, _serial=False, _chunk=8):
+        """Reduce the stack to a :py:class:`Stoner.Image.folders._RunningMoments` a block of frames at a time.
+
+        Keyword Arguments:
+            weights (list of float or ndarray, None):
+                One weight per image - either a scalar or an array the same shape as the images.
+            _serial (bool):
+                Ignored - the frames are reduced directly from the stack without a pool.
+            _chunk (int):
+                The number of frames reduced together in each block.
+
+        Returns:
+            (_RunningMoments):
+                The combined weighted mean and sum of squared deviations of the images.
+        """
+        if weights is not None and len(weights) != len(self):
+            raise ValueError(f"Need one weight per image, got {len(weights)} weights for {len(self)} images.")
+        if len(self) == 0:
+            raise RuntimeError("Cannot average an empty Imagefolder")
+        if np.any(self._sizes != self._sizes[0]):
+            raise RuntimeError("Cannot average Imagefolder if images have different sizes")
+        r, c = self._sizes[0]
+        mask = self._mask_buffer
+        moments = _RunningMoments()
+        _chunk = max(int(_chunk), 1)
+        for start in range(0, len(self), _chunk):
+            stop = min(start + _chunk, len(self))
+            data = self._buffer[:r, :c, start:stop].astype(float)
+            if weights is None:
+                weight = np.ones(data.shape)
+            else:
+                weight = np.stack(
+                    [np.broadcast_to(np.asarray(w, dtype=float), (r, c)) for w in weights[start:stop]], axis=-1
+                )
+            if mask is not None:
+                weight[mask[:r, :c, start:stop]] = 0.0
+            moments.push_block(data, weight)
+        return moments
+
+    def _new_buffer(self, shape, dtype):
+        """Allocate a zeroed array for the backing store - in memory or in a memory mapped temporary file."""
+        backing_store = getattr(self, "backing_store", None)
+        if not backing_store or np.prod(shape) == 0:
+            return np.zeros(shape, dtype=dtype)
+        directory = None if isinstance(backing_store, bool) else str(backing_store)
+        return np.memmap(TemporaryFile(dir=directory), dtype=dtype, mode="w+", shape=tuple(shape))
+
+    def _reserve(self, shape, dtype=None):
+        """Ensure that the backing store can hold a stack of *shape* and *dtype* without reallocating.
+
+        When the store has to grow, the number of images it can hold is at least doubled so that appending images
+        one at a time only needs a logarithmic number of copies of the stack.
+        """
+        dtype = self._buffer.dtype if dtype is None else np.dtype(dtype)
+        capacity = self._buffer.shape
+        if all(n <= c for n, c in zip(shape, capacity)) and dtype == self._buffer.dtype:
+            return
+        pages = capacity[2] if shape[2] <= capacity[2] else max(shape[2], 2 * capacity[2])
+        new_capacity = (max(shape[0], capacity[0]), max(shape[1], capacity[1]), pages)
+        row, col, pag = self._stack_shape
+        new = self._new_buffer(new_capacity, dtype)
+        new[:row, :col, :pag] = self._buffer[:row, :col, :pag]
+        self._buffer = new
+        if self._mask_buffer is not None:
+            new = self._new_buffer(new_capacity, bool)
+            new[:row, :col, :pag] = self._mask_buffer[:row, :col, :pag]
+            self._mask_buffer = new
+
     def _resize_stack(self, new_size, dtype=None):
-        """Create a new stack with a new size."""
-        old_size = self._stack.shape
-        assertion(isinstance(self._stack, ImageArray), f"Trying to resize a non-image aray {type(self._stack)}")
-        if old_size == new_size:
+        """Change the size of the stack, keeping the existing data and filling new space with zeros."""
+        old_size = self._stack_shape
+        new_size = tuple(new_size)
+        if old_size == new_size and (dtype is None or np.dtype(dtype) == self._buffer.dtype):
             return new_size
-        if dtype is None:
-            dtype = self._stack.dtype
+        self._reserve(new_size, dtype)
         row, col, pag = tuple([min(o, n) for o, n in zip(old_size, new_size)])
-
-        new = np.ma.zeros(new_size, dtype=dtype).view(ImageArray)
-        new[:row, :col, :pag] = self._stack[:row, :col, :pag]
-        new.mask = np.ma.getmaskarray(self._stack)[:row, :col, :pag]
-        self._stack = new
+        r, c, n = new_size
+        for buffer in (self._buffer, self._mask_buffer):  # Clear the newly exposed parts of the backing store
+            if buffer is not None:
+                buffer[row:r, :c, :n] = 0
+                buffer[:row, col:c, :n] = 0
+                buffer[:row, :col, pag:n] = 0
+        self._stack_shape = new_size
         return row, col, pag
 
+    def _allocate_mask(self):
+        """Return the mask for the backing store, allocating it if it has not been needed yet."""
+        if self._mask_buffer is None:
+            self._mask_buffer = self._new_buffer(self._buffer.shape, bool)
+        return self._mask_buffer
+
+    def _set_frame_mask(self, idx, mask, row, col):
+        """Store the mask for one image, only allocating the stack mask if the mask has anything set."""
+        if self._mask_buffer is None and (mask is np.ma.nomask or not np.any(mask)):
+            return
+        self._allocate_mask()[:row, :col, idx] = mask
+
+    @property
+    def _stack(self):
+        """Get the images as a 3D ImageArray (rows, columns, images) that is a view of the backing store.
+
+        Both the data and the mask are views of the backing store, so setting the mask of the stack, or of an image
+        taken from it, sets the mask in the backing store.
+        """
+        row, col, pag = self._stack_shape
+        mask = self._allocate_mask()[:row, :col, :pag]
+        ret = np.ma.MaskedArray(self._buffer[:row, :col, :pag], mask=mask, copy=False).view(ImageArray)
+        ret._sharedmask = False  # Write mask changes through to the backing store rather than to a copy
+        return ret
+
+    @_stack.setter
+    def _stack(self, value):
+        """Replace the backing store with a 3D array (rows, columns, images)."""
+        data = np.ma.getdata(value)
+        mask = np.ma.getmask(value)
+        if getattr(self, "backing_store", None) and data.size:
+            buffer = self._new_buffer(data.shape, data.dtype)
+            buffer[...] = data
+            data = buffer
+        self._buffer = data
+        self._stack_shape = data.shape
+        if mask is np.ma.nomask or not mask.any():
+            self._mask_buffer = None
+        else:
+            self._mask_buffer = self._new_buffer(data.shape, bool)
+            self._mask_buffer[...] = mask
+
     ###########################################################################
     ################### Properties of ImageStack ##############################
 
@@ -332,7 +525,7 @@ class ImageStackMixin:
     @property
     def shape(self):
         """Return the stack shape - after re-ordering the indices."""
-        x, y, z = self._stack.shape
+        x, y, z = self._stack_shape
         return (z, x, y)
 
     ###########################################################################
@@ -381,11 +574,13 @@ class ImageStackMixin:
         from .imagefuncs import convert
 
         # Aactually this is just a pass through for the imagefuncs.convert routine
-        mask = self._stack.mask
+        mask = self._mask_buffer
         self._stack = convert(self._stack, dtype, force_copy=force_copy, uniform=uniform, normalise=normalise).view(
-            type(self._stack)
+            ImageArray
         )
-        self._stack.mask = mask
+        if mask is not None:
+            row, col, pag = self._stack_shape
+            self._mask_buffer = mask[:row, :col, :pag]
         return self
 
     def asfloat(self, normalise=True, clip=False, clip_negative=False, **kargs):
@@ -518,6 +713,238 @@ class StackAnalysisMixin:
             self._stack[:, :, i] -= bg * im_mean / bgmean
         return self
 
+    def level_image(self, poly_vert=1, poly_horiz=1, box=None, poly=None, mode="clip"):
+        """Subtract a polynomial background from all the images in the stack at once.
+
+        Keword Arguments:
+            poly_vert (int):
+                Order of the polynomial to fit in the vertical direction, 0 to not level vertically.
+            poly_horiz (int):
+                Order of the polynomial to fit in the horizontal direction, 0 to not level horizontally.
+            box (array, list or tuple of int):
+                [xmin,xmax,ymin,ymax] region to fit the backgrounds to - None for the whole image.
+            poly (list or None):
+                [phoriz, pvert] polynomial coefficients to subtract from every image instead of fitting them.
+            mode (str):
+                Either 'clip' or 'norm' - how to handle values that end up outside of the range of the image type.
+
+        Returns:
+            (ImageStack):
+                The modified image stack.
+
+        Notes:
+            This does the same as :py:func:`Stoner.Image.imagefuncs.level_image` for every image. The average
+            profiles of all the images are fitted together with :py:func:`Stoner.Image.util.fit_profile`, so the
+            polynomial basis is only factorised once and applied to the whole stack with one matrix product. Masked
+            pixels are left out of the fits. The stack is converted to floating point first and the subtracted
+            polynomials are stored in each image's *poly_sub* metadata. Stacks of different sized images are
+            levelled one image at a time.
+        """
+        if len(self) == 0:
+            return self
+        if not np.all(self._sizes == self._sizes[0]):
+            self.each.level_image(poly_vert=poly_vert, poly_horiz=poly_horiz, box=box, poly=poly, mode=mode)
+            return self
+        if self._stack.dtype.kind != "f":
+            self.convert(np.float64, normalise=False)
+        r, c = self._sizes[0]
+        stack = self._stack[:r, :c]
+        window = (slice(None), slice(None)) if box is None else stack[:, :, 0]._box(box)
+        frames = np.moveaxis(np.ma.MaskedArray(np.ma.getdata(stack), np.ma.getmask(stack))[window], -1, 0)
+        background = np.zeros((r, c, len(self)))
+        p_horiz = p_vert = [0] * len(self)
+        if poly_horiz > 0:
+            if poly is not None:
+                p_horiz = np.tile(np.asarray(poly[0], dtype=float), (len(self), 1))
+            else:
+                p_horiz = fit_profile(frames, -2, poly_horiz)
+            background += (p_horiz @ poly_basis(c, p_horiz.shape[1] - 1)).T[None, :, :]
+        if poly_vert > 0:
+            if poly is not None:
+                p_vert = np.tile(np.asarray(poly[1], dtype=float), (len(self), 1))
+            else:
+                p_vert = fit_profile(frames, -1, poly_vert)
+            background += (p_vert @ poly_basis(r, p_vert.shape[1] - 1)).T[:, None, :]
+        data = np.ma.getdata(stack)
+        data -= background
+        for name, horiz, vert in zip(self.__names__(), p_horiz, p_vert):
+            self._metadata[name]["poly_sub"] = (horiz, vert)
+        if mode == "clip":
+            np.clip(data, *dtype_range[data.dtype.type], out=data)
+        elif mode == "norm":
+            self.each.normalise()
+        return self
+
+    def _fft_chunks(self, chunk_size=32, **kargs):
+        """Generate (start, stop, spectra) for chunks of the frames of the stack.
+
+        The spectra are (frames, rows, columns) arrays from :py:func:`Stoner.Image.util.fft_spectrum`, which is
+        passed the keyword arguments.
+        """
+        if not np.all(self._sizes == self._sizes[0]):
+            raise ValueError("Can only Fourier transform a stack of images that are all the same size.")
+        r, c = self._sizes[0]
+        chunk_size = max(1, int(chunk_size))
+        for start in range(0, len(self), chunk_size):
+            stop = min(start + chunk_size, len(self))
+            frames = np.moveaxis(np.ma.getdata(self._stack[:r, :c, start:stop]), -1, 0)
+            yield start, stop, fft_spectrum(frames, **kargs)
+
+    def fft(self, shift=True, phase=False, remove_dc=False, gaussian=None, window=None, real=False, **kargs):
+        """Fourier transform all the images in the stack.
+
+        Keyword Arguments:
+            shift, phase, remove_dc, gaussian, window, real:
+                As for :py:func:`Stoner.Image.imagefuncs.fft`.
+            chunk_size (int):
+                The number of images to transform at once (default 32).
+            workers (int or None):
+                Maximum number of threads to use for the transforms (-1 for all the CPUs).
+
+        Returns:
+            (ImageStack):
+                A new stack of the spectra with a copy of the metadata of each image.
+
+        Notes:
+            The images are transformed in chunks straight from the 3D stack with batched 2D transforms, so the window
+            function is calculated once and, if pyFFTW is installed, the plan is reused for every chunk.
+        """
+        opts = {"shift": shift, "phase": phase, "remove_dc": remove_dc, "window": window, "real": real}
+        opts["workers"] = kargs.pop("workers", None)
+        out = None
+        for start, stop, spectra in self._fft_chunks(kargs.pop("chunk_size", 32), **opts):
+            if out is None:
+                out = np.zeros((len(self),) + spectra.shape[1:], dtype=spectra.dtype)
+            out[start:stop] = spectra
+        if isinstance(gaussian, (float, int)) and out is not None:
+            out = ndi.gaussian_filter(out, (0, gaussian, gaussian), mode="nearest")
+        ret = type(self)(out if out is not None else [])
+        ret._metadata = deepcopy(self._metadata)
+        ret._names = list(self._names)
+        return ret
+
+    def power_spectrum(self, window=None, shift=True, real=False, chunk_size=32, workers=None):
+        """Calculate the average power spectrum of all the images in the stack.
+
+        Keyword Arguments:
+            window (None or str):
+                Window function to multiply each image by first - see :py:func:`Stoner.Image.imagefuncs.fft`.
+            shift (bool):
+                Shift the zero frequency to the centre of the spectrum (default True).
+            real (bool):
+                Use a real-to-complex transform that only calculates the non-negative horizontal frequencies.
+            chunk_size (int):
+                The number of images to transform at once (default 32).
+            workers (int or None):
+                Maximum number of threads to use for the transforms (-1 for all the CPUs).
+
+        Returns:
+            (ImageFile):
+                The mean of the squared magnitudes of the Fourier transforms of the images. The number of images
+                averaged is stored in the *frames* metadata.
+
+        Notes:
+            The images are transformed in chunks with batched 2D transforms and the power added to a running total,
+            so only one chunk of spectra is held in memory at a time.
+        """
+        opts = {"shift": shift, "phase": None, "window": window, "real": real, "workers": workers}
+        total = 0.0
+        for _, _, spectra in self._fft_chunks(chunk_size, **opts):
+            total = total + (spectra.real**2 + spectra.imag**2).sum(axis=0)
+        ret = ImageFile(total / max(len(self), 1))
+        ret["frames"] = len(self)
+        return ret
+
+    def align(self, *args, **kargs):
+        """Align each image in the stack to a reference image.
+
+        Args:
+            ref (str, int, ImageFile, ImageArray or 2D array):
+                The reference image to align to. If a string or an int, then this is used to lookup the corresponding
+                member of the ImageStack which is then used. ImageFiles, ImageArrays and 2D arrays are used directly
+                as reference images.
+
+        Keyword Arguments:
+            method (str):
+                If "fft" then the whole stack is registered to the reference by phase correlation in a single
+                batched calculation (see Notes). Any other method is passed to
+                :py:meth:`Stoner.Image.ImageFolder.align` to be done image by image.
+            box (int, float, tuple of ints or floats):
+                Specifies a subset of the images to be used to calculate the alignment with.
+            upsample_factor (int):
+                For the "fft" method, images are registered to within 1/upsample_factor of a pixel (default 50).
+            do_shift (bool):
+                For the "fft" method, if False only calculate the shifts and store them in the metadata (default True).
+            chunk_size (int):
+                For the "fft" method, the number of frames to Fourier transform at once (default 32).
+            mode, cval, order:
+                For the "fft" method, passed to :py:func:`scipy.ndimage.shift` when translating the images. The
+                defaults are "mirror", the mean value of each frame and 3.
+
+        Returns:
+            The aligned ImageStack.
+
+        Notes:
+            The "fft" method works directly on the 3D stack. The Fourier transform of the reference is calculated
+            once and then the frames are transformed in chunks and cross-correlated with the reference to find the
+            whole pixel shifts. The upsampled DFT refinement of each shift and the translation of each frame is then
+            carried out using the folder's multiprocessing options. Each image is translated in place and the shift
+            stored in its metadata as *tvec*, along with the *translation_limits*, so the results can be used in the
+            same way as those of the other alignment methods.
+        """
+        method = kargs.get("method", "scharr")
+        if not isinstance(method, string_types) or method.lower() != "fft":
+            return super().align(*args, **kargs)
+        kargs.pop("method")
+        ref_data = self._align_reference(*args)
+        if not np.all(self._sizes == self._sizes[0]):  # Can only do the batch method with uniform sizes
+            return super().align(*args, **kargs)
+        upsample_factor = kargs.pop("upsample_factor", 50)
+        do_shift = kargs.pop("do_shift", True)
+        chunk_size = max(1, int(kargs.pop("chunk_size", 32)))
+        shift_args = {
+            "mode": kargs.pop("mode", "mirror"),
+            "cval": kargs.pop("cval", None),
+            "order": kargs.pop("order", 3),
+        }
+        if "box" in kargs or "_box" in kargs:
+            box = kargs.pop("box", kargs.pop("_box", None))
+            if not isIterable(box):
+                box = [box]
+            window = ref_data._box(*box)
+        else:
+            window = (slice(None, None, None), slice(None, None, None))
+        r, c = self._sizes[0]
+        if ref_data.shape != (r, c):
+            raise ValueError(f"Reference image shape {ref_data.shape} does not match the stack image shape {(r, c)}")
+
+        ref_fft = np.fft.fft2(np.ma.getdata(ref_data)[window])
+        names = self.__names__()
+        p, imap = get_pool()
+        worker = partial(_register_frame, upsample_factor=upsample_factor, do_shift=do_shift, **shift_args)
+        for start in range(0, len(self), chunk_size):
+            stop = min(start + chunk_size, len(self))
+            frames = np.ma.getdata(self._stack[:r, :c, start:stop])
+            # Batched FFT of the chunk and the cross-power spectrum with the reference
+            product = ref_fft[:, :, None] * np.fft.fft2(frames[window], axes=(0, 1)).conj()
+            cross_corr = np.abs(np.fft.ifft2(product, axes=(0, 1)))
+            peaks = cross_corr.reshape(-1, stop - start).argmax(axis=0)
+            shape = np.array(product.shape[:2])
+            coarse = np.column_stack(np.unravel_index(peaks, product.shape[:2])).astype(float)
+            coarse = np.where(coarse > np.fix(shape / 2), coarse - shape, coarse)
+            jobs = ((frames[:, :, ix], product[:, :, ix], coarse[ix]) for ix in range(stop - start))
+            for ix, (shift, shifted) in enumerate(imap(worker, jobs), start=start):
+                if shifted is not None:
+                    self._stack[:r, :c, ix] = shifted
+                metadata = self._metadata[names[ix]]
+                metadata["tvec"] = tuple(shift)
+                metadata["translation_limits"] = translate_limits(frames[:, :, 0], tuple(shift))
+        if p is not None:
+            p.close()
+            p.join()
+        self._align_limits()
+        return self
+
 
 class ImageStack(StackAnalysisMixin, ImageStackMixin, ImageFolderMixin, DiskBasedFolderMixin, baseFolder):
 
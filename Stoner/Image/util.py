@@ -3,13 +3,41 @@
 
 from __future__ import division
 
-__all__ = ["sign_loss", "prec_loss", "dtype_range", "_dtype", "_dtype2"]
+__all__ = [
+    "sign_loss",
+    "prec_loss",
+    "dtype_range",
+    "_dtype",
+    "_dtype2",
+    "GeometryCache",
+    "geometry_cache",
+    "poly_basis",
+    "basis_lstsq",
+    "polyfit_rows",
+    "fit_profile",
+    "fit_surface",
+    "fft_window",
+    "fft2",
+    "fft_spectrum",
+]
+from collections import OrderedDict, namedtuple
+from threading import Lock
 from warnings import warn
 
 import numpy as np
+from scipy import fft as scipy_fft
+from skimage.filters import window as _window
 
 from ..core.base import regexpDict
 
+try:  # Use pyFFTW's planned transforms if it is available
+    import pyfftw
+    from pyfftw.interfaces import scipy_fft as fftw_fft
+
+    pyfftw.interfaces.cache.enable()
+except ImportError:
+    fftw_fft = None
+
 dtype_range = {
     np.bool_: (False, True),
     np.bool8: (False, True),
@@ -45,6 +73,91 @@ _supported_types = (
 dtype_range[np.float16] = (-1, 1)
 _supported_types += (np.float16,)
 
+GEOMETRY_CACHE_SIZE = 64 * 1024 ** 2  # Bytes of coordinate grids etc to keep
+
+GeometryCacheInfo = namedtuple("GeometryCacheInfo", ["hits", "misses", "entries", "nbytes", "max_bytes"])
+
+
+class GeometryCache:
+
+    """A bounded cache of read-only arrays that only depend on the geometry of an image.
+
+    Co-ordinate grids, polynomial basis functions and window functions are the same for every image with the same
+    shape, centre, pixel size etc., so when processing many images of the same size they are only calculated once
+    and then shared. The arrays are made read-only so that they cannot be changed by accident.
+
+    Args:
+        max_bytes (int):
+            The maximum total size of the cached arrays - the least recently used arrays are dropped to make room.
+
+    Attributes:
+        hits (int):
+            The number of times a cached value was used.
+        misses (int):
+            The number of times a value had to be calculated.
+    """
+
+    def __init__(self, max_bytes=GEOMETRY_CACHE_SIZE):
+        """Start with an empty cache."""
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.nbytes = 0
+        self._store = OrderedDict()
+        self._lock = Lock()
+
+    def __call__(self, key, factory):
+        """Return the cached value for key, calling factory() to calculate it if necessary.
+
+        Args:
+            key (hashable):
+                Describes what the value is and the geometry it is for, e.g. ("radial", shape, centre, pixel_size).
+            factory (callable):
+                Called with no arguments to calculate an array or tuple of arrays.
+
+        Returns:
+            (ndarray or tuple of ndarray):
+                The read-only value.
+        """
+        with self._lock:
+            if key in self._store:
+                self.hits += 1
+                self._store.move_to_end(key)
+                return self._store[key][0]
+        value = factory()
+        arrays = value if isinstance(value, tuple) else (value,)
+        for arr in arrays:
+            arr.setflags(write=False)
+        size = sum(arr.nbytes for arr in arrays)
+        with self._lock:
+            self.misses += 1
+            if key not in self._store:
+                self._store[key] = (value, size)
+                self.nbytes += size
+            while self.nbytes > self.max_bytes and len(self._store) > 1:
+                self.nbytes -= self._store.popitem(last=False)[1][1]
+        return value
+
+    @property
+    def hit_rate(self):
+        """Return the fraction of lookups that found a cached value."""
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def info(self):
+        """Return the hits, misses, number of entries, size and maximum size of the cache."""
+        with self._lock:
+            return GeometryCacheInfo(self.hits, self.misses, len(self._store), self.nbytes, self.max_bytes)
+
+    def clear(self):
+        """Empty the cache and reset the hit and miss counts."""
+        with self._lock:
+            self._store.clear()
+            self.hits = self.misses = self.nbytes = 0
+
+
+geometry_cache = GeometryCache()
+
 
 def sign_loss(dtypeobj_in, dtypeobj):
     """Warn over loss of sign information when converting image."""
@@ -129,3 +242,239 @@ def _scale(a, n, m, dtypeobj_in, dtypeobj, copy=True):
     a *= (2 ** o - 1) // (2 ** n - 1)
     a //= 2 ** (o - m)
     return a
+
+
+def poly_basis(length, order):
+    """Return a cached (order+1, length) array of the powers of 0...length-1, highest power first."""
+
+    def _basis():
+        return np.arange(length, dtype=float)[None, :] ** np.arange(order, -1, -1)[:, None]
+
+    return geometry_cache(("poly_basis", int(length), int(order)), _basis)
+
+
+def basis_lstsq(key, factory, values, weights=None):
+    """Least-squares fit many sets of values to the same basis functions, only factorising the basis once.
+
+    Args:
+        key (hashable):
+            Identifies the basis functions - the basis and its pseudo-inverse are kept in :py:data:`geometry_cache`
+            under this key.
+        factory (callable):
+            Called with no arguments to calculate the (points, terms) array of basis functions.
+        values (array):
+            The (..., points) values to fit.
+
+    Keyword Arguments:
+        weights (array or None):
+            Weights of the squared residuals of the values with the same shape as *values*, e.g. 0 for masked
+            points. If None, every set of values is fitted with a single matrix product with the cached
+            pseudo-inverse of the basis, otherwise the weighted normal equations are solved for each set of values.
+
+    Returns:
+        (ndarray):
+            The (..., terms) coefficients of the basis functions.
+    """
+    basis = geometry_cache(("lstsq_basis", key), factory)
+    values = np.asarray(values, dtype=float)
+    if weights is None:
+        pinv = geometry_cache(("lstsq_pinv", key), lambda: np.linalg.pinv(basis))
+        return values @ pinv.T
+    weights = np.broadcast_to(np.asarray(weights, dtype=float), values.shape)
+    gram = np.einsum("pi,...p,pj->...ij", basis, weights, basis)
+    return np.einsum("...ij,...j->...i", np.linalg.pinv(gram), (weights * values) @ basis)
+
+
+def polyfit_rows(values, order, weights=None):
+    """Fit a polynomial in the index of the points to each row of values, as :py:func:`numpy.polyfit` would.
+
+    Args:
+        values (array):
+            The (..., points) values to fit, the x co-ordinates are 0...points-1.
+        order (int):
+            The order of the polynomial.
+
+    Keyword Arguments:
+        weights (array or None):
+            Weights of the squared residuals, see :py:func:`basis_lstsq`.
+
+    Returns:
+        (ndarray):
+            The (..., order+1) polynomial coefficients, highest power first.
+    """
+    values = np.asarray(values, dtype=float)
+    length = values.shape[-1]
+    scale = max(length - 1, 1)  # Fit in x/scale to keep the basis well conditioned
+    powers = np.arange(order, -1, -1)
+
+    def _vander():
+        return (np.arange(length) / scale)[:, None] ** powers[None, :]
+
+    return basis_lstsq(("vander", length, int(order)), _vander, values, weights) / scale ** powers
+
+
+def fit_profile(data, axis, order):
+    """Fit polynomials to the average profiles of one or more images, keeping their average level.
+
+    Args:
+        data (array):
+            The (..., rows, columns) images - masked pixels are left out of the averages.
+        axis (int):
+            The axis to average along, -2 for the horizontal profile or -1 for the vertical profile.
+        order (int):
+            The order of the polynomial.
+
+    Returns:
+        (ndarray):
+            The (..., order+1) polynomial coefficients, highest power first. The average of each profile is taken
+            off the constant term, so subtracting the polynomial does not change the average level of the image.
+    """
+    mask = np.ma.getmaskarray(data)
+    values = np.ma.getdata(data).astype(float)
+    if not mask.any():
+        profile = values.mean(axis=axis)
+        coeffs = polyfit_rows(profile, order)
+        coeffs[..., -1] -= profile.mean(axis=-1)
+        return coeffs
+    count = (~mask).sum(axis=axis)
+    profile = np.where(mask, 0.0, values).sum(axis=axis) / np.maximum(count, 1)
+    used = count > 0  # Leave out wholly masked rows or columns
+    coeffs = polyfit_rows(profile, order, used)
+    coeffs[..., -1] -= (profile * used).sum(axis=-1) / np.maximum(used.sum(axis=-1), 1)
+    return coeffs
+
+
+_SURFACE_TERMS = {
+    "plane": ((0, 0), (1, 0), (0, 1)),
+    "parabola": ((0, 0), (1, 0), (0, 1), (2, 0), (0, 2)),
+}
+
+
+def fit_surface(frames, terms="plane", box=None, mask=None):
+    """Fit and evaluate a polynomial background surface for one or more images at once.
+
+    Args:
+        frames (array):
+            The (..., rows, columns) images to fit.
+
+    Keyword Arguments:
+        terms (str, int or sequence of (int, int)):
+            The powers of x and y to include - "plane" (1, x, y), "parabola" (1, x, y, x**2, y**2), an integer for
+            all the terms up to that total order or a sequence of (x power, y power) pairs.
+        box (tuple of 4 ints or None):
+            (xmin, xmax, ymin, ymax) region of the images to fit, the background is evaluated over the whole image.
+            None fits the whole image.
+        mask (array or None):
+            True for pixels to leave out of the fit, if None the mask of *frames* is used if it is a masked array.
+
+    Returns:
+        (ndarray, ndarray):
+            The background surfaces, with the same shape as *frames*, and the (..., terms) coefficients.
+
+    Notes:
+        The x and y co-ordinates run from -1 to 1 across the width and height of the whole image. The pseudo-inverse
+        of the basis is cached for each image shape, box and set of terms, so all the images are fitted with a
+        single matrix product unless there are masked pixels, in which case the weighted normal equations are solved
+        for each image.
+    """
+    if isinstance(terms, str):
+        if terms not in _SURFACE_TERMS:
+            raise ValueError(f"Unknown background surface {terms}")
+        terms = _SURFACE_TERMS[terms]
+    elif isinstance(terms, int):
+        terms = [(px, order - px) for order in range(terms + 1) for px in range(order, -1, -1)]
+    terms = tuple((int(px), int(py)) for px, py in terms)
+    if mask is None:
+        mask = np.ma.getmask(frames)
+    values = np.ma.getdata(frames).astype(float)
+    rows, cols = values.shape[-2:]
+    xmin, xmax, ymin, ymax = (0, cols, 0, rows) if box is None else tuple(int(b) for b in box)
+    x, y = np.linspace(-1, 1, cols), np.linspace(-1, 1, rows)
+
+    def _basis():
+        xs, ys = np.meshgrid(x[xmin:xmax], y[ymin:ymax])
+        return np.column_stack([xs.ravel() ** px * ys.ravel() ** py for px, py in terms])
+
+    window = values[..., ymin:ymax, xmin:xmax]
+    flat = window.reshape(window.shape[:-2] + (-1,))
+    weights = None
+    if mask is not np.ma.nomask and np.any(mask):
+        weights = ~np.broadcast_to(mask, values.shape)[..., ymin:ymax, xmin:xmax].reshape(flat.shape)
+    key = ("surface", (rows, cols), (xmin, xmax, ymin, ymax), terms)
+    coeffs = basis_lstsq(key, _basis, flat, weights)
+    background = np.zeros(values.shape)
+    for ix, (px, py) in enumerate(terms):
+        background += coeffs[..., ix, None, None] * np.outer(y ** py, x ** px)
+    return background, coeffs
+
+
+def fft_window(window, shape):
+    """Return a cached read-only window function (see :py:func:`skimage.filters.window`) for a shape of image."""
+    if isinstance(window, list):
+        window = tuple(window)
+    return geometry_cache(("window", window, tuple(shape)), lambda: _window(window, shape))
+
+
+def fft2(data, axes=(-2, -1), real=False, workers=None):
+    """Calculate the 2D fast Fourier transform of one or more images.
+
+    Args:
+        data (array):
+            The image data.
+
+    Keyword Arguments:
+        axes (2-tuple of int):
+            The axes of the images in *data* - the transform is batched over any other axes.
+        real (bool):
+            If True, treat the data as real and only calculate the non-negative frequencies of the last axis.
+        workers (int or None):
+            Maximum number of threads to use (-1 for all the CPUs).
+
+    Returns:
+        (ndarray):
+            The complex Fourier transform.
+
+    Notes:
+        If pyFFTW is installed, its planned transforms are used with the plans cached between calls, otherwise
+        :py:mod:`scipy.fft` is used.
+    """
+    backend = scipy_fft if fftw_fft is None else fftw_fft
+    func = backend.rfft2 if real else backend.fft2
+    return func(data, axes=axes, workers=workers)
+
+
+def fft_spectrum(data, shift=True, phase=False, remove_dc=False, window=None, real=False, workers=None):
+    """Calculate the Fourier spectra of a (..., rows, columns) array of images.
+
+    Keyword Arguments:
+        shift (bool):
+            Shift the spectra so that zero frequency is in the centre of the image - for a real transform only the
+            rows are shifted.
+        phase (bool, None):
+            If True return the phase angles, if False the magnitude and if None the complex transform.
+        remove_dc (bool):
+            Replace the corner (dc) points of each unshifted spectrum with the mean of the spectrum.
+        window (None or str):
+            Multiply the images by this window function (see :py:func:`fft_window`) first.
+        real (bool):
+            Use a real-to-complex transform, which only returns the non-negative frequencies of the columns.
+        workers (int or None):
+            Maximum number of threads to use in the transforms.
+
+    Returns:
+        (ndarray):
+            The spectra.
+    """
+    data = np.ma.getdata(data)
+    if window:
+        data = data * fft_window(window, data.shape[-2:])
+    r = fft2(data, real=real, workers=workers)
+    if remove_dc:
+        fill = r.mean(axis=(-2, -1))
+        for row, col in ((0, 0), (-1, 0), (-1, -1), (0, -1)):
+            r[..., row, col] = fill
+    if shift:
+        r = scipy_fft.fftshift(r, axes=-2 if real else (-2, -1))
+    if phase is None:
+        return r
+    return np.angle(r) if phase else np.abs(r)
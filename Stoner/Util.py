@@ -1,10 +1,11 @@
 # -*- coding: utf-8 -*-
 """Stoner.Utils - a module of some slightly experimental routines that use the Stoner classes."""
-__all__ = ["split_up_down", "ordinal", "hysteresis_correct"]
+__all__ = ["split_up_down", "sweep_segments", "ordinal", "hysteresis_correct", "hysteresis_batch"]
 import numpy as np
 from numpy import max, argmax, mean  # pylint: disable=redefined-builtin
 from scipy.stats import sem
 from scipy.optimize import fsolve
+from scipy.ndimage import uniform_filter1d
 
 from .Core import DataFile
 
@@ -150,20 +151,65 @@ def _up_down(data):
 
     # Build a boolean array to index the data for rows that where x is increasing
     rising = np.zeros(len(data), dtype=bool)
-    for ix, iy in zip(indices[:-1], indices[1:]):
-        if data.x[iy] > data.x[ix]:
-            rising[ix:iy] = True
+    rising[: indices[-1]] = np.repeat(data.x[indices[1:]] > data.x[indices[:-1]], np.diff(indices))
 
-    # Clone the data and select rows that are either rising or falling in the two clones.
-    up = data.clone
-    up.data = up.data[rising]
-    down = data.clone
-    down.data = down.data[~rising]
-    # Done.
-    return up, down
+    # Select rows that are either rising or falling into two new objects.
+    return _rows(data, rising), _rows(data, ~rising)
 
 
-def split_up_down(data, col=None, folder=None):
+def _rows(data, index):
+    """Make a new object of the same type as data with just some of its rows.
+
+    Args:
+        data (DataFile):
+            The source of the rows.
+        index (slice or array of int or bool):
+            The rows to keep. A slice gives a view of the rows of *data*, rather than a copy.
+
+    Returns:
+        (DataFile):
+            The selected rows, with a copy of the metadata of *data*.
+    """
+    ret = type(data)()
+    ret.data = data.data[index]
+    ret.metadata = data.metadata.copy()
+    ret.filename = data.filename
+    return ret
+
+
+def sweep_segments(data, col=None, width=5):
+    """Find the ranges of rows where a column of data is steadily rising or falling.
+
+    Args:
+        data (DataFile or 1D array):
+            The data to be split up.
+
+    Keyword Arguments:
+        col (index):
+            The column to look at, defaults to the x column if *data* is a DataFile.
+        width (int):
+            Number of steps to average the changes in the column over, to stop noise from splitting a sweep.
+
+    Returns:
+        (2D array of int, 1D array of bool):
+            The start and stop rows of each sweep, which can be used as slices, and whether each sweep is rising.
+
+    The direction of every row is found at once from the sign of the smoothed steps in the column, so this is quick
+    even for long runs with many sweeps.
+    """
+    if isinstance(data, DataFile):
+        if col is None:
+            col = data._col_args().xcol
+        data = data.column(col)
+    x = np.ravel(data)
+    if x.size < 2:
+        return np.array([[0, x.size]]), np.array([True])
+    rising = _sweep_rising(x, width)
+    starts = np.append(0, np.flatnonzero(rising[1:] != rising[:-1]) + 1)
+    return np.column_stack((starts, np.append(starts[1:], x.size))), rising[starts]
+
+
+def split_up_down(data, col=None, folder=None, width=5, copy=False):
     """Split the DataFile data into several files where the column *col* is either rising or falling.
 
     Args:
@@ -174,53 +220,35 @@ def split_up_down(data, col=None, folder=None):
         folder (:py:class:`Stoner.Folders.DataFolder` or None):
             if this is an instance of :py:class:`Stoner.Folders.DataFolder` then add
             rising and falling files to groups of this DataFolder, otherwise create a new one
+        width (int):
+            Number of rows to smooth over when looking for changes in direction - see :py:func:`sweep_segments`.
+        copy (bool):
+            If True, each file gets a copy of its rows of data (default False).
 
     Returns:
         (:py:class:`Sonter.Folder.DataFolder`):
             with two groups, rising and falling
+
+    Notes:
+        Unless *copy* is True, the data in each file is a view of the rows of *data*, so changing values in the
+        data of the files (e.g. with :py:func:`hysteresis_correct`) will also change *data*.
     """
-    a = make_Data(data)
-    if col is None:
-        _ = a._col_args()
-        col = _.xcol
-    width = int(len(a) / 10)
-    if width % 2 == 0:  # Ensure the window for Satvisky Golay filter is odd
-        width += 1
-    setas = a.setas.clone
-    a.setas = ""
-    peaks = list(a.peaks(ycol=col, width=width, full_data=False))
-    troughs = list(a.peaks(ycol=col, width=width, peaks=False, troughs=True, full_data=False))
-    a.setas = setas
-    if peaks and troughs:  # Ok more than up down here
-        order = peaks[0] < troughs[0]
-    elif peaks:  # Rise then fall
-        order = True
-    elif troughs:  # Fall then rise
-        order = False
-    else:  # No peaks or troughs so just return a single rising
+    if not isinstance(data, DataFile):
+        data = make_Data(data)
+    ranges, rising = sweep_segments(data, col, width)
+    if len(ranges) == 1:  # No peaks or troughs so just return a single sweep
         ret = DataFolder(readlist=False)
         ret += data
         return ret
-    splits = [0, len(a)]
-    splits.extend(peaks)
-    splits.extend(troughs)
-    splits.sort()
-    splits = [int(s) for s in splits]
     if not isinstance(folder, DataFolder):  # Create a new DataFolder object
         output = DataFolder(readlist=False)
     else:
         output = folder
     output.add_group("rising")
     output.add_group("falling")
-
-    if order:
-        risefall = ["rising", "falling"]
-    else:
-        risefall = ["falling", "rising"]
-    for i in range(len(splits) - 1):
-        working = data.clone
-        working.data = data.data[splits[i] : splits[i + 1], :]
-        output.groups[risefall[i % 2]].append(working)
+    for (start, stop), up in zip(ranges, rising):
+        index = np.arange(start, stop) if copy else slice(start, stop)
+        output.groups["rising" if up else "falling"].append(_rows(data, index))
     return output
 
 
@@ -395,3 +423,277 @@ def hysteresis_correct(data, **kargs):
 
     data["Area"] = data.integrate(output="result")
     return cls(data)
+
+
+def _sweep_rising(x, width=1):
+    """Work out whether the x data is increasing at each point of one or more sweeps at once.
+
+    Args:
+        x (array):
+            1D or 2D array of x values - each row of a 2D array is a separate sweep.
+
+    Keyword Arguments:
+        width (int):
+            Number of steps in x to average over to smooth out noise in the x data.
+
+    Returns:
+        (array of bool):
+            True where the x data is rising. Flat sections take the direction of the last step that changed x.
+    """
+    step = np.diff(np.asarray(x, dtype=float), axis=-1)
+    if width > 1:
+        step = uniform_filter1d(step, int(width), axis=-1, mode="nearest")
+    moved = np.where(step != 0, np.arange(step.shape[-1]), 0)
+    step = np.take_along_axis(step, np.maximum.accumulate(moved, axis=-1), axis=-1)
+    return np.concatenate((step > 0, step[..., -1:] > 0), axis=-1)
+
+
+def _batch_lstsq(basis, values, mask):
+    """Make a least-squares fit of a linear model to each row of values at once.
+
+    Args:
+        basis (3D array):
+            The basis functions of the model with shape (loops, points, parameters).
+        values (2D array):
+            The data to fit, shape (loops, points).
+        mask (2D array of bool):
+            The points of each row to include in the fit.
+
+    Returns:
+        (2D array, 2D array):
+            The best fit parameters and their standard errors for each row. The errors are scaled by the residuals
+            in the same way as :py:func:`scipy.optimize.curve_fit`.
+    """
+    weights = mask.astype(float)
+    values = np.where(mask, values, 0.0)
+    cov = np.linalg.pinv(np.einsum("npi,np,npj->nij", basis, weights, basis))
+    popt = np.einsum("nij,nj->ni", cov, np.einsum("npi,np->ni", basis, weights * values))
+    residuals = values - np.einsum("npi,ni->np", basis, popt)
+    dof = weights.sum(axis=1) - basis.shape[2]
+    with np.errstate(invalid="ignore", divide="ignore"):
+        s_sq = (weights * residuals**2).sum(axis=1) / np.where(dof > 0, dof, np.nan)
+        perr = np.sqrt(np.diagonal(cov, axis1=1, axis2=2) * s_sq[:, None])
+    return popt, perr
+
+
+def _batch_branch(mask, *arrays):
+    """Gather the points of each row where mask is True to the start of the row, keeping their order.
+
+    Returns:
+        (list of 2D arrays):
+            The gathered arrays, followed by a boolean array that is True where a point is in the branch and
+            another boolean array that is True for each pair of adjacent gathered points in the branch.
+    """
+    order = np.argsort(~mask, axis=1, kind="stable")
+    count = mask.sum(axis=1)[:, None]
+    points = np.arange(mask.shape[1]) < count
+    pairs = np.arange(mask.shape[1] - 1) < count - 1
+    return [np.take_along_axis(a, order, axis=1) for a in arrays] + [points, pairs]
+
+
+def _batch_crossings(y, x, pairs, rising=True, falling=False):
+    """Find the mean and standard error of the x values where each row of y crosses zero.
+
+    The x value of each crossing is linearly interpolated between the two points either side of it.
+    """
+    y0, y1 = y[:, :-1], y[:, 1:]
+    found = np.zeros(y0.shape, dtype=bool)
+    if rising:
+        found |= (y1 >= 0) & (y0 < 0)
+    if falling:
+        found |= (y1 <= 0) & (y0 > 0)
+    found &= pairs
+    count = found.sum(axis=1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        xc = np.where(found, x[:, :-1] + (x[:, 1:] - x[:, :-1]) * y0 / (y0 - y1), 0.0)
+        centre = xc.sum(axis=1) / np.where(count > 0, count, np.nan)
+        var = np.where(found, (xc - centre[:, None]) ** 2, 0.0).sum(axis=1) / np.where(count > 1, count - 1, np.nan)
+        return centre, np.sqrt(var / count)
+
+
+def _batch_loops(loops, field, setas):
+    """Sort out the field and moment arrays of the loops for :py:func:`hysteresis_batch`.
+
+    Returns:
+        (list of (array, array, array), list of str or None):
+            Groups of (loop indices, field, moment) with all the loops in a group having the same number of points
+            and the filenames of the loops if they came from DataFile like objects.
+    """
+    if field is not None:  # A stack of loops as an array
+        moment = np.atleast_2d(np.asarray(loops, dtype=float))
+        field = np.broadcast_to(np.asarray(field, dtype=float), moment.shape)
+        return [(np.arange(moment.shape[0]), field, moment)], None
+    if isinstance(loops, DataFile):
+        loops = [loops]
+    by_length = {}
+    names = []
+    for ix, loop in enumerate(loops):
+        loop = make_Data(loop)
+        if setas is not None:
+            loop.setas = setas
+        names.append(loop.filename)
+        by_length.setdefault(len(loop), []).append((ix, loop.x, loop.y))
+    groups = []
+    for group in by_length.values():
+        index, field, moment = zip(*group)
+        groups.append((np.array(index), np.array(field, dtype=float), np.array(moment, dtype=float)))
+    return groups, names
+
+
+def _hysteresis_stack(field, moment, opts):
+    """Analyse a stack of hysteresis loops with the same number of points for :py:func:`hysteresis_batch`.
+
+    Returns:
+        (2D array):
+            One row of results for each loop in the order of :py:data:`_BATCH_COLUMNS`.
+    """
+    lx, hx = field.min(axis=1), field.max(axis=1)
+    mid = (lx + hx) / 2.0
+    saturated = np.abs(field - mid[:, None]) >= ((hx - lx) * (1 - opts["saturated_fraction"]) / 2)[:, None]
+
+    # The same sloping step model as _step, but it is linear in its parameters so all the loops are fitted at once
+    basis = np.stack((field, np.ones_like(field), np.sign(field - mid[:, None])), axis=-1)
+    popt, perr = _batch_lstsq(basis, moment, saturated)
+    Ms, Ms_err = popt[:, 2], perr[:, 2]
+    corrected = moment - (popt[:, :1] * (field - mid[:, None]) + popt[:, 1:2])
+
+    rising = _sweep_rising(field, opts["width"])
+    Hc, Hsat, Hsat_err, Mr = [], [], [], []
+    for i, branch in enumerate([rising, ~rising]):  # Same order as _up_down
+        x, y, points, pairs = _batch_branch(branch, field, corrected)
+        Hc.append(_batch_crossings(y, x, pairs, rising=i == 0, falling=i != 0)[0])
+        Mr.append(_batch_crossings(x, y, pairs, rising=True, falling=True)[0])
+
+        # Straight line through the central part of the branch to find where it meets the saturation moment
+        central = points & (np.abs(y) < np.abs(Ms[:, None]) * opts["h_sat_fraction"])
+        line, line_err = _batch_lstsq(np.stack((np.ones_like(x), x), axis=-1), y, central)
+        Ms_i = Ms if i == 0 else -Ms
+        with np.errstate(invalid="ignore", divide="ignore"):
+            hsat = (Ms_i - line[:, 0]) / line[:, 1]
+            Hsat.append(hsat)
+            Hsat_err.append(np.sqrt((hsat * line_err[:, 1] / line[:, 1]) ** 2 + (line[:, 1] * Ms_err) ** 2))
+    Hc, Hsat, Hsat_err = np.array(Hc), np.array(Hsat), np.array(Hsat_err)
+
+    if opts["correct_H"]:
+        offset = np.where(np.isfinite(Hc).all(axis=0), Hc.mean(axis=0), 0.0)
+    else:
+        offset = np.zeros(len(field))
+    if opts["correct_background"]:
+        moment = corrected
+    field = field - offset[:, None]
+    bh = -field * moment
+    peak = np.argmax(bh, axis=1)[:, None]
+
+    return np.column_stack(
+        (
+            Ms,
+            Ms_err,
+            popt[:, 1],
+            perr[:, 1],
+            popt[:, 0],
+            perr[:, 0],
+            offset,
+            Hc[1] - offset,
+            Hc[0] - offset,
+            np.abs(Hc).mean(axis=0),
+            Hsat[1] - offset,
+            Hsat[0] - offset,
+            Hsat_err[1],
+            Hsat_err[0],
+            np.abs(Hsat).mean(axis=0),
+            np.sqrt((Hsat_err**2).sum(axis=0)) / 2.0,
+            Mr[0],
+            Mr[1],
+            np.take_along_axis(bh, peak, axis=1)[:, 0],
+            np.take_along_axis(field, peak, axis=1)[:, 0],
+            np.trapz(moment, field, axis=1),
+        )
+    )
+
+
+_BATCH_COLUMNS = [
+    "Ms",
+    "Ms Error",
+    "Offset Moment",
+    "Offset Moment Error",
+    "Background susceptibility",
+    "Background Susceptibility Error",
+    "Exchange Bias offset",
+    "Hc falling",
+    "Hc rising",
+    "Hc_mean",
+    "Hsat falling",
+    "Hsat rising",
+    "Hsat falling Error",
+    "Hsat rising Error",
+    "Hsat_mean",
+    "Hsat_mean Error",
+    "Remenance rising",
+    "Remenance falling",
+    "BH_Max",
+    "BH_Max_H",
+    "Area",
+]
+
+
+def hysteresis_batch(loops, field=None, **kargs):
+    """Analyse a whole set of hysteresis loops at once in the same way as :py:func:`hysteresis_correct`.
+
+    Args:
+        loops (DataFolder, list of Data or 2D array):
+            The hysteresis loops to analyse. If *field* is given, then each row of a 2D array is the moment of one
+            loop, otherwise this is something that can be iterated over to give DataFile like objects with the x
+            and y columns set to the field and moment.
+
+    Keyword Arguments:
+        field (1D or 2D array):
+            The field values for a 2D array of moments - either one common field grid or one row for each loop.
+        correct_background (bool):
+            Correct for a diamagnetic or paramagnetic background and offset in moment (default True).
+        correct_H (bool):
+            Shift the field so that the co-ercive fields are equal and opposite (default True).
+        saturated_fraction (float):
+            The fraction of the field range where the moment can be assumed to be fully saturated (default 0.2).
+        h_sat_method (str):
+            Only "linear_intercept" - see :py:func:`hysteresis_correct` - is available for the batch analysis.
+        h_sat_fraction (float):
+            The central fraction of the saturation moment used to find the saturation field (default 0.5).
+        width (int):
+            Number of field steps to average over to smooth noise when splitting the loops into rising and falling
+            branches (default 5).
+        setas (string or iterable):
+            Column assignments to apply to each loop when *loops* is not an array.
+
+    Returns:
+        (:py:class:`Stoner.Data`):
+            A table of results with one row for each loop, in the order of *loops*. The column names follow the
+            metadata set by :py:func:`hysteresis_correct`, with the values for each branch of the loop in separate
+            columns. If the loops came from files, their filenames are in the *Filenames* metadata.
+
+    Notes:
+        All the loops with the same number of points are analysed together as 2D arrays. The saturated regions
+        are fitted with the same sloping step as :py:func:`hysteresis_correct` using a single linear least-squares
+        solution for every loop, the branches are split by the direction of the smoothed field steps and the
+        co-ercive fields, remenance and saturation fields are found by linear interpolation at the zero crossings.
+        The results agree closely but not exactly with those of :py:func:`hysteresis_correct`, which uses spline
+        interpolation to locate the crossings.
+    """
+    opts = {
+        "correct_background": kargs.pop("correct_background", True),
+        "correct_H": kargs.pop("correct_H", True),
+        "saturated_fraction": kargs.pop("saturated_fraction", 0.2),
+        "h_sat_fraction": kargs.pop("h_sat_fraction", 0.5),
+        "width": kargs.pop("width", 5),
+    }
+    if kargs.pop("h_sat_method", "linear_intercept") != "linear_intercept":
+        raise ValueError("Only the linear_intercept saturation field method is available for a batch of loops!")
+    groups, names = _batch_loops(loops, field, kargs.pop("setas", None))
+
+    results = np.full((sum(len(g[0]) for g in groups), len(_BATCH_COLUMNS)), np.nan)
+    for index, fields, moments in groups:
+        results[index] = _hysteresis_stack(fields, moments, opts)
+    results = make_Data(results)
+    results.column_headers = list(_BATCH_COLUMNS)
+    if names is not None:
+        results["Filenames"] = names
+    return results
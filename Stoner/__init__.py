@@ -2,6 +2,10 @@
 
 It has been developed by members of the `Condensed Matter Group<http://www.stoner.leeds.ac.uk/>` at the
 `University  of Leeds<http://www.leeds.ac.uk>`.
+
+The sub-packages and the main classes are only imported when they are first accessed (:pep:`562`) so that
+``import Stoner`` does not pay for loading matplotlib, scikit-image and all the file format modules until they
+are needed.
 """
 # pylint: disable=import-error
 __all__ = [
@@ -24,16 +28,56 @@ __all__ = [
 # These fake the old namespace if you do an import Stoner
 from os import path as _path_
 import pathlib
+from importlib import import_module
 
-from . import core, analysis, formats, plot, tools, Image
-from .core.data import Data
-from .Folders import DataFolder
-from .Image import ImageFile, ImageFolder, ImageStack
-
+from . import core
 from .tools import set_option, get_option, Options as _Options
 
 Options = _Options()
 
+# Submodules that are imported on first access
+_lazy_modules = {
+    "analysis",
+    "formats",
+    "plot",
+    "tools",
+    "Image",
+    "Analysis",
+    "Core",
+    "Folders",
+    "HDF5",
+    "Util",
+    "Zip",
+    "compat",
+    "folders",
+}
+
+# Classes that are imported from their submodules on first access
+_lazy_attrs = {
+    "Data": ".core.data",
+    "DataFolder": ".Folders",
+    "ImageFile": ".Image",
+    "ImageFolder": ".Image",
+    "ImageStack": ".Image",
+}
+
+
+def __getattr__(name):
+    """Import submodules and the main classes when they are first asked for."""
+    if name in _lazy_modules:
+        value = import_module(f".{name}", __name__)
+    elif name in _lazy_attrs:
+        value = getattr(import_module(_lazy_attrs[name], __name__), name)
+    else:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    """Include the lazily imported names in the module's dir()."""
+    return sorted(set(globals()) | _lazy_modules | set(_lazy_attrs))
+
 
 __version_info__ = ("0", "10", "0rc3")
 __version__ = ".".join(__version_info__)
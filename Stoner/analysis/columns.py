@@ -4,15 +4,257 @@
 
 __all__ = ["ColumnOpsMixin"]
 
+import copy
+from os import path
+from tempfile import TemporaryFile
+
 import numpy as np
 
 from Stoner.tools import isIterable, all_type
 from Stoner.compat import index_types
+from Stoner.core.array import DataArray, _BufferRows
+
+#: Number of rows in each block when column operations are done in chunks.
+CHUNK_ROWS = 1 << 18
+
+
+def _memmap_base(data):
+    """Return the whole :py:class:`numpy.memmap` that *data* is a view of, or None if it is not memory mapped."""
+    base, ret = np.ma.getdata(data), None
+    while base is not None:
+        if isinstance(base, np.memmap):
+            ret = base
+        base = getattr(base, "base", None)
+    return ret
+
+
+class _ColumnStore(np.memmap):
+
+    """A memory mapped table with spare columns on the right that new columns can be added into in place."""
 
 
 class ColumnOpsMixin:
 
-    """A mixin calss designed to work with :py:class:`Stoner.Core.DataFile` to provide additional stats methods."""
+    """A mixin calss designed to work with :py:class:`Stoner.Core.DataFile` to provide additional stats methods.
+
+    All of the methods take a *chunk* keyword that controls whether the data is processed in blocks of rows. If
+    *chunk* is None (the default) then blocks of :py:data:`CHUNK_ROWS` rows are used when the data is a view of a
+    :py:class:`numpy.memmap` - for example when the :py:class:`Stoner.Data` was made from a file opened with
+    :py:func:`numpy.load` with *mmap_mode* set - and the whole column is used otherwise. *chunk* can also be
+    True to use the default block size, False to use the whole column or the number of rows in each block.
+    Working in blocks limits the size of the temporary arrays to one block and, for memory mapped data, means that
+    only one block of the file needs to be read into memory at a time. Reductions are merged across the blocks and
+    new columns are added to a copy of the table, with spare columns, in a memory mapped temporary file next to the
+    original file.
+    """
+
+    def _chunks(self, chunk=None):
+        """Return a list of slices that divide the rows of the data into blocks.
+
+        Keyword Arguments:
+            chunk (int, bool or None):
+                Rows in each block - see the class documentation.
+
+        Returns:
+            (list of slice):
+                The blocks of rows - just one slice of all the rows if the data is not being chunked.
+        """
+        rows = len(self)
+        if chunk is None:
+            chunk = _memmap_base(self.data) is not None
+        if isinstance(chunk, bool):
+            chunk = CHUNK_ROWS if chunk else rows
+        chunk = max(int(chunk), 1)
+        return [slice(start, min(start + chunk, rows)) for start in range(0, rows, chunk)] or [slice(0, 0)]
+
+    def _make_room(self, index, width, chunks):
+        """Insert blank columns into memory mapped data without reading the whole table into memory.
+
+        Args:
+            index (int):
+                The column to insert the new columns before.
+            width (int):
+                The number of columns to insert.
+            chunks (list of slice):
+                The blocks of rows to copy the data in.
+
+        Notes:
+            The first time a column is added, the table is copied to a memory mapped temporary file in the same
+            directory as the file that the current data is mapped from, with spare columns on the right. Later
+            columns are added by moving the columns after *index* along within the spare columns, so the table is
+            only copied again when they run out. A mask is only built if some of the data is masked. Data that is
+            not memory mapped is left alone for :py:meth:`Stoner.Data.add_column` to deal with.
+        """
+        base = _memmap_base(self.data)
+        if base is None or index > self.shape[1]:
+            return
+        rows, cols = self.shape
+        raw = np.ma.getdata(self.data)
+        old_mask = np.ma.getmask(self.data)
+        masked = old_mask is not np.ma.nomask and old_mask.any()
+        if (
+            isinstance(base, _ColumnStore)
+            and base.shape[1] >= cols + width
+            and raw.strides == base.strides
+            and raw.__array_interface__["data"][0] == base.__array_interface__["data"][0]
+        ):  # Room in the table we already have
+            new = base
+            for sl in chunks:
+                new[sl, index + width : cols + width] = new[sl, index:cols]
+                new[sl, index : index + width] = 0
+        else:
+            directory = path.dirname(base.filename) if getattr(base, "filename", None) else None
+            shape = (rows, max(2 * (cols + width), cols + width + 8))
+            new = _ColumnStore(TemporaryFile(dir=directory), dtype=self.data.dtype, mode="w+", shape=shape)
+            for sl in chunks:
+                new[sl, :index] = raw[sl, :index]
+                new[sl, index + width : cols + width] = raw[sl, index:]
+        data = new[:, : cols + width].view(_BufferRows).view(DataArray)  # Skips filling in a mask for the table
+        data._baseclass = np.ndarray
+        data._ibase = getattr(self.data, "_ibase", np.arange(rows))
+        if masked:
+            data._mask = np.zeros(data.shape, dtype=bool)
+            data._mask[:, :index] = old_mask[:, :index]
+            data._mask[:, index + width :] = old_mask[:, index:]
+        data._setas = self.setas.clone
+        data._setas.shape = data.shape
+        if np.issubdtype(data.dtype, np.floating):
+            data.fill_value = np.nan
+        headers = copy.copy(self.column_headers)
+        old_setas = self.setas.clone
+        self.data = data
+        for ix in range(index):
+            self.column_headers[ix] = headers[ix]
+            self.setas[ix] = old_setas[ix]
+        for ix in range(index, cols):
+            self.column_headers[ix + width] = headers[ix]
+            self.setas[ix + width] = old_setas[ix]
+
+    def _store_column(self, data, header, index, replace, chunks):
+        """Add or replace a column with new data, building the table on disc if it is memory mapped."""
+        if not replace or index >= self.shape[1]:
+            self._make_room(index, 1, chunks)
+            replace = _memmap_base(self.data) is not None and index < self.shape[1]
+        self.add_column(data, header=header, index=index, replace=replace)
+
+    def _binary_op(self, col_a, col_b, func, error_type, header_fmt, **kargs):
+        """Evaluate func(a,b) on two columns in blocks of rows and store the result and its propagated error.
+
+        Args:
+            col_a, col_b (index, float or array):
+                The operands.
+            func (callable):
+                Function of the two blocks of operands that gives the result.
+            error_type (str):
+                Type of error propagation - passed to :py:meth:`_do_error_calc`.
+            header_fmt (str):
+                Format string for the default header, with the fields *a* and *b* for the operands' names.
+
+        Keyword Arguments:
+            err_scale (callable or None):
+                Function of the two blocks of operands that scales the propagated error.
+            header, replace, index, chunk:
+                As for :py:meth:`add`.
+
+        Returns:
+            (:py:class:`Stoner.Data`):
+                The newly modified Data object.
+        """
+        err_scale = kargs.get("err_scale", None)
+        header = kargs.get("header", None)
+        replace = kargs.get("replace", False)
+        index = kargs.get("index", None)
+        adata, bdata, err_calc, aname, bname = self._do_error_calc(col_a, col_b, error_type=error_type)
+        err_header = None
+        if isinstance(header, tuple) and len(header) == 2:
+            header, err_header = header
+        if header is None:
+            header = header_fmt.format(a=aname, b=bname)
+        if err_calc is not None and err_header is None:
+            err_header = "Error in " + header
+        index = self.shape[1] if index is None else self.find_col(index)
+        chunks = self._chunks(kargs.get("chunk", None))
+        result = np.ma.zeros(len(self))
+        err_data = np.zeros(len(self)) if err_calc is not None else None
+        for sl in chunks:
+            a_block, b_block = adata[sl], bdata[sl]
+            result[sl] = func(a_block, b_block)
+            if err_calc is not None:
+                err_data[sl] = err_calc(a_block, b_block, sl)
+                if err_scale is not None:
+                    err_data[sl] *= err_scale(a_block, b_block)
+        self._store_column(result, header, index, replace, chunks)
+        if err_calc is not None:
+            self._store_column(err_data, err_header, index + 1, False, chunks)
+        return self
+
+    def _extremum(self, column, bounds, chunk, find_max):
+        """Find the maximum or minimum of a column and its row index, merging the results from each block of rows."""
+        if column is None:
+            col = self.setas._get_cols("ycol")
+        else:
+            col = self.find_col(column)
+        if bounds is not None:
+            self._push_mask()
+            self._set_mask(bounds, True, col)
+        # The flattened index of a multi-column search cannot be offset block by block
+        chunks = self._chunks(chunk) if isinstance(col, int) else [slice(0, len(self))]
+        result = None
+        for sl in chunks:
+            block = self.data[sl, col]
+            value, ix = (block.max(), block.argmax()) if find_max else (block.min(), block.argmin())
+            if value is np.ma.masked and result is not None:
+                continue
+            if result is None or result[0] is np.ma.masked or (value > result[0] if find_max else value < result[0]):
+                result = value, ix + sl.start
+        if bounds is not None:
+            self._pop_mask()
+        return result
+
+    def _chunked_mean(self, ycol, sigma, chunks):
+        """Calculate the same mean as :py:meth:`mean` from sums accumulated over blocks of rows."""
+        total = norm = sum_sq = 0.0
+        count = 0
+        for sl in chunks:
+            ydata = self.data[sl, ycol]
+            if sigma is not None:
+                sig = sigma[sl]
+                w = 1 / (sig ** 2 + 1e-8)
+                norm += w.sum(axis=0)
+                sum_sq += (sig ** 2).sum(axis=0)
+                ydata = ydata * w
+            if np.ma.count(ydata):
+                total += ydata.sum(axis=0)
+                count += np.ma.count(ydata)
+        if sigma is None:
+            return total / count if count else np.ma.masked
+        return total / count / norm, np.sqrt(sum_sq) / len(sigma)
+
+    def _chunked_std(self, ycol, sigma, chunks):
+        """Calculate the same weighted standard deviation as :py:meth:`std` by merging the moments of each block."""
+        scale = 1.0
+        if sigma is not None:
+            scale = max(np.nanmax(np.abs(np.ma.getdata(sigma[sl]))) for sl in chunks)
+        weight = weight_sq = mean = m2 = 0.0
+        for sl in chunks:
+            ydata = np.atleast_1d(np.ma.getdata(self.data[sl, ycol])).astype(float)
+            if sigma is None:
+                w = np.ones_like(ydata)
+            else:
+                sig = np.atleast_1d(np.abs(np.ma.getdata(sigma[sl]))) / scale
+                w = 1 / np.where(sig < 1e-8, 1e-8, sig) ** 2
+                w[np.isnan(w)] = 0.0
+            block_weight = w.sum()
+            if block_weight == 0:
+                continue
+            block_mean = (w * ydata).sum() / block_weight
+            delta = block_mean - mean
+            total = weight + block_weight
+            m2 += (w * (ydata - block_mean) ** 2).sum() + delta ** 2 * weight * block_weight / total
+            mean += delta * block_weight / total
+            weight = total
+            weight_sq += (w * w).sum()
+        return np.sqrt(m2 / (weight - weight_sq / weight))
 
     def _do_error_calc(self, col_a, col_b, error_type="relative"):
         """Do an error calculation."""
@@ -30,23 +272,23 @@ class ColumnOpsMixin:
             e2data = self.__get_math_val(e2)[0]
             if error_type == "relative":
 
-                def error_calc(adata, bdata):  # pylint: disable=function-redefined
+                def error_calc(adata, bdata, sl=slice(None)):  # pylint: disable=function-redefined
                     """Relative error summation."""
-                    return np.sqrt((e1data / adata) ** 2 + (e2data / bdata) ** 2)
+                    return np.sqrt((e1data[sl] / adata) ** 2 + (e2data[sl] / bdata) ** 2)
 
             elif error_type == "absolute":
 
-                def error_calc(adata, bdata):  # pylint: disable=function-redefined, unused-argument
+                def error_calc(adata, bdata, sl=slice(None)):  # pylint: disable=function-redefined, unused-argument
                     """Sum absolute errors."""
-                    return np.sqrt(e1data ** 2 + e2data ** 2)
+                    return np.sqrt(e1data[sl] ** 2 + e2data[sl] ** 2)
 
             elif error_type == "diffsum":
 
-                def error_calc(adata, bdata):  # pylint: disable=function-redefined
+                def error_calc(adata, bdata, sl=slice(None)):  # pylint: disable=function-redefined
                     """Calculate error for difference over sum."""
                     return np.sqrt(
-                        (1.0 / (adata + bdata) - (adata - bdata) / (adata + bdata) ** 2) ** 2 * e1data ** 2
-                        + (-1.0 / (adata + bdata) - (adata - bdata) / (adata + bdata) ** 2) ** 2 * e2data ** 2
+                        (1.0 / (adata + bdata) - (adata - bdata) / (adata + bdata) ** 2) ** 2 * e1data[sl] ** 2
+                        + (-1.0 / (adata + bdata) - (adata - bdata) / (adata + bdata) ** 2) ** 2 * e2data[sl] ** 2
                     )
 
             else:
@@ -79,13 +321,13 @@ class ColumnOpsMixin:
             data = col
             name = "data"
         elif isinstance(col, float):
-            data = col * np.ones(len(self))
+            data = np.broadcast_to(np.float64(col), (len(self),))  # Behaves like a column without allocating one
             name = str(col)
         else:
             raise RuntimeError(f"Bad column index: {col}")
         return data, name
 
-    def add(self, col_a, col_b, replace=False, header=None, index=None):
+    def add(self, col_a, col_b, replace=False, header=None, index=None, chunk=None):
         """Add one column, number or array (col_b) to another column (col_a).
 
         Args:
@@ -101,6 +343,8 @@ class ColumnOpsMixin:
                 Replace the col_a column with the new data
             index (column index or None):
                 Column to insert new data at.
+            chunk (int, bool or None):
+                Rows in each block of the calculation - see :py:class:`ColumnOpsMixin`.
 
         Returns:
             (:py:class:`Stoner.Data`):
@@ -110,23 +354,11 @@ class ColumnOpsMixin:
         the second element an uncertainty in the value. The uncertainties will then be propagated and an
         additional column with the uncertainites will be added to the data.
         """
-        adata, bdata, err_calc, aname, bname = self._do_error_calc(col_a, col_b, error_type="absolute")
-        err_header = None
-        if isinstance(header, tuple) and len(header) == 2:
-            header, err_header = header
-        if header is None:
-            header = f"{aname}+{bname}"
-        if err_calc is not None and err_header is None:
-            err_header = "Error in " + header
-        index = self.shape[1] if index is None else self.find_col(index)
-        if err_calc is not None:
-            err_data = err_calc(adata, bdata)
-        self.add_column((adata + bdata), header=header, index=index, replace=replace)
-        if err_calc is not None:
-            self.add_column(err_data, header=err_header, index=index + 1, replace=False)
-        return self
+        return self._binary_op(
+            col_a, col_b, np.add, "absolute", "{a}+{b}", header=header, replace=replace, index=index, chunk=chunk
+        )
 
-    def diffsum(self, col_a, col_b, replace=False, header=None, index=None):
+    def diffsum(self, col_a, col_b, replace=False, header=None, index=None, chunk=None):
         r"""Calculate :math:`\frac{a-b}{a+b}` for the two columns *a* and *b*.
 
         Args:
@@ -142,6 +374,8 @@ class ColumnOpsMixin:
                 Replace the col_a column with the new data
             index (column index or None):
                 Column to insert new data at.
+            chunk (int, bool or None):
+                Rows in each block of the calculation - see :py:class:`ColumnOpsMixin`.
 
         Returns:
             (:py:class:`Stoner.Data`):
@@ -151,23 +385,19 @@ class ColumnOpsMixin:
         the second element an uncertainty in the value. The uncertainties will then be propagated and an
         additional column with the uncertainites will be added to the data.
         """
-        adata, bdata, err_calc, aname, bname = self._do_error_calc(col_a, col_b, error_type="diffsum")
-        err_header = None
-        if isinstance(header, tuple) and len(header) == 2:
-            header, err_header = header
-        if header is None:
-            header = f"({aname}-{bname})/({aname}+{bname})"
-        if err_calc is not None and err_header is None:
-            err_header = "Error in " + header
-        if err_calc is not None:
-            err_data = err_calc(adata, bdata)
-        index = self.shape[1] if index is None else self.find_col(index)
-        self.add_column((adata - bdata) / (adata + bdata), header=header, index=index, replace=replace)
-        if err_calc is not None:
-            self.add_column(err_data, header=err_header, index=index + 1, replace=False)
-        return self
-
-    def divide(self, col_a, col_b, replace=False, header=None, index=None):
+        return self._binary_op(
+            col_a,
+            col_b,
+            lambda a, b: (a - b) / (a + b),
+            "diffsum",
+            "({a}-{b})/({a}+{b})",
+            header=header,
+            replace=replace,
+            index=index,
+            chunk=chunk,
+        )
+
+    def divide(self, col_a, col_b, replace=False, header=None, index=None, chunk=None):
         """Divide one column (col_a) by  another column, number or array (col_b).
 
         Args:
@@ -183,6 +413,8 @@ class ColumnOpsMixin:
                 Replace the col_a column with the new data
             index (column index or None):
                 Column to insert new data at.
+            chunk (int, bool or None):
+                Rows in each block of the calculation - see :py:class:`ColumnOpsMixin`.
 
         Returns:
             (:py:class:`Stoner.Data`):
@@ -192,22 +424,20 @@ class ColumnOpsMixin:
         the second element an uncertainty in the value. The uncertainties will then be propagated and an
         additional column with the uncertainites will be added to the data.
         """
-        adata, bdata, err_calc, aname, bname = self._do_error_calc(col_a, col_b, error_type="relative")
-        err_header = None
-        if isinstance(header, tuple) and len(header) == 2:
-            header, err_header = header
-        if header is None:
-            header = f"{aname}/{bname}"
-        if err_calc is not None and err_header is None:
-            err_header = "Error in " + header
-        index = self.shape[1] if index is None else self.find_col(index)
-        self.add_column((adata / bdata), header=header, index=index, replace=replace)
-        if err_calc is not None:
-            err_data = err_calc(adata, bdata) * np.abs(adata / bdata)
-            self.add_column(err_data, header=err_header, index=index + 1, replace=False)
-        return self
-
-    def max(self, column=None, bounds=None):
+        return self._binary_op(
+            col_a,
+            col_b,
+            np.divide,
+            "relative",
+            "{a}/{b}",
+            header=header,
+            replace=replace,
+            index=index,
+            chunk=chunk,
+            err_scale=lambda a, b: np.abs(a / b),
+        )
+
+    def max(self, column=None, bounds=None, chunk=None):
         """Find maximum value and index in col_a column of data.
 
         Args:
@@ -218,6 +448,8 @@ class ColumnOpsMixin:
             bounds (callable):
                 col_a callable function that takes col_a single argument list of
                 numbers representing one row, and returns True for all rows to search in.
+            chunk (int, bool or None):
+                Rows in each block of the calculation - see :py:class:`ColumnOpsMixin`.
 
         Returns:
             (float,int):
@@ -227,19 +459,9 @@ class ColumnOpsMixin:
             If column is not defined (or is None) the :py:attr:`DataFile.setas` column
             assignments are used.
         """
-        if column is None:
-            col = self.setas._get_cols("ycol")
-        else:
-            col = self.find_col(column)
-        if bounds is not None:
-            self._push_mask()
-            self._set_mask(bounds, True, col)
-        result = self.data[:, col].max(), self.data[:, col].argmax()
-        if bounds is not None:
-            self._pop_mask()
-        return result
+        return self._extremum(column, bounds, chunk, True)
 
-    def mean(self, column=None, sigma=None, bounds=None):
+    def mean(self, column=None, sigma=None, bounds=None, chunk=None):
         """Find mean value of col_a data column.
 
         Args:
@@ -252,6 +474,8 @@ class ColumnOpsMixin:
             bounds (callable):
                 col_a callable function that takes col_a single argument list of
                 numbers representing one row, and returns True for all rows to search in.
+            chunk (int, bool or None):
+                Rows in each block of the calculation - see :py:class:`ColumnOpsMixin`.
 
         Returns:
             (float):
@@ -276,7 +500,10 @@ class ColumnOpsMixin:
         elif _.has_yerr:
             sigma = self.data[:, _.yerr]
 
-        if not _.has_yerr:
+        chunks = self._chunks(chunk)
+        if len(chunks) > 1:  # Merge sums over the blocks
+            result = self._chunked_mean(_.ycol, sigma if _.has_yerr else None, chunks)
+        elif not _.has_yerr:
             result = self.data[:, _.ycol].mean()
         else:
             ydata = self.data[:, _.ycol]
@@ -288,7 +515,7 @@ class ColumnOpsMixin:
             self._pop_mask()
         return result
 
-    def min(self, column=None, bounds=None):
+    def min(self, column=None, bounds=None, chunk=None):
         """Find minimum value and index in col_a column of data.
 
         Args:
@@ -299,6 +526,8 @@ class ColumnOpsMixin:
             bounds (callable):
                 col_a callable function that takes col_a single argument list of
                 numbers representing one row, and returns True for all rows to search in.
+            chunk (int, bool or None):
+                Rows in each block of the calculation - see :py:class:`ColumnOpsMixin`.
 
         Returns:
             (float,int):
@@ -308,19 +537,9 @@ class ColumnOpsMixin:
             If column is not defined (or is None) the :py:attr:`DataFile.setas` column
             assignments are used.
         """
-        if column is None:
-            col = self.setas._get_cols("ycol")
-        else:
-            col = self.find_col(column)
-        if bounds is not None:
-            self._push_mask()
-            self._set_mask(bounds, True, col)
-        result = self.data[:, col].min(), self.data[:, col].argmin()
-        if bounds is not None:
-            self._pop_mask()
-        return result
+        return self._extremum(column, bounds, chunk, False)
 
-    def multiply(self, col_a, col_b, replace=False, header=None, index=None):
+    def multiply(self, col_a, col_b, replace=False, header=None, index=None, chunk=None):
         """Multiply one column (col_a) by  another column, number or array (col_b).
 
         Args:
@@ -336,6 +555,8 @@ class ColumnOpsMixin:
                 Replace the col_a column with the new data
             index (column index or None):
                 Column to insert new data at.
+            chunk (int, bool or None):
+                Rows in each block of the calculation - see :py:class:`ColumnOpsMixin`.
 
         Returns:
             (:py:class:`Stoner.Data`):
@@ -345,23 +566,20 @@ class ColumnOpsMixin:
         the second element an uncertainty in the value. The uncertainties will then be propagated and an
         additional column with the uncertainites will be added to the data.
         """
-        adata, bdata, err_calc, aname, bname = self._do_error_calc(col_a, col_b, error_type="relative")
-        err_header = None
-        if isinstance(header, tuple) and len(header) == 2:
-            header, err_header = header
-        if header is None:
-            header = f"{aname}*{bname}"
-        if err_calc is not None and err_header is None:
-            err_header = "Error in " + header
-        index = self.shape[1] if index is None else self.find_col(index)
-        if err_calc is not None:
-            err_data = err_calc(adata, bdata) * np.abs(adata * bdata)
-        self.add_column((adata * bdata), header=header, index=index, replace=replace)
-        if err_calc is not None:
-            self.add_column(err_data, header=err_header, index=index + 1, replace=False)
-        return self
-
-    def span(self, column=None, bounds=None):
+        return self._binary_op(
+            col_a,
+            col_b,
+            np.multiply,
+            "relative",
+            "{a}*{b}",
+            header=header,
+            replace=replace,
+            index=index,
+            chunk=chunk,
+            err_scale=lambda a, b: np.abs(a * b),
+        )
+
+    def span(self, column=None, bounds=None, chunk=None):
         """Return a tuple of the maximum and minumum values within the given column and bounds.
 
         Args:
@@ -372,6 +590,8 @@ class ColumnOpsMixin:
             bounds (callable):
                 col_a callable function that takes col_a single argument list of
                 numbers representing one row, and returns True for all rows to search in.
+            chunk (int, bool or None):
+                Rows in each block of the calculation - see :py:class:`ColumnOpsMixin`.
 
         Returns:
             (float,float):
@@ -384,9 +604,9 @@ class ColumnOpsMixin:
             assignments are used.
 
         """
-        return (self.min(column, bounds)[0], self.max(column, bounds)[0])
+        return (self.min(column, bounds, chunk)[0], self.max(column, bounds, chunk)[0])
 
-    def std(self, column=None, sigma=None, bounds=None):
+    def std(self, column=None, sigma=None, bounds=None, chunk=None):
         """Find standard deviation value of col_a data column.
 
         Args:
@@ -399,6 +619,8 @@ class ColumnOpsMixin:
             bounds (callable):
                 col_a callable function that takes col_a single argument list of
                 numbers representing one row, and returns True for all rows to search in.
+            chunk (int, bool or None):
+                Rows in each block of the calculation - see :py:class:`ColumnOpsMixin`.
 
         Returns:
             (float):
@@ -422,8 +644,17 @@ class ColumnOpsMixin:
         elif _.yerr:
             sigma = self.data[:, _.yerr]
         else:
-            sigma = np.ones(len(self))
+            sigma = None
+
+        chunks = self._chunks(chunk)
+        if len(chunks) > 1:
+            result = self._chunked_std(_.ycol, sigma, chunks)
+            if bounds is not None:
+                self._pop_mask()
+            return result
 
+        if sigma is None:
+            sigma = np.ones(len(self))
         ydata = self.data[:, _.ycol]
 
         sigma = np.abs(sigma) / np.nanmax(np.abs(sigma))
@@ -437,7 +668,7 @@ class ColumnOpsMixin:
             self._pop_mask()
         return result
 
-    def subtract(self, col_a, col_b, replace=False, header=None, index=None):
+    def subtract(self, col_a, col_b, replace=False, header=None, index=None, chunk=None):
         """Subtract one column, number or array (col_b) from another column (col_a).
 
         Args:
@@ -453,6 +684,8 @@ class ColumnOpsMixin:
                 Replace the col_a column with the new data
             index (column index or None):
                 Column to insert new data at.
+            chunk (int, bool or None):
+                Rows in each block of the calculation - see :py:class:`ColumnOpsMixin`.
 
         Returns:
             (:py:class:`Stoner.Data`):
@@ -462,19 +695,6 @@ class ColumnOpsMixin:
         the second element an uncertainty in the value. The uncertainties will then be propagated and an
         additional column with the uncertainites will be added to the data.
         """
-        adata, bdata, err_calc, aname, bname = self._do_error_calc(col_a, col_b, error_type="absolute")
-        err_header = None
-        if isinstance(header, tuple) and len(header) == 2:
-            header, err_header = header
-        if header is None:
-            header = f"{aname}-{bname}"
-        if err_calc is not None and err_header is None:
-            err_header = "Error in " + header
-        index = self.shape[1] if index is None else self.find_col(index)
-        if err_calc is not None:
-            err_data = err_calc(adata, bdata)
-        self.add_column((adata - bdata), header=header, index=index, replace=replace)
-        if err_calc is not None:
-            col_a = self.find_col(col_a)
-            self.add_column(err_data, header=err_header, index=index + 1, replace=False)
-        return self
+        return self._binary_op(
+            col_a, col_b, np.subtract, "absolute", "{a}-{b}", header=header, replace=replace, index=index, chunk=chunk
+        )
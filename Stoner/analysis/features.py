@@ -6,11 +6,12 @@ __all__ = ["FeatureOpsMixin"]
 
 import numpy as np
 from scipy.signal import find_peaks
-from scipy.interpolate import interp1d
+from scipy.interpolate import interp1d, make_interp_spline
 
+from Stoner.compat import string_types
 from Stoner.tools import isIterable, isTuple
 from Stoner.core.exceptions import assertion
-from .utils import threshold
+from .utils import crossings, _spline_at
 
 
 class FeatureOpsMixin:
@@ -21,8 +22,9 @@ class FeatureOpsMixin:
         """Locates peaks and/or troughs in a column of data by using SG-differentiation.
 
         Args:
-            ycol (index):
-                the column name or index of the data in which to search for peaks
+            ycol (index or list of indices):
+                the column name or index of the data in which to search for peaks. If a list of several columns is
+                given, then the peaks in all of them are found together.
             width (int or float):
                 the expected minium halalf-width of a peak in terms of the number of data points (int) or distance
                 in x (float). This is used in the differnetiation code to find local maxima. Bigger equals less
@@ -57,7 +59,14 @@ class FeatureOpsMixin:
                 If *modify* is false (default), then the return value depends on *ycol* and *xcol*. If *ycol* is
                 not None and *xcol* is None, then returns conplete rows of data corresponding to the found
                 peaks/troughs. If *xcol* is not None, or *ycol* is None and *xcol* is None, then returns a 1D array
-                of the x positions of the peaks/troughs.
+                of the x positions of the peaks/troughs. If *ycol* is a list of several columns then a list of these
+                results for each column is returned.
+
+        Notes:
+            The differentiation, the search for zero crossings of the first derivative and the check of the
+            curvature at each candidate are carried out for all the columns at once, so finding the peaks in many
+            columns together is much faster than working through them one at a time. *modify* cannot be used with
+            more than one column.
 
         See Also:
             User guide section :ref:`peak_finding`
@@ -73,20 +82,28 @@ class FeatureOpsMixin:
         sort = kargs.pop("sort", False)
         modify = kargs.pop("modify", False)
         full_data = kargs.pop("full_data", True)
-        _ = self._col_args(scalar=False, xcol=kargs.pop("xcol", None), ycol=kargs.pop("ycol", None))
+        ycol = kargs.pop("ycol", None)
+        several = isIterable(ycol) and not isinstance(ycol, string_types) and len(ycol) > 1
+        _ = self._col_args(scalar=False, xcol=kargs.pop("xcol", None), ycol=ycol)
         xcol, ycol = _.xcol, _.ycol
-        if isIterable(ycol):
-            ycol = ycol[0]
+        if isIterable(xcol):
+            xcol = xcol[0]
+        ycol = list(ycol) if isIterable(ycol) else [ycol]
+        if not several:
+            ycol = ycol[:1]
+        assertion(not (several and modify), "peaks can only modify the data when looking in a single column")
         if isinstance(width, float):  # Convert a floating point width unto an integer.
             xmin, xmax = self.span(xcol)
             width = int(len(self) * width / (xmax - xmin))
         width = max(width, poly + 1)
         setas = self.setas.clone  # pylint: disable=E0203
         self.setas = ""
-        d1 = self.SG_Filter(ycol, xcol=xcol, points=width, poly=poly, order=1).ravel()
-        d2 = self.SG_Filter(
-            ycol, xcol=xcol, points=2 * width, poly=poly, order=2
-        ).ravel()  # 2nd differential requires more smoothing
+        # Each column of d1 and d2 is the differential of one of the ycol columns
+        d1 = np.atleast_2d(self.SG_Filter(ycol, xcol=xcol, points=width, poly=poly, order=1)).T
+        d2 = np.atleast_2d(
+            self.SG_Filter(ycol, xcol=xcol, points=2 * width, poly=poly, order=2)
+        ).T  # 2nd differential requires more smoothing
+        self.setas = setas
 
         # We're going to ignore the start and end of the arrays
         index_offset = int(width / 2)
@@ -94,18 +111,20 @@ class FeatureOpsMixin:
         d2 = d2[index_offset:-index_offset]
 
         # Pad the ends of d2 with the mean value
-        pad = np.mean(d2[index_offset:-index_offset])
+        pad = np.mean(d2[index_offset:-index_offset], axis=0)
         d2[:index_offset] = pad
         d2[-index_offset:] = pad
 
         # Set the significance from the 2nd ifferential if not already set
         significance = kargs.pop(
-            "significance", np.max(np.abs(d2)) / (2 * width)
+            "significance", np.max(np.abs(d2), axis=0) / (2 * width)
         )  # Base an apriori significance on max d2y/dx2 / 20
         if isinstance(significance, int):  # integer significance is inverse to floating
-            significance = np.max(np.abs(d2)) / significance  # Base an apriori significance on max d2y/dx2 / 20
+            # Base an apriori significance on max d2y/dx2 / 20
+            significance = np.max(np.abs(d2), axis=0) / significance
+        significance = np.broadcast_to(significance, d2.shape[1:])
 
-        d2_interp = interp1d(np.arange(len(d2)), d2, kind="cubic")
+        d2_interp = make_interp_spline(np.arange(len(d2)), d2, k=3)
         # Ensure we have some X-data
         if xcol is None:
             xdata = np.arange(len(self))
@@ -113,27 +132,34 @@ class FeatureOpsMixin:
             xdata = self.column(xcol)
         xdata = interp1d(np.arange(len(self)), xdata, kind="cubic")
 
-        possible_peaks = np.array(threshold(0, d1, rising=troughs, falling=peaks))
-        curvature = np.abs(d2_interp(possible_peaks))
+        found, possible_peaks = crossings(0, d1, rising=troughs, falling=peaks)
+        curvature = np.abs(_spline_at(d2_interp, possible_peaks, found))
 
         # Filter just the significant peaks
-        possible_peaks = np.array([p for ix, p in enumerate(possible_peaks) if abs(curvature[ix]) > significance])
+        significant = curvature > significance[found]
+        found, possible_peaks, curvature = found[significant], possible_peaks[significant], curvature[significant]
         # Sort in order of significance
         if sort:
-            possible_peaks = np.take(possible_peaks, np.argsort(np.abs(d2_interp(possible_peaks))))
+            order = np.lexsort((curvature, found))
+            found, possible_peaks = found[order], possible_peaks[order]
 
+        # Remembering to add back on the offset that we took off due to differentials not working at start and end
         xdat = xdata(possible_peaks + index_offset)
+        ret = [self._peaks_result(xdat[found == ix], xcol, modify, full_data) for ix in range(len(ycol))]
+        return ret if several else ret[0]
 
+    def _peaks_result(self, xdat, xcol, modify, full_data):
+        """Build the return value of :py:meth:`FeatureOpsMixin.peaks` from the peak positions."""
+        if not (modify or full_data):
+            return xdat
+        setas = self.setas.clone  # pylint: disable=E0203
+        self.setas = ""
         if modify:
             self.data = self.interpolate(xdat, xcol=xcol, kind="cubic")
             ret = self
-        elif full_data:
-            ret = self.interpolate(xdat, kind="cubic", xcol=False)
         else:
-            ret = xdat
+            ret = self.interpolate(xdat, kind="cubic", xcol=False)
         self.setas = setas
-        # Return - but remembering to add back on the offset that we took off due to differentials not working at
-        # start and end
         return ret
 
     def find_peaks(self, **kargs):
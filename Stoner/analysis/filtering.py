@@ -4,23 +4,67 @@
 
 __all__ = ["FilteringOpsMixin"]
 
+from collections import OrderedDict
 from copy import deepcopy as copy
 from warnings import warn
 
 import numpy as np
 from numpy import ma
 from scipy.interpolate import interp1d, UnivariateSpline
-from scipy.signal import get_window, convolve, savgol_filter
+from scipy.signal import get_window, convolve
 
 from Stoner.tools import isIterable, isNone
 from Stoner.compat import int_types, string_types, get_func_params
 
-from .utils import outlier as _outlier, _twoD_fit, GetAffineTransform
+from .utils import outlier as _outlier, _twoD_fit, GetAffineTransform, sg_filter, _fingerprint
+
+INTERPOLANT_CACHE_SIZE = 8  # Number of interpolants kept for each DataFile
 
 
 class FilteringOpsMixin:
 
-    """Provide additional filtering sndsmoothing methods to :py:class:`Stoner.Data`."""
+    """Provide additional filtering sndsmoothing methods to :py:class:`Stoner.Data`.
+
+    The interpolation functions built by :py:meth:`interpolate`, :py:meth:`spline` and the local fits used by
+    :py:meth:`extrapolate` are cached on each object. Each one is stored with the version of the data it was built
+    from (see :py:meth:`_data_stamp`) and is rebuilt if the data has been changed or replaced since. The most
+    recently used *INTERPOLANT_CACHE_SIZE* entries are kept.
+    """
+
+    def _data_stamp(self):
+        """Return a token that identifies the current contents of the data without looking at all of it.
+
+        The token is made from the version counter of the :py:class:`Stoner.core.array.DataArray`, which changes
+        whenever values are written to it, and the position and shape of the data in memory, which change when it
+        is replaced. Values written straight into the underlying numpy buffer are not noticed.
+        """
+        data = self.data
+        return data._version, data.shape, data.strides, data.__array_interface__["data"][0]
+
+    def _interpolant(self, key, stamp, factory):
+        """Return a cached interpolant, building it if it is missing or the data has changed.
+
+        Args:
+            key (hashable):
+                Identifies the interpolant - e.g. the columns and kind of interpolation.
+            stamp (hashable):
+                Identifies the data the interpolant is built from - see :py:meth:`_data_stamp`.
+            factory (callable):
+                Called with no arguments to build the interpolant.
+
+        Returns:
+            The interpolant.
+        """
+        cache = self.__dict__.setdefault("_interpolants", OrderedDict())
+        if key in cache and cache[key][0] == stamp:
+            cache.move_to_end(key)
+            return cache[key][1]
+        value = factory()
+        cache[key] = (stamp, value)
+        cache.move_to_end(key)
+        while len(cache) > INTERPOLANT_CACHE_SIZE:
+            cache.popitem(last=False)
+        return value
 
     def SG_Filter(
         self, col=None, xcol=None, points=15, poly=1, order=0, pad=True, result=None, replace=False, header=None
@@ -56,7 +100,9 @@ class FilteringOpsMixin:
         Notes:
             If col is not specified or is None then the :py:attr:`DataFile.setas` column assignments are used
             to set an x and y column. If col is a tuple, then it is assumed to secify and x-column and y-column
-            for differentiating data. This is now a pass through to :py:func:`scipy.signal.savgol_filter`
+            for differentiating data. This gives the same results as :py:func:`scipy.signal.savgol_filter`, but
+            the filter coefficients are cached between calls so that filtering many data sets of the same length
+            is faster. All the columns in *col* are filtered together.
 
             Padding can help stop wildly wrong artefacts in the data at the start and enf of the data, particularly
             when the differntial order is >1.
@@ -83,7 +129,7 @@ class FilteringOpsMixin:
             data = self.column(list(col)).T
             data = np.row_stack((data, np.arange(data.shape[1])))
 
-        ddata = savgol_filter(data, window_length=points, polyorder=poly, deriv=order, mode="interp")
+        ddata = sg_filter(data, points, poly, deriv=order)
         if isinstance(pad, bool) and pad:
             offset = int(np.ceil(points * order ** 2 / 8))
             padv = np.mean(ddata[:, offset:-offset], axis=1)
@@ -290,7 +336,9 @@ class FilteringOpsMixin:
         if isinstance(new_x, ma.MaskedArray):
             new_x = new_x.compressed
         results = np.zeros((len(new_x), 2 * len(_.ycol)))
-        work = self.clone
+        work = None
+        stamp = self._data_stamp()
+        cols = (_.xcol, tuple(_.ycol), tuple(_.yerr) if isIterable(_.yerr) else _.yerr, kind)
         for ix, x in enumerate(new_x):
             r = self.closest(x, xcol=_.xcol)
             if isinstance(overlap, int):
@@ -317,11 +365,19 @@ class FilteringOpsMixin:
                     hl = r[_.xcol] + overlap / 2
                 bounds = {f"{self.column_headers[_.xcol]}__between": (ll, hl)}
                 mid_x = (ll + hl) / 2.0
-            pointdata = work.select(**bounds)
-            pointdata.data[:, _.xcol] = pointdata.column(_.xcol) - mid_x
-            ret = pointdata.curve_fit(kindf, _.xcol, _.ycol, sigma=_.yerr, absolute_sigma=True)
-            if isinstance(ret, tuple):
-                ret = [ret]
+
+            def _fit(bounds=bounds, mid_x=mid_x):
+                """Fit the local section of data."""
+                nonlocal work
+                if work is None:
+                    work = self.clone
+                pointdata = work.select(**bounds)
+                pointdata.data[:, _.xcol] = pointdata.column(_.xcol) - mid_x
+                ret = pointdata.curve_fit(kindf, _.xcol, _.ycol, sigma=_.yerr, absolute_sigma=True)
+                return [ret] if isinstance(ret, tuple) else ret
+
+            # Points beyond the ends of the data, or close together, share the same local fit
+            ret = self._interpolant(("extrapolate", cols, tuple(bounds.items())), stamp, _fit)
             for iy, rt in enumerate(ret):
                 popt, pcov = rt
                 perr = np.sqrt(np.diag(pcov))
@@ -335,11 +391,11 @@ class FilteringOpsMixin:
         """Interpolate a dataset to get a new set of values for a given set of x data.
 
         Args:
-            ewX (1D array or None):
+            ewX (1D array, list of 1D arrays or None):
                 Row indices or X column values to interpolate with. If None, then the
                 :py:meth:`AnalysisMixin.interpolate` returns an interpolation function. Unlike the raw interpolation
                 function from scipy, this interpolation function will work with MaskedArrays by compressing them
-                first.
+                first. If a list of arrays, then they are all evaluated together and a list of results returned.
 
         Keyword Arguments:
             kind (string):
@@ -364,6 +420,9 @@ class FilteringOpsMixin:
             If the positional argument, newX is None, then the return value is an interpolation function. This
             interpolation function takes one argument - if *xcol* was None, this argument is interpreted as
             array indices, but if *xcol* was specified, then this argument is interpreted as an array of xvalues.
+
+            The interpolation functions are cached (see :py:class:`FilteringOpsMixin`), so repeatedly interpolating
+            the same data onto different sets of points only builds them once.
         """
         DataArray = type(self.data)  # pylint: disable=E0203
         lines = np.shape(self.data)[0]  # pylint: disable=E0203
@@ -375,11 +434,23 @@ class FilteringOpsMixin:
 
         if isinstance(newX, ma.MaskedArray):
             newX = newX.compressed()
+        elif isinstance(newX, (list, tuple)) and newX and all(isIterable(x) for x in newX):  # Batch of new x
+            lengths = np.cumsum([np.size(x) for x in newX])[:-1]
+            ret = self.interpolate(np.concatenate([np.ravel(x) for x in newX]), kind=kind, xcol=xcol)
+            return np.split(ret, lengths)
+
+        def _xfunc():
+            """Get the function that maps x values to partial row indices."""
+            xdata = self.column(xcol)
+            return self._interpolant(
+                ("xindex", xcol, kind), self._data_stamp(), lambda: interp1d(xdata, index, kind, 0)
+            )
 
         if xcol is not None and newX is not None:  # We need to convert newX to row indices
-            xfunc = interp1d(self.column(xcol), index, kind, 0)  # xfunc(x) returns partial index
-            newX = xfunc(newX)
-        inter = interp1d(index, self.data, kind, 0)  # pylint: disable=E0203
+            newX = _xfunc()(newX)
+        inter = self._interpolant(  # The index is already sorted, so interp1d doesn't need to sort it
+            ("rows", kind), self._data_stamp(), lambda: interp1d(index, self.data, kind, 0, assume_sorted=True)
+        )
 
         if newX is None:  # Ok, we're going to return an interpolation function
 
@@ -390,8 +461,7 @@ class FilteringOpsMixin:
                 else:
                     newX = np.array(newX)
                 if xcol is not None and newX is not None:  # We need to convert newX to row indices
-                    xfunc = interp1d(self.column(xcol), index, kind, 0)  # xfunc(x) returns partial index
-                    newX = xfunc(newX)
+                    newX = _xfunc()(newX)
                 return inter(newX)
 
             return wrapper
@@ -822,9 +892,11 @@ class FilteringOpsMixin:
                 data or an :[y:class:`scipy.interpolate.UniverateSpline` object.
 
         This is really jsut a pass through to the scipy.interpolate.UnivariateSpline function. Also used in the
-        extrapolate function.
+        extrapolate function. The spline is cached (see :py:class:`FilteringOpsMixin`), so calling this again with
+        the same data and settings does not fit it again.
         """
         _ = self._col_args(xcol=xcol, ycol=ycol)
+        stamp = self._data_stamp(), None if sigma is None else _fingerprint(sigma)  # sigma is not part of the data
         if sigma is None and (isNone(_.yerr) or _.yerr):
             if not isNone(_.yerr):
                 sigma = 1.0 / (self // _.yerr)
@@ -839,7 +911,11 @@ class FilteringOpsMixin:
         ext = kargs.pop("ext", "extrapolate")
         x = self // _.xcol
         y = self // (_.ycol)
-        spline = UnivariateSpline(x, y, w=sigma, bbox=bbox, k=k, s=s, ext=ext)
+        spline = self._interpolant(
+            ("spline", _.xcol, _.ycol, k, s, tuple(bbox), ext),
+            stamp,
+            lambda: UnivariateSpline(x, y, w=sigma, bbox=bbox, k=k, s=s, ext=ext),
+        )
         new_y = spline(x)
 
         if header is None:
@@ -1,12 +1,49 @@
 # -*- coding: utf-8 -*-
 """Functions used by the AnalysisMixin class."""
 
-import numpy as np
-from scipy.interpolate import interp1d
-from scipy.optimize import curve_fit, newton
-from scipy.signal import get_window
+from collections import OrderedDict
+from functools import lru_cache
+from hashlib import blake2b
+from math import factorial
 
-__all__ = ["outlier", "threshold", "_twoD_fit", "ApplyAffineTransform", "GetAffineTransform", "poly_outlier"]
+import numpy as np
+from numpy import ma
+from scipy.interpolate import make_interp_spline, griddata, CloughTocher2DInterpolator
+from scipy.ndimage import convolve1d
+from scipy.sparse import csr_matrix
+from scipy.spatial import cKDTree, Delaunay
+from scipy.optimize import curve_fit
+from scipy.signal import get_window, savgol_coeffs
+
+__all__ = [
+    "outlier",
+    "threshold",
+    "crossings",
+    "_twoD_fit",
+    "ApplyAffineTransform",
+    "GetAffineTransform",
+    "poly_outlier",
+    "sg_filter",
+    "regrid",
+]
+
+REGRID_CACHE_SIZE = 8  # Number of sets of regridding weights to keep
+_regridders = OrderedDict()
+
+
+def _fingerprint(*arrays):
+    """Return a digest of the contents, shape and mask of some arrays that changes whenever any of them change."""
+    digest = blake2b(digest_size=16)
+    for arr in arrays:
+        if arr is None:
+            digest.update(b"None")
+            continue
+        data = np.ascontiguousarray(ma.getdata(arr))
+        digest.update(repr((data.shape, data.dtype.str)).encode())
+        digest.update(data.tobytes())
+        if ma.is_masked(arr):
+            digest.update(np.ascontiguousarray(ma.getmaskarray(arr)).tobytes())
+    return digest.digest()
 
 
 def outlier(row, window, metric, ycol=None, shape="bopxcar"):
@@ -77,6 +114,132 @@ def poly_outlier(row, window, metric=3.0, ycol=None, xcol=None, order=1, yerr=No
     return (pval - row[ycol]) ** 2 > metric * perr
 
 
+def _spline_at(spline, x, cols):
+    """Evaluate a cubic spline fitted to several columns of data, each at its own points.
+
+    Args:
+        spline (BSpline):
+            Spline with a 2D array of coefficients, one column for each column of data.
+        x (1D array):
+            The points at which to evaluate the spline.
+        cols (1D array of int):
+            The column of the spline to evaluate for each point in *x*.
+
+    Returns:
+        (1D array):
+            The spline values, NaN where *x* is outside the range of the spline.
+    """
+    t, k, c = spline.t, spline.k, spline.c
+    x = np.asarray(x, dtype=float)
+    ret = np.full(x.shape, np.nan)
+    inside = (x >= t[k]) & (x <= t[-k - 1])
+    x, cols = x[inside], np.asarray(cols)[inside]
+    interval = np.clip(np.searchsorted(t, x, side="right") - 1, k, len(t) - k - 2)
+    # de Boor's algorithm, run for all points at once
+    d = [c[interval + j - k, cols] for j in range(k + 1)]
+    for r in range(1, k + 1):
+        for j in range(k, r - 1, -1):
+            left = t[interval + j - k]
+            alpha = (x - left) / (t[interval + j + 1 - r] - left)
+            d[j] = (1.0 - alpha) * d[j - 1] + alpha * d[j]
+    ret[inside] = d[k]
+    return ret
+
+
+def _secant(spline, x0, cols, tol=1.48e-8, maxiter=50):
+    """Find the zeros of several columns of a cubic spline at once with the secant method.
+
+    Args:
+        spline (BSpline):
+            Spline with one column of coefficients for each column of data.
+        x0 (1D array):
+            Starting points for the root search.
+        cols (1D array of int):
+            The column of the spline for each starting point.
+
+    Keyword Arguments:
+        tol (float):
+            Absolute tolerance on the position of the roots.
+        maxiter (int):
+            Maximum number of iterations.
+
+    Returns:
+        (1D array):
+            The roots, NaN where the search left the range of the spline or did not converge.
+
+    Notes:
+        This follows the steps that :py:func:`scipy.optimize.newton` takes for a single root without a derivative,
+        so gives the same answers as calling it in a loop for each root.
+    """
+    p0 = np.asarray(x0, dtype=float)
+    p1 = p0 * (1 + 1e-4) + np.where(p0 >= 0, 1e-4, -1e-4)
+    q0, q1 = _spline_at(spline, p0, cols), _spline_at(spline, p1, cols)
+    swap = np.abs(q1) < np.abs(q0)
+    p0, p1 = np.where(swap, p1, p0), np.where(swap, p0, p1)
+    q0, q1 = np.where(swap, q1, q0), np.where(swap, q0, q1)
+    roots = np.full(p0.shape, np.nan)
+    active = np.isfinite(q0) & np.isfinite(q1)
+    for _ in range(maxiter):
+        if not np.any(active):
+            break
+        flat = active & (q1 == q0)  # No slope - only a root if the two points have also met
+        met = flat & (p1 == p0)
+        roots[met] = p1[met]
+        active &= ~flat
+        with np.errstate(divide="ignore", invalid="ignore"):
+            p = np.where(
+                np.abs(q1) > np.abs(q0),
+                (-q0 / q1 * p1 + p0) / (1 - q0 / q1),
+                (-q1 / q0 * p0 + p1) / (1 - q1 / q0),
+            )
+        done = active & (np.abs(p - p1) <= tol)
+        roots[done] = p[done]
+        active &= ~done
+        p0, q0 = p1, q1
+        p1 = np.where(active, p, p1)
+        q1 = np.where(active, np.nan, q1)
+        q1[active] = _spline_at(spline, p1[active], cols[active])
+        active &= np.isfinite(q1)
+    return roots
+
+
+def crossings(threshold, data, rising=True, falling=False):
+    """Find all the points where each column of data passes a threshold in one pass.
+
+    Args:
+        threshold (float):
+            Threshold value in data to look for.
+        data (1D or 2D array):
+            The data to search, each column of a 2D array is searched separately.
+
+    Keyword Arguments:
+        rising (bool):
+            Find points where data is rising up past threshold
+        falling (bool):
+            Find points where data is falling below the threshold
+
+    Returns:
+        (tuple of 1D arrays):
+            The column and fractional row index of each crossing, sorted by column and then row. The crossings are
+            located by finding the zero of a cubic spline through the data.
+    """
+    data = np.asarray(data, dtype=float)
+    data = data.reshape(data.shape[0], -1)
+    current, previous = data[1:], data[:-1]
+    found = np.zeros(current.shape, dtype=bool)
+    if rising:
+        found |= (current >= threshold) & (previous < threshold)
+    if falling:
+        found |= (current <= threshold) & (previous > threshold)
+    rows, cols = np.nonzero(found.T)[::-1]
+    if rows.size == 0:
+        return cols, np.array([])
+    spline = make_interp_spline(np.arange(data.shape[0]), data - threshold, k=3)
+    roots = _secant(spline, rows + 1.0, cols)
+    keep = np.isfinite(roots)
+    return cols[keep], roots[keep]
+
+
 def threshold(threshold, data, rising=True, falling=False):
     """Implement the threshold method - also used in peak-finder.
 
@@ -89,37 +252,203 @@ def threshold(threshold, data, rising=True, falling=False):
             Find points where data is falling below the threshold
 
     Returns:
-        (array):
+        (array or list of arrays):
             Fractional indices where the data has crossed the threshold assuming a
-            straight line interpolation between two points.
+            straight line interpolation between two points. If *data* is 2D, then a list with the crossings for each
+            column.
     """
-    # First we find all points where we cross zero in the correct direction
-    current = data
-    previous = np.roll(current, 1)
-    current = np.atleast_1d(current)
-    index = np.arange(len(current))
-    sdat = np.column_stack((index, current, previous))
-    if rising and not falling:
-        expr = lambda x: (x[1] >= threshold) & (x[2] < threshold)
-    elif rising and falling:
-        expr = lambda x: ((x[1] >= threshold) & (x[2] < threshold)) | ((x[1] <= threshold) & (x[2] > threshold))
-    elif falling and not rising:
-        expr = lambda x: (x[1] <= threshold) & (x[2] > threshold)
-    else:
-        expr = lambda x: False
-
-    # Now we refine the estimate of zero crossing with a cubic interpolation
-    # and use Newton's root finding method to locate the zero in the interpolated data
-
-    intr = interp1d(index, data.ravel() - threshold, kind="cubic")
-    roots = []
-    for ix, x in enumerate(sdat):
-        if ix > 0 and expr(x):  # There's a root somewhere here !
-            try:
-                roots.append(newton(intr, ix))
-            except (ValueError, RuntimeError):  # fell off the end here
-                pass
-    return np.array(roots)
+    cols, roots = crossings(threshold, data, rising=rising, falling=falling)
+    if np.ndim(data) < 2:
+        return roots
+    return np.split(roots, np.searchsorted(cols, np.arange(1, np.shape(data)[1])))
+
+
+@lru_cache(maxsize=64)
+def _sg_tables(window, poly, deriv=0, delta=1.0):
+    """Calculate the Savitzky-Golay filter coefficients for a window, polynomial order, derivative and spacing.
+
+    Args:
+        window (int):
+            The (odd) number of points in the filter window.
+        poly (int):
+            The order of the polynomial fitted to the window.
+
+    Keyword Arguments:
+        deriv (int):
+            The order of the derivative to calculate.
+        delta (float):
+            The spacing of the points.
+
+    Returns:
+        (tuple of 3 arrays):
+            The convolution coefficients, and the matrices that map the first and last *window* points onto the
+            filtered values of the first and last *window*//2 points.
+
+    Notes:
+        The results are cached and read-only. The most recently used 64 sets of coefficients are kept, see
+        *_sg_tables.cache_info()* for how well the cache is working.
+    """
+    coeffs = savgol_coeffs(window, poly, deriv=deriv, delta=delta)
+    # At the ends a polynomial is fitted to the first or last window of points and then differentiated and evaluated
+    # at each point - this is linear in the data so can be written as a matrix.
+    pos = np.arange(window, dtype=float)
+    powers = np.arange(poly, -1, -1)
+    scale = np.array([factorial(p) / factorial(p - deriv) if p >= deriv else 0.0 for p in powers])
+    evaluate = scale * pos[:, None] ** np.clip(powers - deriv, 0, None) / delta**deriv
+    edges = evaluate @ np.linalg.pinv(np.vander(pos, poly + 1))
+    half = window // 2
+    tables = (coeffs, edges[:half], edges[window - half :])
+    for table in tables:
+        table.flags.writeable = False
+    return tables
+
+
+def sg_filter(data, window, poly, deriv=0, delta=1.0, axis=-1):
+    """Apply a Savitzky-Golay filter along one axis of an array of any number of dimensions.
+
+    Args:
+        data (array):
+            The data to filter - all the 1D slices along *axis* are filtered together.
+        window (int):
+            The (odd) number of points in the filter window.
+        poly (int):
+            The order of the polynomial fitted to the window.
+
+    Keyword Arguments:
+        deriv (int):
+            The order of the derivative to calculate.
+        delta (float):
+            The spacing of the points.
+        axis (int):
+            The axis to filter along.
+
+    Returns:
+        (ndarray):
+            The filtered data.
+
+    Notes:
+        This gives the same results as :py:func:`scipy.signal.savgol_filter` with *mode="interp"*, but the filter
+        coefficients are cached so that filtering lots of data of the same length does not spend its time
+        recalculating them.
+    """
+    data = np.moveaxis(np.asarray(data, dtype=float), axis, -1)
+    if window > data.shape[-1]:
+        raise ValueError("The window must be no longer than the data being filtered.")
+    coeffs, left, right = _sg_tables(int(window), int(poly), int(deriv), float(delta))
+    ret = convolve1d(data, coeffs, axis=-1, mode="constant")
+    half = len(left)
+    if half > 0:
+        ret[..., :half] = data[..., :window] @ left.T
+        ret[..., -half:] = data[..., -window:] @ right.T
+    return np.moveaxis(ret, -1, axis)
+
+
+class _Regridder:
+
+    """Interpolate values from a fixed set of scattered points onto a fixed set of target points.
+
+    Args:
+        points (2D array):
+            The (number of points, number of dimensions) co-ordinates of the data.
+        targets (2D array):
+            The co-ordinates of the points to interpolate onto.
+
+    Keyword Arguments:
+        method (str):
+            "linear", "nearest" or "cubic" as for :py:func:`scipy.interpolate.griddata`.
+
+    The points are triangulated once. For linear and nearest neighbour interpolation the interpolation is a fixed
+    weighted sum of the values at a few of the points, so the weights are stored as a sparse matrix and any number of
+    channels of values are interpolated with a single sparse matrix product. For cubic interpolation, all the
+    channels are passed to a :py:class:`scipy.interpolate.CloughTocher2DInterpolator` on the stored triangulation.
+    """
+
+    def __init__(self, points, targets, method="linear"):
+        """Triangulate the points and work out the interpolation weights."""
+        self.method = method
+        self.targets = targets
+        npoints, ntargets = len(points), len(targets)
+        if method == "nearest":
+            index = cKDTree(points).query(targets)[1]
+            self.weights = csr_matrix((np.ones(ntargets), (np.arange(ntargets), index)), shape=(ntargets, npoints))
+            self.outside = np.zeros(ntargets, dtype=bool)
+            return
+        if method not in ["linear", "cubic"]:
+            raise ValueError(f"Unknown interpolation method {method}")
+        if method == "cubic" and points.shape[1] != 2:
+            raise ValueError("Cubic interpolation is only available for 2D data")
+        self.tri = Delaunay(points)
+        if method == "cubic":
+            return
+        simplex = self.tri.find_simplex(targets)
+        self.outside = simplex < 0
+        inside = np.nonzero(~self.outside)[0]
+        transform = self.tri.transform[simplex[inside]]
+        ndim = points.shape[1]
+        # Barycentric co-ordinates of each target in its simplex
+        bary = np.einsum("ijk,ik->ij", transform[:, :ndim, :], targets[inside] - transform[:, ndim, :])
+        bary = np.column_stack([bary, 1.0 - bary.sum(axis=1)])
+        rows = np.repeat(inside, ndim + 1)
+        cols = self.tri.simplices[simplex[inside]].ravel()
+        self.weights = csr_matrix((bary.ravel(), (rows, cols)), shape=(ntargets, npoints))
+
+    def __call__(self, values):
+        """Interpolate a (number of points, ...) array of values onto the targets."""
+        values = np.asarray(values, dtype=float)
+        if self.method == "cubic":
+            return CloughTocher2DInterpolator(self.tri, values)(self.targets)
+        shape = values.shape
+        ret = self.weights @ values.reshape(shape[0], -1)
+        ret[self.outside] = np.nan
+        return ret.reshape((-1,) + shape[1:])
+
+
+def regrid(points, values, targets, method="linear"):
+    """Interpolate several channels of scattered data onto new points in one go.
+
+    Args:
+        points (2D array or tuple of 1D arrays):
+            The co-ordinates of the data, either as a (number of points, number of dimensions) array or as a
+            tuple of arrays of each co-ordinate.
+        values (array):
+            The data values - either one value for each point or a (number of points, number of channels) array.
+        targets (array or tuple of arrays):
+            The co-ordinates to interpolate onto, either as an array whose last axis is the number of dimensions
+            or as a tuple of arrays of each co-ordinate.
+
+    Keyword Arguments:
+        method (str):
+            "linear", "nearest" or "cubic" as for :py:func:`scipy.interpolate.griddata`.
+
+    Returns:
+        (ndarray):
+            The interpolated values, with the shape of the targets, followed by the number of channels if there is
+            more than one. Targets outside the convex hull of the points are NaN for linear and cubic interpolation.
+
+    Notes:
+        This gives the same results as :py:func:`scipy.interpolate.griddata`, but the triangulation of the points and
+        the interpolation weights are cached against the points and targets. Regridding more data from the same
+        points onto the same targets, or several channels at once, only triangulates the points once. The
+        *REGRID_CACHE_SIZE* most recently used sets of weights are kept.
+    """
+    if isinstance(points, tuple):
+        points = np.column_stack([np.ravel(p) for p in points])
+    if isinstance(targets, tuple):
+        targets = np.stack([np.asarray(t, dtype=float) for t in targets], axis=-1)
+    points = np.asarray(points, dtype=float)
+    targets = np.asarray(targets, dtype=float)
+    if points.ndim < 2 or points.shape[1] < 2:  # 1D data is just handed over to scipy
+        return griddata(points, values, targets, method=method)
+    shape = targets.shape[:-1]
+    targets = targets.reshape(-1, points.shape[1])
+    key = (method, _fingerprint(points), _fingerprint(targets))
+    if key not in _regridders:
+        _regridders[key] = _Regridder(points, targets, method)
+        while len(_regridders) > REGRID_CACHE_SIZE:
+            _regridders.popitem(last=False)
+    _regridders.move_to_end(key)
+    ret = _regridders[key](values)
+    return ret.reshape(shape + ret.shape[1:])
 
 
 def _twoD_fit(xy1, xy2, xmode="linear", ymode="linear", m0=None):
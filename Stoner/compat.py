@@ -9,15 +9,6 @@ from shutil import which
 from pathlib import PurePath
 
 import numpy as np
-from matplotlib import __version__ as mpl_version
-
-try:
-    from lmfit import Model  # pylint: disable=unused-import
-
-    _lmfit = True
-except ImportError:
-    Model = object
-    _lmfit = False
 
 __all__ = [
     "str2bytes",
@@ -39,26 +30,61 @@ __all__ = [
     "commonpath",
 ]
 
-try:
-    import hyperspy as hs  # Workaround an issue in hs 1.5.2 conda packages
 
+def _import_lmfit():
+    """Import lmfit's Model class if it is available."""
     try:
-        load = hs.load
-    except AttributeError:
+        from lmfit import Model  # pylint: disable=import-outside-toplevel
+
+        return {"Model": Model, "_lmfit": True}
+    except ImportError:
+        return {"Model": object, "_lmfit": False}
+
+
+def _import_hyperspy():
+    """Import hyperspy if it is available and new enough."""
+    try:
+        import hyperspy as hs  # pylint: disable=import-outside-toplevel
+
         try:
-            from hyperspy import api
-
-            load = api.load
-        except (ImportError, AttributeError) as err:
-            raise ImportError("Panic over hyperspy") from err
-
-    HuperSpyVersion = [int(x) for x in hs.__version__.split(".")]
-    if HuperSpyVersion[0] <= 1 and HuperSpyVersion[1] <= 3:
-        raise ImportError(f"Hyperspy should be version 1.4 or above. Actual version is {hs.__version__}")
-    Hyperspy_ok = True
-except ImportError:
-    Hyperspy_ok = False
-    hs = None
+            _ = hs.load  # Workaround an issue in hs 1.5.2 conda packages
+        except AttributeError:
+            try:
+                from hyperspy import api  # pylint: disable=import-outside-toplevel,unused-import
+            except (ImportError, AttributeError) as err:
+                raise ImportError("Panic over hyperspy") from err
+
+        HuperSpyVersion = [int(x) for x in hs.__version__.split(".")]
+        if HuperSpyVersion[0] <= 1 and HuperSpyVersion[1] <= 3:
+            raise ImportError(f"Hyperspy should be version 1.4 or above. Actual version is {hs.__version__}")
+        return {"hs": hs, "Hyperspy_ok": True}
+    except ImportError:
+        return {"hs": None, "Hyperspy_ok": False}
+
+
+def _import_mpl_version():
+    """Get the matplotlib version."""
+    from matplotlib import __version__  # pylint: disable=import-outside-toplevel
+
+    return {"mpl_version": __version__}
+
+
+# The optional and heavy dependencies are only imported when first asked for.
+_lazy_imports = {
+    "Model": _import_lmfit,
+    "_lmfit": _import_lmfit,
+    "hs": _import_hyperspy,
+    "Hyperspy_ok": _import_hyperspy,
+    "mpl_version": _import_mpl_version,
+}
+
+
+def __getattr__(name):
+    """Import optional dependencies when they are first used (PEP 562)."""
+    if name not in _lazy_imports:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    globals().update(_lazy_imports[name]())
+    return globals()[name]
 
 
 if __vi__[1] < 7:
@@ -15,6 +15,7 @@ __all__ = [
     "operators",
     "property",
     "setas",
+    "stream",
     "string_to_type",
     "exceptions",
     "utils",
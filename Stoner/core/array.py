@@ -7,6 +7,8 @@ A subclass of :py:class:`numpy.ma.MaskedArray` that knows that columns have  nam
 __all__ = ["DataArray"]
 
 import copy
+import weakref
+from itertools import count
 
 import numpy.ma as ma
 import numpy as np
@@ -17,6 +19,9 @@ from Stoner.tools import isIterable, all_type, isNone, AttributeStore, all_size
 from .setas import setas as _setas
 from .exceptions import StonerSetasError
 
+#: Source of the values of :py:attr:`DataArray._version` - never repeats, so no two versions of any data are equal.
+_DATA_VERSIONS = count()
+
 
 class DataArray(ma.MaskedArray):
 
@@ -111,6 +116,8 @@ class DataArray(ma.MaskedArray):
                 self.mask = obj.mask
                 self.fill_value = obj.fill_value
                 self._setas._row = getattr(obj._setas, "_row", False)
+            elif isinstance(obj, _BufferRows):  # _RowBuffer.view sets up the mask and row indices itself
+                self._setas._row = False
             else:
                 self.i = 0
                 self.mask = False
@@ -118,6 +125,11 @@ class DataArray(ma.MaskedArray):
                 if np.issubdtype(self.dtype, np.floating):
                     self.fill_value = np.nan
             self._setas.shape = getattr(self, "shape", (0,))
+        # Views share a version counter with the array they look into, anything else starts a new one.
+        if isinstance(obj, DataArray) and np.may_share_memory(self, obj):
+            self._versions = obj._versions
+        else:
+            self._versions = [next(_DATA_VERSIONS)]
 
     def __array_wrap__(self, out_arr, context=None):
         """Make sure ufuncs do the right thing with DataArrays."""
@@ -133,6 +145,22 @@ class DataArray(ma.MaskedArray):
         """Return the DataArray as a normal numpy array for those operations that need this."""
         return ma.getdata(self)
 
+    @property
+    def _version(self):
+        """Return a number that changes whenever values are written to this array or a view of it.
+
+        The number is shared with views of the array, so writing through any of them changes it. Writes made
+        directly to the underlying numpy buffer, bypassing the DataArray, are not seen.
+        """
+        if "_versions" not in self.__dict__:
+            self._versions = [next(_DATA_VERSIONS)]
+        return self._versions[0]
+
+    def _changed(self):
+        """Record that the values in the array have been changed."""
+        self._versions = self.__dict__.get("_versions", [0])
+        self._versions[0] = next(_DATA_VERSIONS)
+
     @property
     def isrow(self):
         """Define whether this is a single row or a column if 1D."""
@@ -447,6 +475,37 @@ class DataArray(ma.MaskedArray):
             self.unshare_mask()
 
         super().__setitem__(ix, val)
+        self._changed()
+
+    def __iadd__(self, other):
+        """Add in place, recording the change."""
+        self._changed()
+        return super().__iadd__(other)
+
+    def __isub__(self, other):
+        """Subtract in place, recording the change."""
+        self._changed()
+        return super().__isub__(other)
+
+    def __imul__(self, other):
+        """Multiply in place, recording the change."""
+        self._changed()
+        return super().__imul__(other)
+
+    def __itruediv__(self, other):
+        """Divide in place, recording the change."""
+        self._changed()
+        return super().__itruediv__(other)
+
+    def __ifloordiv__(self, other):
+        """Floor divide in place, recording the change."""
+        self._changed()
+        return super().__ifloordiv__(other)
+
+    def __ipow__(self, other):
+        """Raise to a power in place, recording the change."""
+        self._changed()
+        return super().__ipow__(other)
 
     # ==============================================================================================================
     ############################              Private Methods                #######################################
@@ -576,3 +635,98 @@ class DataArray(ma.MaskedArray):
                 "Swap parameter must be either a tuple or a \
             list of tuples"
             )
+
+
+class _BufferRows(np.ndarray):
+
+    """Storage for a :py:class:`_RowBuffer` - views of it skip building a mask and row indices that will be replaced."""
+
+
+class _RowBuffer:
+
+    """Row storage with spare capacity so that rows can be added to a :py:class:`DataArray` in amortised O(1) time.
+
+    The data, mask and row indices are kept in arrays that are larger than needed and the :py:class:`DataArray` handed
+    out by :py:meth:`view` is a view onto the first :py:attr:`rows` rows. When the capacity runs out it is doubled.
+
+    Attributes:
+        rows (int):
+            The logical number of rows held in the buffer.
+        exported (bool):
+            True once a view of the rows may have been handed out to a caller, in which case the rows must be copied
+            to a new buffer before they are changed. Cleared when the buffer is reallocated.
+    """
+
+    def __init__(self, data, capacity=None, dtype=None):
+        """Copy an existing 2D :py:class:`DataArray` into a new buffer with room for at least *capacity* rows."""
+        rows, cols = data.shape
+        capacity = max(capacity or 0, 2 * rows, 16)
+        self.data = np.empty((capacity, cols), dtype=dtype or data.dtype).view(_BufferRows)
+        self.mask = np.zeros((capacity, cols), dtype=bool)
+        index = np.ravel(getattr(data, "_ibase", []))
+        start = index[0] if len(index) else 0
+        self.index = np.arange(start, start + capacity)
+        self.data[:rows] = ma.getdata(data)
+        self.mask[:rows] = ma.getmaskarray(data)
+        self.rows = rows
+        self.exported = False
+        self._handed = None
+
+    def owns(self, data):
+        """Check whether *data* is still the view that was last handed out by this buffer.
+
+        Replacing the :py:class:`DataArray`, its mask or its row indices (or slicing it) all break the link between
+        the data and the buffer, in which case the buffer must be rebuilt from the data.
+        """
+        if self._handed is None:
+            return False
+        view, mask, index = (ref() for ref in self._handed)
+        return (
+            data is view
+            and data._mask is mask
+            and getattr(data, "_ibase", None) is index
+            and data.shape == (self.rows, self.data.shape[1])
+        )
+
+    def reserve(self, rows):
+        """Make sure that there is space for at least *rows* rows, doubling the capacity as needed."""
+        capacity = self.data.shape[0]
+        if rows <= capacity:
+            return
+        while capacity < rows:
+            capacity *= 2
+        for attr in ("data", "mask"):
+            old = getattr(self, attr)
+            new = np.zeros((capacity, old.shape[1]), dtype=old.dtype).view(type(old))
+            new[: self.rows] = old[: self.rows]
+            setattr(self, attr, new)
+        self.index = np.arange(self.index[0], self.index[0] + capacity)
+        self.exported = False  # Nobody else can see the new arrays
+
+    def insert(self, row, new_data, new_mask=False):
+        """Insert rows of *new_data* before *row*, shifting the following rows along within the buffer."""
+        new_data = np.atleast_2d(new_data)
+        count = new_data.shape[0]
+        self.reserve(self.rows + count)
+        if row < self.rows:  # numpy copes with the overlapping slices
+            self.data[row + count : self.rows + count] = self.data[row : self.rows]
+            self.mask[row + count : self.rows + count] = self.mask[row : self.rows]
+        self.data[row : row + count] = new_data
+        self.mask[row : row + count] = new_mask
+        self.rows += count
+
+    def view(self, setas, fill_value=None):
+        """Return a :py:class:`DataArray` view of the occupied rows that shares *setas* with the previous one."""
+        ret = self.data[: self.rows].view(DataArray)
+        ret._baseclass = np.ndarray
+        ret._mask = self.mask[: self.rows]
+        ret._sharedmask = False
+        ret._ibase = self.index[: self.rows]
+        self._handed = (weakref.ref(ret), weakref.ref(ret._mask), weakref.ref(ret._ibase))
+        setas.shape = ret.shape
+        ret._setas = setas
+        if fill_value is not None:
+            ret.fill_value = fill_value
+        elif np.issubdtype(ret.dtype, np.floating):
+            ret.fill_value = np.nan
+        return ret
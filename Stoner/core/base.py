@@ -121,9 +121,16 @@ class _evaluatable:
 
 class regexpDict(sorteddict):
 
-    """An ordered dictionary that permits looks up by regular expression."""
+    """An ordered dictionary that permits looks up by regular expression.
+
+    Attributes:
+        _version (int):
+            A counter that is bumped every time the dictionary is changed (or replaced as an object's metadata) so
+            that caches built from the dictionary can cheaply tell whether it has changed.
+    """
 
     allowed_keys: Tuple = (object,)
+    _version: int = 0
 
     def __lookup__(
         self, name: Union[str, RegExp], multiple: bool = False, exact: bool = False
@@ -196,10 +203,40 @@ class regexpDict(sorteddict):
                 raise KeyError(f"{name} is not a match to any key.")
             key = name
         super().__setitem__(key, value)
+        self._version += 1
 
     def __delitem__(self, name: Any) -> None:
         """Delete keys that match by regular expression as well as exact matches."""
         super().__delitem__(self.__lookup__(name))
+        self._version += 1
+
+    def pop(self, *args: Any) -> Any:
+        """Remove a key and return its value, noting the change in the version counter."""
+        ret = super().pop(*args)
+        self._version += 1
+        return ret
+
+    def popitem(self, *args: Any) -> Tuple[Any, Any]:
+        """Remove and return a (key, value) pair, noting the change in the version counter."""
+        ret = super().popitem(*args)
+        self._version += 1
+        return ret
+
+    def setdefault(self, name: Any, default: Any = None) -> Any:
+        """Return the value of name, setting it to default first if it is missing."""
+        if name not in self:
+            self[name] = default
+        return self[name]
+
+    def update(self, *args: Any, **kargs: Any) -> None:
+        """Update the dictionary from a mapping or iterable of pairs, noting the change in the version counter."""
+        super().update(*args, **kargs)
+        self._version += 1
+
+    def clear(self) -> None:
+        """Remove all items, noting the change in the version counter."""
+        super().clear()
+        self._version += 1
 
     def __contains__(self, name: Any) -> bool:
         """Return True if name either is an exact key or matches when interpreted as a regular experssion."""
@@ -714,6 +751,9 @@ class metadataObject(MutableMapping):
     @metadata.setter
     def metadata(self, value: IterableType) -> None:
         """Update the metadata object with type checking."""
+        old = self.__dict__.get("_metadata", None)
+        if isinstance(old, regexpDict) and old is not value:  # Caches of the old dictionary are now out of date
+            old._version += 1
         if not isinstance(value, typeHintedDict) and isIterable(value):
             self._metadata = typeHintedDict(value)
         elif isinstance(value, typeHintedDict):
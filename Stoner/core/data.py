@@ -11,11 +11,6 @@ from Stoner.analysis.features import FeatureOpsMixin
 from Stoner.plot import PlotMixin
 from Stoner.Core import DataFile
 
-# Bring all the subclasses into memory (idnore unused imports warnings)
-import Stoner.formats  # NOQA pylint: disable=W0611
-import Stoner.HDF5  # NOQA pylint: disable=W0611
-import Stoner.Zip  # NOQA pylint: disable=W0611
-
 from Stoner.tools import format_error
 
 
@@ -110,8 +110,9 @@ class DataFileInterfacesMixin:
 
         Returns: Returns the number of rows of data
         """
-        if np.prod(self.data.shape) > 0:
-            return np.shape(self.data)[0]
+        shape = self.shape
+        if np.prod(shape) > 0:
+            return shape[0]
         return 0
 
     def __setitem__(self, name, value):
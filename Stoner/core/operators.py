@@ -265,7 +265,7 @@ class DataFileOperatorsMixin:
         col_headers_tmp = [x.strip() for x in row[1:]]
         cols = len(col_headers_tmp)
         self._data._setas = _setas("." * cols)
-        self.data = DataArray([], setas=self._data._setas)
+        values = []  # Collect the values in a list and convert once at the end rather than appending to an array
         for r in reader:
             if r.strip() == "":  # Blank line
                 continue
@@ -284,8 +284,8 @@ class DataFileOperatorsMixin:
                     self.metadata[md[0].strip()] = self.metadata.string_to_type(md[1].strip())
             if len(row) < 2:
                 continue
-            self.data = np.append(self.data, self._conv_float(row[1:]))
-        self.data = np.reshape(self.data, (-1, cols))
+            values.extend(self._conv_float(row[1:]))
+        self.data = DataArray(np.reshape(np.array(values, dtype=float), (-1, cols)), setas=self._data._setas)
         self.column_headers = [f"Column {i}" for i in range(cols)]
         for i, head_temp in enumerate(col_headers_tmp):
             self.column_headers[i] = head_temp
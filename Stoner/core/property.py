@@ -73,6 +73,9 @@ class DataFilePropertyMixin:
     @property
     def data(self):
         """Property Accessors for the main numerical data."""
+        buffer = self.__dict__.get("_row_buffer", None)
+        if buffer is not None:  # The rows can now be seen from outside, so they must be copied before they change
+            buffer.exported = True
         return np.atleast_2d(self._data)
 
     @data.setter
@@ -229,7 +232,7 @@ class DataFilePropertyMixin:
     @property
     def shape(self):
         """Pass through the numpy shape attribute of the data."""
-        return self.data.shape
+        return np.atleast_2d(self._data).shape
 
     @property
     def setas(self):
@@ -0,0 +1,216 @@
+#!/usr/bin/env python3
+# -*- coding: utf-8 -*-
+"""Support for following TDI files that are still being written by an instrument."""
+
+__all__ = ["TDIStreamReader"]
+
+import io
+import os
+import time
+
+import numpy as np
+
+from .exceptions import StonerLoadError
+
+
+class TDIStreamReader:
+
+    """Incrementally load the rows that are appended to a TDI format file.
+
+    Args:
+        datafile (DataFile):
+            The object that the rows of the file are loaded into.
+        filename (str or None):
+            The file to follow, if None then the *filename* attribute of *datafile* is used.
+        chunk_size (int):
+            The largest number of bytes to read from the file and parse at once.
+
+    The reader remembers how far through the file it has got, so each call to :py:meth:`read` only parses the
+    complete lines that have been written since the last call and appends them to the data of *datafile* through
+    its growable row buffer. An incomplete final line is left for the next read. Metadata entries in the first
+    column of the file are added to the metadata as they are reached.
+
+    Attributes:
+        offset (int):
+            The byte offset of the first line that has not been read yet.
+        fmt (float or None):
+            The TDI format version once the header line has been read.
+        columns (int or None):
+            The number of data columns once the header line has been read.
+        chunk_size (int):
+            The largest number of bytes to read from the file and parse at once.
+
+    Example:
+        Follow a file, smoothing just the new rows (plus a few earlier ones for the window) as they arrive::
+
+            reader = Data().stream("live.txt")
+            for block in reader.follow(interval=2.0, context=10, timeout=60.0):
+                block.smooth("boxcar", size=10)
+    """
+
+    def __init__(self, datafile, filename=None, chunk_size=1 << 20):
+        """Note the data object and file to follow."""
+        self.datafile = datafile
+        self.filename = str(filename if filename is not None else datafile.filename)
+        self.chunk_size = int(chunk_size)
+        self.offset = 0
+        self.fmt = None
+        self.columns = None
+
+    def _header(self, line):
+        """Parse the header line for the format and the column headers."""
+        if line.startswith("TDI Format 1.5"):
+            self.fmt = 1.5
+        elif line.startswith("TDI Format=Text 1.0"):
+            self.fmt = 1.0
+        else:
+            raise StonerLoadError("Not a TDI File")
+        headers = [x.strip() for x in line.rstrip("\r").split("\t")[1:]]
+        self.columns = len(headers)
+        self.datafile.filename = self.filename
+        self.datafile.data = np.zeros((0, self.columns))
+        self.datafile.column_headers = headers
+        self.datafile["TDI Format"] = self.fmt
+
+    def _parse(self, lines):
+        """Import the metadata and convert the data part of lines of the file into a 2D array."""
+        rows = []
+        for line in lines:
+            fields = line.rstrip("\r").split("\t")
+            if "=" in fields[0]:
+                self.datafile.metadata.import_key(fields[0])
+            values = [v.strip() for v in fields[1 : self.columns + 1]]
+            if not any(values):  # Metadata only or blank line
+                continue
+            values.extend([""] * (self.columns - len(values)))
+            rows.append("\t".join(v if v else "nan" for v in values))
+        if not rows:
+            return np.zeros((0, self.columns))
+        text = "\n".join(rows)
+        try:
+            return np.loadtxt(io.StringIO(text), delimiter="\t", ndmin=2, comments=None)
+        except ValueError:  # Something that is not a number - fall back to the slower, more forgiving parser
+            data = np.genfromtxt(io.StringIO(text), delimiter="\t", comments=None, invalid_raise=False)
+            return np.atleast_2d(data).reshape(-1, self.columns)
+
+    def reset(self):
+        """Start reading the file again from the beginning, discarding the rows that have been loaded."""
+        self.offset = 0
+        self.fmt = None
+        self.columns = None
+        return self
+
+    def read(self):
+        """Load any complete rows that have been written to the file since the last read.
+
+        Returns:
+            (ndarray):
+                The new rows of data - this has no rows if nothing new has been written.
+
+        Notes:
+            The file is read and parsed at most :py:attr:`chunk_size` bytes at a time, so the raw text of a large
+            backlog of rows is never held in memory all at once. If the file has become shorter than the part
+            already read, it is assumed to have been restarted and is read again from the beginning.
+        """
+        if os.path.getsize(self.filename) < self.offset:
+            self.reset()
+        added = 0
+        with io.open(self.filename, "rb") as datafile:
+            datafile.seek(self.offset)
+            pending = b""
+            while True:
+                chunk = datafile.read(self.chunk_size)
+                if not chunk:
+                    break
+                chunk = pending + chunk
+                end = chunk.rfind(b"\n") + 1  # Only consume whole lines
+                pending = chunk[end:]
+                if end == 0:
+                    continue
+                self.offset += end
+                lines = chunk[:end].decode("utf-8", errors="ignore").split("\n")[:-1]
+                if self.fmt is None:
+                    self._header(lines.pop(0))
+                new = self._parse(lines)
+                if new.shape[0] > 0:
+                    self.datafile._insert_rows(len(self.datafile), new)
+                    added += new.shape[0]
+        if added == 0:
+            return np.zeros((0, self.columns or 0))
+        return np.asarray(self.datafile.data)[len(self.datafile) - added :]
+
+    def tail(self, rows, context=0):
+        """Return a new object with just the last rows of the data for incremental analysis.
+
+        Args:
+            rows (int):
+                The number of rows at the end of the data to include.
+
+        Keyword Arguments:
+            context (int):
+                Extra earlier rows to include, for example to fill the window of a smoothing operation.
+
+        Returns:
+            (DataFile):
+                An object of the same type as the data being loaded, with the same column headers, setas and
+                metadata.
+        """
+        datafile = self.datafile
+        start = max(len(datafile) - rows - context, 0)
+        ret = type(datafile)()
+        ret.data = np.ma.array(datafile.data[start:], copy=True)
+        ret.column_headers = list(datafile.column_headers)
+        ret.setas = datafile.setas.to_list()
+        ret.metadata = datafile.metadata.copy()
+        ret.filename = datafile.filename
+        return ret
+
+    def follow(self, interval=1.0, timeout=None, context=0):
+        """Generate blocks of new rows as they are written to the file.
+
+        Keyword Arguments:
+            interval (float):
+                Time in seconds to wait between checks of the file.
+            timeout (float or None):
+                Stop once nothing new has been written for this long. If None, keep following forever.
+            context (int):
+                Extra earlier rows to include in each block - see :py:meth:`tail`.
+
+        Yields:
+            (DataFile):
+                The newly loaded rows, as returned by :py:meth:`tail`.
+        """
+        last = time.monotonic()
+        while True:
+            new = self.read()
+            if new.shape[0] > 0:
+                last = time.monotonic()
+                yield self.tail(new.shape[0], context)
+            elif timeout is not None and time.monotonic() - last >= timeout:
+                return
+            else:
+                time.sleep(interval)
+
+    async def afollow(self, interval=1.0, timeout=None, context=0):
+        """Asynchronously generate blocks of new rows as they are written to the file.
+
+        The file is read in the event loop's default executor so that parsing a large block of new rows does not
+        hold up other tasks. The keyword arguments are the same as for :py:meth:`follow`.
+
+        Yields:
+            (DataFile):
+                The newly loaded rows, as returned by :py:meth:`tail`.
+        """
+        import asyncio  # Only needed when following asynchronously
+
+        loop = asyncio.get_running_loop()
+        last = time.monotonic()
+        while True:
+            new = await loop.run_in_executor(None, self.read)
+            if new.shape[0] > 0:
+                last = time.monotonic()
+                yield self.tail(new.shape[0], context)
+            elif timeout is not None and time.monotonic() - last >= timeout:
+                return
+            else:
+                await asyncio.sleep(interval)
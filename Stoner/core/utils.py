@@ -29,7 +29,8 @@ def add_core(other: Union["DataFile", np.ndarray, List[Numeric], MappingType], n
             A modified newdata
     """
     if isinstance(other, np.ndarray):
-        if len(newdata) == 0:  # pylint: disable=len-as-condition
+        rows = len(newdata)
+        if rows == 0:
             ch = getattr(other, "column_headers", [])
             setas = getattr(other, "setas", "")
             t = np.atleast_2d(other)
@@ -40,17 +41,15 @@ def add_core(other: Union["DataFile", np.ndarray, List[Numeric], MappingType], n
             newdata.setas = setas
             newdata.column_headers = ch
             ret = newdata
-        elif len(np.shape(other)) == 1:
+        elif other.ndim == 1:
             # 1D array, so assume a single row of data
-            if np.shape(other)[0] == np.shape(newdata.data)[1]:
-                newdata.data = np.append(newdata.data, np.atleast_2d(other), 0)
-                ret = newdata
+            if other.shape[0] == newdata.shape[1]:
+                ret = newdata._insert_rows(rows, other)
             else:
                 return NotImplemented
-        elif len(np.shape(other)) == 2 and np.shape(other)[1] == np.shape(newdata.data)[1]:
+        elif other.ndim == 2 and other.shape[1] == newdata.shape[1]:
             # DataFile + array with correct number of columns
-            newdata.data = np.append(newdata.data, other, 0)
-            ret = newdata
+            ret = newdata._insert_rows(rows, other)
         else:
             return NotImplemented
     elif isinstance(other, type(newdata)):  # Appending another DataFile
@@ -62,8 +61,7 @@ def add_core(other: Union["DataFile", np.ndarray, List[Numeric], MappingType], n
             except KeyError:
                 pass
         newdata.metadata.update(other.metadata)
-        newdata.data = np.append(newdata.data, new_data, axis=0)
-        ret = newdata
+        ret = newdata._insert_rows(len(newdata), new_data, mask=False)
     elif isinstance(other, list):
         for o in other:
             newdata = newdata + o
@@ -89,10 +87,7 @@ def add_core(other: Union["DataFile", np.ndarray, List[Numeric], MappingType], n
             for k in order:
                 row[order[k]] = other[k]
                 mask[order[k]] = False
-            old_mask = newdata.mask
-            newdata.data = np.ma.append(newdata.data, np.atleast_2d(row), axis=0)
-            newdata.mask[:-1, :] = old_mask
-            newdata.mask[-1] = mask
+            newdata._insert_rows(len(newdata), np.atleast_2d(row), mask=np.atleast_2d(mask))
         ret = newdata
     else:
         return NotImplemented
@@ -17,7 +17,7 @@ from ..tools import operator, isIterable, all_type, get_option
 from ..core.base import regexpDict, typeHintedDict
 from ..core.base import metadataObject
 
-from .utils import pathjoin
+from .utils import pathjoin, _ColumnBuilder
 from .each import Item as EachItem
 from .metadata import MetadataProxy
 from .groups import GroupsDict
@@ -608,6 +608,7 @@ class baseFolder(MutableSequence):
         Note:
             We're in the base class here, so we don't call super() if we can't handle this, then we're stuffed!
         """
+        self._forget_metadata()
         if name is None:
             name = self.make_name()
         if force_insert:
@@ -648,6 +649,7 @@ class baseFolder(MutableSequence):
             We're in the base class here, so we don't call super() if we can't handle this, then we're stuffed!
 
         """
+        self._forget_metadata()
         del self.objects[ix]
 
     def __clear__(self):
@@ -657,9 +659,14 @@ class baseFolder(MutableSequence):
             We're in the base class here, so we don't call super() if we can't handle this, then we're stuffed!
 
         """
+        self._forget_metadata()
         for n in self.__names__():
             self.__deleter__(self.__lookup__(n))
 
+    def _forget_metadata(self):
+        """Discard the cached table of the members' metadata when the members of the folder change."""
+        self.__dict__.pop("_metadata_table", None)
+
     def __clone__(self, other=None, attrs_only=False):
         """Do whatever is necessary to copy attributes from self to other.
 
@@ -929,6 +936,8 @@ class baseFolder(MutableSequence):
         result = cls.__new__(cls)
         memo[id(self)] = result
         for k, v in self.__dict__.items():
+            if k == "_metadata_table":  # Cache of the members' metadata - rebuilt on demand
+                continue
             try:
                 setattr(result, k, deepcopy(v, memo))
             except (TypeError, ValueError, RecursionError):
@@ -1081,6 +1090,8 @@ class baseFolder(MutableSequence):
                 ret = walker(self, breadcrumb, **walker_args)
             else:
                 ret = [walker(f, breadcrumb, **walker_args) for f in self]
+        if isinstance(ret, _ColumnBuilder):  # Walker collected columns - now make the metadataObject in one go
+            ret = ret.build()
         return ret
 
     ###########################################################################
@@ -1737,7 +1748,9 @@ class baseFolder(MutableSequence):
 
                 walker(f,list_of_group_names,**walker_args)
 
-            where f is either a objectFolder or metadataObject.
+            where f is either a objectFolder or metadataObject. A walker that assembles a new metadataObject column by
+            column can return a :py:class:`Stoner.folders.utils._ColumnBuilder` which is then built into the new
+            object with a single allocation.
         """
         group = kargs.pop("group", False)
         replace_terminal = kargs.pop("replace_terminal", False)
@@ -4,6 +4,7 @@
 __all__ = ["MetadataProxy"]
 import fnmatch
 from collections.abc import MutableMapping
+from numbers import Number
 
 from lmfit import Model
 import numpy as np
@@ -52,6 +53,9 @@ def _fmt_as_Data(results):
             mask[:, ix] = np.isnan(col)
         except TypeError:
             pass
+    if isinstance(results, _MetadataColumns):  # Also mask entries that were missing rather than NaN
+        for ix, present in enumerate(results.present.values()):
+            mask[:, ix] |= ~present
     ret.mask = mask
     return ret
 
@@ -73,6 +77,221 @@ def _fmt_as_smart(results):
     return _fmt_as_dict(results)
 
 
+def _as_column(values, present):
+    """Convert a list of metadata values into a numpy column, using NaN for missing entries.
+
+    Args:
+        values (list):
+            The value from each member of the folder (anything for missing entries).
+        present (array of bool):
+            Which members of the folder actually have the key.
+
+    Returns:
+        (ndarray):
+            A 1D column with a numeric dtype if all the present values are numeric, otherwise an object array.
+    """
+    data = [v for v, p in zip(values, present) if p]
+    try:
+        typed = np.array(data)
+    except (TypeError, ValueError):
+        typed = None
+    if typed is None or typed.ndim != 1 or typed.dtype.kind not in "biufc":
+        typed = np.empty(len(data), dtype=object)
+        typed[:] = data
+    if present.all():
+        return typed
+    if typed.dtype.kind in "biuf":
+        col = np.full(len(values), np.nan)
+    else:
+        col = np.full(len(values), np.nan, dtype=typed.dtype if typed.dtype.kind == "c" else object)
+    col[present] = typed
+    return col
+
+
+_IMMUTABLE = (str, bytes, Number, type(None))
+
+
+class _MetadataColumns(dict):
+
+    """A dictionary of metadata key to column that also records which members had each key."""
+
+    def __init__(self):
+        """Start with no columns."""
+        super().__init__()
+        self.present = {}
+
+    def add(self, name, values, present):
+        """Add a column of values and its presence mask."""
+        self[name] = _as_column(values, present)
+        self.present[name] = present
+
+
+class _MetadataTable:
+
+    """A cached, column-wise view of the metadata of all the members of a folder.
+
+    The table keeps a snapshot of each member's metadata together with the
+    :py:attr:`Stoner.core.base.regexpDict._version` counters of the dictionaries that the member's metadata is built
+    from. The folder drops the table whenever members are set, inserted or deleted, otherwise :py:meth:`stale` finds
+    the members whose dictionaries have changed since they were read and :py:meth:`update` re-reads just those, only
+    rebuilding the cached columns for their keys.
+
+    Attributes:
+        watched (list of tuple of dict):
+            For each member, the dictionaries whose changes alter the member's metadata.
+        stamps (list of tuple):
+            The versions of the watched dictionaries when each member was read.
+        rows (list of dict):
+            The snapshot of each member's metadata.
+        key_counts (dict):
+            The number of members that have each key.
+        columns (dict):
+            Cache of key to (list of values, presence mask) for the keys whose values are all immutable.
+    """
+
+    def __init__(self, members=()):
+        """Read the metadata of the members of a folder.
+
+        Args:
+            members (iterable of (dict, tuple of dict)):
+                The metadata of each member, in order, and the dictionaries to watch for changes to it.
+        """
+        self.watched = []
+        self.stamps = []
+        self.rows = []
+        self.key_counts = {}
+        self.columns = {}
+        for metadata, watched in members:
+            row = {k: metadata[k] for k in metadata.keys()}
+            self.watched.append(watched)
+            self.stamps.append(self._stamp(watched))
+            self.rows.append(row)
+            self._count(row, 1)
+
+    def __len__(self):
+        """Return the number of members in the table."""
+        return len(self.rows)
+
+    @staticmethod
+    def _stamp(watched):
+        """Get the versions of the watched dictionaries, or None if any of them does not keep a version."""
+        stamp = tuple(getattr(metadata, "_version", None) for metadata in watched)
+        return None if None in stamp else stamp
+
+    def _count(self, row, step):
+        """Add or remove the keys of a row from the key counts."""
+        for k in row:
+            count = self.key_counts.get(k, 0) + step
+            if count:
+                self.key_counts[k] = count
+            else:
+                self.key_counts.pop(k, None)
+
+    def stale(self):
+        """Return the indices of the members whose watched dictionaries have changed since they were read."""
+        return [
+            ix
+            for ix, (watched, stamp) in enumerate(zip(self.watched, self.stamps))
+            if stamp is None or self._stamp(watched) != stamp
+        ]
+
+    def update(self, ix, metadata, watched):
+        """Replace the snapshot of a single member.
+
+        Args:
+            ix (int):
+                The index of the member in the folder.
+            metadata (dict):
+                The member's current metadata.
+            watched (tuple of dict):
+                The dictionaries to watch for changes to the member's metadata.
+
+        Returns:
+            (_MetadataTable):
+                The updated table.
+        """
+        old = self.rows[ix]
+        row = {k: metadata[k] for k in metadata.keys()}
+        self._count(old, -1)
+        self._count(row, 1)
+        self.watched[ix], self.stamps[ix], self.rows[ix] = watched, self._stamp(watched), row
+        for k in set(old) | set(row):
+            self.columns.pop(k, None)
+        return self
+
+    @property
+    def common_keys(self):
+        """Return the sorted keys that are present in every member."""
+        return sorted(k for k, count in self.key_counts.items() if count == len(self.rows))
+
+    @property
+    def all_keys(self):
+        """Return the sorted keys that are present in any member."""
+        return sorted(self.key_counts)
+
+    def column(self, key):
+        """Return the values and presence mask of a single key.
+
+        Args:
+            key (str):
+                The metadata key to look up.
+
+        Returns:
+            (list, array of bool):
+                The value of the key for each member (None where missing) and which members had the key.
+        """
+        if key in self.columns:
+            return self.columns[key]
+        present = np.array([key in row for row in self.rows], dtype=bool)
+        values = [row.get(key, None) for row in self.rows]
+        if all(isinstance(v, _IMMUTABLE) for v in values):  # Mutable values can change without a version bump
+            self.columns[key] = (values, present)
+        return values, present
+
+    def records(self, keys):
+        """Return a list of the dictionaries of *keys* for each member, with list values expanded."""
+        results = []
+        for row in self.rows:
+            record = {k: row[k] for k in keys if k in row}
+            for k in keys:
+                if k in record and isLikeList(record[k]) and len(record[k]) > 0:
+                    v = record.pop(k)
+                    record.update({f"{k}[{i}]": vi for i, vi in enumerate(v)})
+            results.append(record)
+        return results
+
+    def frame_columns(self, keys):
+        """Build a column for each of *keys*, with list valued keys expanded into one column per element.
+
+        Args:
+            keys (list of str):
+                The metadata keys to build columns for.
+
+        Returns:
+            (_MetadataColumns):
+                Ordered columns - the scalar valued keys first and then the elements of the list valued keys.
+        """
+        ret = _MetadataColumns()
+        expanded = []
+        for k in dict.fromkeys(keys):
+            values, present = self.column(k)
+            is_list = np.array([p and isLikeList(v) and len(v) > 0 for v, p in zip(values, present)], dtype=bool)
+            if not is_list.any():
+                ret.add(k, values, present)
+                continue
+            scalar = present & ~is_list
+            if scalar.any():
+                ret.add(k, values, scalar)
+            width = max(len(v) for v, p in zip(values, is_list) if p)
+            for i in range(width):
+                sub_present = np.array([p and len(v) > i for v, p in zip(values, is_list)], dtype=bool)
+                sub_values = [v[i] if p else None for v, p in zip(values, sub_present)]
+                expanded.append((f"{k}[{i}]", sub_values, sub_present))
+        for name, values, present in expanded:
+            ret.add(name, values, present)
+        return ret
+
+
 def _slice_keys(args, possible=None):
     """Work through the arguments to slice() and construct a list of keys."""
     keys = []
@@ -115,6 +334,37 @@ class MetadataProxy(MutableMapping):
         """Note our parent folder object."""
         self._folder = folder
 
+    def _watched(self, ix, item):
+        """Return the dictionaries that the metadata of *item*, the member at index *ix*, is built from.
+
+        Folders like stacks keep each member's metadata in their own ``_metadata`` dictionary (and possibly some
+        ``_common_metadata`` as well) and build a new metadata dictionary every time a member is read, so it is those
+        dictionaries that have to be watched for changes.
+        """
+        if hasattr(self._folder, "_metadata"):  # Extra logic for Folders like Stack
+            watched = (self._folder._metadata[self._folder.__names__()[ix]],)
+            common = getattr(self._folder, "_common_metadata", None)
+            return watched if common is None else watched + (common,)
+        return (item.metadata,)
+
+    @property
+    def _table(self):
+        """Return the folder's cached table of metadata, updated for any changes to the members since it was made.
+
+        The folder discards the table when members are added, replaced or removed, so only the members whose
+        metadata has changed since the table was made have to be read again.
+        """
+        table = self._folder.__dict__.get("_metadata_table", None)
+        if table is None:
+            members = [(item.metadata, self._watched(ix, item)) for ix, item in enumerate(self._folder)]
+            table = _MetadataTable(members)
+            self._folder.__dict__["_metadata_table"] = table  # Stored last as loading members may reset it
+            return table
+        for ix in table.stale():
+            item = self._folder[ix]
+            table.update(ix, item.metadata, self._watched(ix, item))
+        return table
+
     @property
     def all(self):
         """List all the metadata dictionaries in the Folder."""
@@ -152,21 +402,20 @@ class MetadataProxy(MutableMapping):
     @property
     def common_keys(self):
         """Return the set of metadata keys common to all objects int he Folder."""
-        if len(self._folder) > 0:
-            keys = set(self._folder[0].metadata.keys())
-            for d in self._folder:
-                keys &= set(d.metadata.keys())
-        else:
-            keys = set()
-        return sorted(list(keys))
+        return self._table.common_keys
 
     @property
     def common_metadata(self):
         """Return a dictionary of the common_keys that have common values."""
         output = typeHintedDict()
-        for key in self.common_keys:
-            vals = self.slice(key, output="list")
-            if np.all(vals == vals[0]):
+        table = self._table
+        for key in table.common_keys:
+            vals, _ = table.column(key)
+            try:
+                same = all(np.all(np.asarray(v == vals[0])) for v in vals[1:])
+            except (TypeError, ValueError):  # Mismatched shapes or incomparable types
+                same = False
+            if same:
                 output[key] = vals[0]
         return output
 
@@ -235,13 +484,7 @@ class MetadataProxy(MutableMapping):
 
     def all_keys(self):
         """Return the union of all the metadata keyus for all objects int he Folder."""
-        if len(self._folder) > 0:
-            keys = set(self._folder[0].metadata.keys())
-            for d in self._folder:
-                keys |= set(d.metadata.keys())
-        else:
-            keys = set()
-        for k in sorted(keys):
+        for k in self._table.all_keys:
             yield k
 
     def all_items(self):
@@ -313,6 +556,10 @@ class MetadataProxy(MutableMapping):
                 depending on *values_only* or (output* returns the sliced dictionaries or tuples/
                 values of the items
 
+        Notes:
+            The metadata of the members is read into a table that is cached on the folder and only updated for the
+            members that have changed, so repeated slicing is cheap. The "array", "data" and "frame" outputs are
+            built directly from typed columns of this table.
         """
         values_only = kwargs.pop("values_only", False)
         output = kwargs.pop("output", None)
@@ -338,17 +585,9 @@ class MetadataProxy(MutableMapping):
         if output not in outputs:  # Check for good output value
             raise TypeError(f"output of slice metadata must be either dict, list, or array not {output}")
         formatter = outputs[output]
-        possible = list(self.all_keys()) if mask_missing else self.common_keys
+        table = self._table
+        possible = table.all_keys if mask_missing else table.common_keys
         keys = _slice_keys(args, possible)
-        results = []
-        for d in self._folder:
-            results.append({k: d[k] for k in keys if k in d})
-
-        for r in results:  # Expand the results where a result contains a list
-            for k in keys:
-                if k in r and isLikeList(r[k]) and len(r[k]) > 0:
-                    v = r[k]
-                    del r[k]
-                    r.update({f"{k}[{i}]": vi for i, vi in enumerate(v)})
-
-        return formatter(results)
+        if formatter in (_fmt_as_dataframe, _fmt_as_Data, _fmt_as_array):
+            return formatter(table.frame_columns(keys))
+        return formatter(table.records(keys))
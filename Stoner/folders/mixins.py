@@ -10,17 +10,24 @@ import os.path as path
 from functools import partial
 from copy import deepcopy
 from importlib import import_module
+from warnings import warn
 
-from numpy import mean, std, array, append, any as np_any, floor, sqrt, ceil
+from numpy import mean, std, array, append, asarray, any as np_any, floor, sqrt, ceil
+from numpy import arange, count_nonzero, diag, full, gradient, hstack, interp, isfinite, linspace, ones, unique
+from numpy import array_equal, column_stack, zeros
+from numpy.linalg import norm, pinv
 from numpy.ma import masked_invalid
+from scipy.sparse import coo_matrix, identity
+from scipy.sparse.linalg import spsolve
 from matplotlib.pyplot import figure, Figure, subplot, tight_layout
 
 from Stoner.tools import isIterable, make_Data
 from ..compat import string_types, get_filedialog, _pattern_type, makedirs, path_types
 from ..core.base import metadataObject, string_to_type
 from ..core.exceptions import StonerUnrecognisedFormat
+from ..analysis.utils import crossings
 from .core import baseFolder, __add_core__ as _base__add_core__, __sub_core__ as _base__sub_core__
-from .utils import scan_dir, discard_earlier, filter_files, get_pool, removeDisallowedFilenameChars
+from .utils import scan_dir, discard_earlier, filter_files, get_pool, removeDisallowedFilenameChars, _ColumnBuilder
 from ..core.exceptions import assertion
 
 
@@ -50,10 +57,10 @@ def __sub_core__(result, other):
     return _base__sub_core__(result, other)
 
 
-def _loader(name, loader=None, typ=None, directory=None):
+def _loader(name, loader=None, typ=None, directory=None, extra_args=None):
     """Lods and returns an object."""
     filename = name if path.exists(name) else path.join(directory, name)
-    return typ(loader(filename)), name
+    return typ(loader(filename, **(extra_args if extra_args else {}))), name
 
 
 class DiskBasedFolderMixin:
@@ -65,6 +72,9 @@ class DiskBasedFolderMixin:
             the type ob object to sotre in the folder (defaults to :py:class:`Stoner.Core.Data`)
         extra_args (dict):
             Extra arguments to use when instantiatoing the contents of the folder from a file on disk.
+        columns, rows:
+            If given when the folder is created, these are added to *extra_args* so that only these columns and rows
+            of each file are loaded - see :py:meth:`Stoner.Core.DataFile.load`.
         pattern (str or regexp):
             A filename globbing pattern that matches the contents of the folder. If a regular expression is provided
             then any named groups are used to construct additional metadata entryies from the filename. Default
@@ -121,6 +131,7 @@ class DiskBasedFolderMixin:
             self._default_store.pop("type")
         flat = kargs.pop("flat", self._default_store.get("flat", False))
         prefetch = kargs.pop("prefetch", self._default_store.get("prefetch", False))
+        selection = {key: kargs.pop(key) for key in ("columns", "rows") if kargs.get(key, None) is not None}
         if "type" in kargs and isinstance(kargs["type"], str):
             if "." in kargs["type"]:
                 mod = ".".join(kargs["type"].split(".")[:-1])
@@ -134,6 +145,8 @@ class DiskBasedFolderMixin:
         if "type" in kargs and "pattern" not in kargs:
             kargs["pattern"] = kargs["type"]._patterns
         super().__init__(*args, **kargs)  # initialise before __clone__ is called in getlist
+        if selection:
+            self.extra_args = {**self.extra_args, **selection}
         if self.readlist and len(args) > 0 and isinstance(args[0], path_types):
             self.getlist(directory=args[0])
         if len(args) > 0 and isinstance(args[0], bool) and not args[0]:
@@ -210,9 +223,10 @@ class DiskBasedFolderMixin:
 
     def __lookup__(self, name):
         """Addional logic for the looking up names."""
-        if isinstance(name, string_types):
-            if list(self.basenames).count(name) == 1:
-                return self.__names__()[list(self.basenames).index(name)]
+        if isinstance(name, string_types) and not self.objects.has_key(name):  # Exact keys need no basename search
+            basenames = list(self.basenames)
+            if basenames.count(name) == 1:
+                return self.__names__()[basenames.index(name)]
 
         return super().__lookup__(name)
 
@@ -327,7 +341,8 @@ class DiskBasedFolderMixin:
         """
         p, imap = get_pool()
         for (f, name) in imap(
-            partial(_loader, loader=self.loader, typ=self._type, directory=self.directory), self.not_loaded
+            partial(_loader, loader=self.loader, typ=self._type, directory=self.directory, extra_args=self.extra_args),
+            self.not_loaded,
         ):
             self.__setter__(
                 name, self.on_load_process(f)
@@ -470,6 +485,34 @@ class DataMethodsMixin:
 
     """Methods for wokring with :py:class:`Stner.Data` in py:class:`Stoner.DataFolder`s."""
 
+    def _stack_columns(self, xcol, ycol):
+        """Stack the y columns of all the files into a single data set if they all have the same x data.
+
+        Args:
+            xcol, ycol (index or None):
+                The x and y columns in each file, if None then the setas attribute of each file is used.
+
+        Returns:
+            (tuple of Data, list of AttributeStore):
+                A data set with the common x data followed by the y column from each file and the columns found
+                in each file. If the files don't all have the same x data, then (None, None) is returned.
+        """
+        if len(self) < 2 or (isIterable(ycol) and not isinstance(ycol, string_types)):
+            return None, None
+        cols, stack = [], []
+        for d in self:
+            _ = d._col_args(xcol=xcol, ycol=ycol)
+            if _.ycol is None:
+                return None, None
+            x = arange(len(d)) if _.get("xcol") is None else d.column(_.xcol)
+            if stack and not array_equal(x, stack[0]):
+                return None, None
+            if not stack:
+                stack.append(x)
+            stack.append(d.column(_.ycol))
+            cols.append(_)
+        return make_Data(column_stack(stack)), cols
+
     def concatenate(self, sort=None, reverse=False):
         """Concatentates all the files in a objectFolder into a single metadataObject like object.
 
@@ -526,14 +569,13 @@ class DataMethodsMixin:
 
         def _extractor(group, trail, metadata):
 
-            results = group.type()
-            results.metadata = group[0].metadata
+            results = _ColumnBuilder(group.type, group[0].metadata)
             headers = []
 
             ok_data = list()
             for m in metadata:  # Sanity check the metadata to include
                 try:
-                    test = results[m]
+                    test = results.metadata[m]
                     if not isIterable(test) or isinstance(test, string_types):
                         test = array([test])
                     else:
@@ -548,8 +590,8 @@ class DataMethodsMixin:
                 row = array([])
                 for m in ok_data:
                     row = append(row, array(d[m]))
-                results += row
-            results.column_headers = headers
+                results.add_row(row)
+            results.headers = headers
 
             return results
 
@@ -591,8 +633,7 @@ class DataMethodsMixin:
 
             common_x = kargs.pop("common_x", True)
 
-            results = group.type()
-            results.metadata = group[0].metadata
+            results = _ColumnBuilder(group.type, group[0].metadata)
             xbase = group[0].column(xcol)
             xtitle = group[0].column_headers[xcol]
             results.add_column(xbase, header=xtitle, setas="x")
@@ -604,14 +645,15 @@ class DataMethodsMixin:
                 if lookup:
                     cols = f._col_args(scalar=False)
                     xcol = cols["xcol"]
-                xdata = f.column(xcol)
+                fdata = asarray(f.data)  # Index the plain array - column indices are already resolved
+                xdata = fdata[:, xcol]
                 if np_any(xdata != xbase) and not common_x:
                     xtitle = group[0].column_headers[xcol]
                     results.add_column(xbase, header=xtitle, setas="x")
                     xbase = xdata
                     if cols["has_xerr"]:
                         xerr = cols["xerr"]
-                        xerrdata = f.column(xerr)
+                        xerrdata = fdata[:, xerr]
                         xerr_title = f"Error in {xtitle}"
                         results.add_column(xerrdata, header=xerr_title, setas="d")
                 for col, has_err, ecol, setcol, setecol in zip(
@@ -623,12 +665,12 @@ class DataMethodsMixin:
                 ):
                     if len(cols[col]) == 0:
                         continue
-                    data = f.column(cols[col])
+                    data = fdata[:, cols[col]]
                     for i in range(len(cols[col])):
                         title = f"{path.basename(f.filename)}:{f.column_headers[cols[col][i]]}"
                         results.add_column(data[:, i], header=title, setas=setcol)
                     if has_err != "" and cols[has_err]:
-                        err_data = f.column(cols[ecol])
+                        err_data = fdata[:, cols[ecol]]
                         for i in range(len(cols[ecol])):
                             title = f"{path.basename(f.filename)}:{f.column_headers[cols[ecol][i]]}"
                             results.add_column(err_data[:, i], header=title, setas=setecol)
@@ -636,6 +678,224 @@ class DataMethodsMixin:
 
         return self.walk_groups(_gatherer, group=True, replace_terminal=True, walker_args={"xcol": xcol, "ycol": ycol})
 
+    def peaks(self, **kargs):
+        """Locate the peaks and/or troughs in each file in the folder.
+
+        Keyword Arguments:
+            xcol, ycol (index or None):
+                The x and y columns in each file. If left as None then the setas attribute of each file is used.
+
+            All the other keyword arguments are the same as for :py:meth:`Stoner.Data.peaks`.
+
+        Returns:
+            (list):
+                The result of :py:meth:`Stoner.Data.peaks` for each file in the folder.
+
+        If all the files have the same x data, then their y columns are stacked into a single array and the peaks in
+        all of them are found in one pass, which is much faster than working through the files one at a time.
+        Otherwise, or if *modify* is set, each file is processed in turn.
+        """
+        xcol, ycol = kargs.pop("xcol", None), kargs.pop("ycol", None)
+        full_data = kargs.pop("full_data", True)
+        stack, cols = (None, None) if kargs.get("modify", False) else self._stack_columns(xcol, ycol)
+        if stack is None:
+            return [d.peaks(xcol=xcol, ycol=ycol, full_data=full_data, **kargs) for d in self]
+        positions = stack.peaks(xcol=0, ycol=list(range(1, stack.shape[1])), full_data=False, **kargs)
+        return [d._peaks_result(xdat, _.get("xcol"), False, full_data) for d, _, xdat in zip(self, cols, positions)]
+
+    def stitch(self, xcol=None, ycol=None, mode="All", reference=0, points=None):
+        r"""Stitch a chain of overlapping data sets together by fitting all the stitching parameters at once.
+
+        Keyword Arguments:
+            xcol,ycol (index or None):
+                The x and y data columns. If left as None then the setas attribute of each file is used.
+            mode (str):
+                Controls which parameters are actually variable, defaults to all of them. The modes are the same as
+                for :py:meth:`Stoner.Data.stitch`.
+            reference (int):
+                The index of the data set that is left unchanged and that the others are stitched on to.
+            points (int or None):
+                The number of points in the common grid used for each overlap. If None then the larger of the
+                number of points of the two data sets within the overlap is used.
+
+        Returns:
+            (:py:class:`DataFolder`):
+                The current folder with the x and y columns of each data set adjusted to stitch together.
+
+        Each data set in the folder, taken in the folder's order, must overlap in x with the next one. The x and y
+        data of each data set are transformed as :math:`x'=x+A_i` and :math:`y'=B_iy+C_i` and the :math:`A_i,B_i,C_i`
+        of all the data sets are found together as a single sparse least-squares problem that minimises the
+        differences between neighbouring data sets in their overlaps. The data in each overlap are interpolated
+        onto a common grid, so the data sets do not need to have matching points.
+
+        The fitted coefficients and their errors are stored in the metadata of each data set in the same keys and
+        with the same free parameters for the mode as :py:meth:`Stoner.Data.stitch`, with the overlap with the
+        previous data set (or the next data set for the first one). A warning is issued if the fit does not converge.
+        """
+        modes = {
+            "all": "ABC",
+            "scale y and shift x": "AB",
+            "scale and shift y": "BC",
+            "scale y": "B",
+            "shift y": "C",
+            "shift x": "A",
+            "shift both": "AC",
+        }
+        assertion(isinstance(mode, string_types), "mode keyword should be a string")
+        mode = mode.lower()
+        assertion(mode in modes, f"mode keyword should be one of {list(modes.keys())}")
+        assertion(len(self) > 1, "Need at least two data sets to stitch together")
+
+        segments = []
+        for d in self:
+            cols = d._col_args(xcol=xcol, ycol=ycol, scalar=True)
+            data = asarray(d.data)
+            x, ix = unique(data[:, cols.xcol], return_index=True)  # Sorted, distinct x for interpolation
+            y = data[ix, cols.ycol]
+            segments.append((cols.xcol, cols.ycol, x, y, gradient(y, x) if len(x) > 1 else zeros(1)))
+        num = len(segments)
+        reference = range(num)[reference]
+
+        # Map each data set's A,B,C to an index in the parameter vector, or -1 if it is fixed.
+        index = full((num, 3), -1, dtype=int)
+        free = ["ABC".index(c) for c in modes[mode]]
+        nparams = 0
+        for i in range(num):
+            if i != reference:
+                index[i, free] = arange(nparams, nparams + len(free))
+                nparams += len(free)
+        fixed = index < 0
+
+        grids = []
+        for i in range(num - 1):
+            x1, x2 = segments[i][2], segments[i + 1][2]
+            lower, upper = max(x1[0], x2[0]), min(x1[-1], x2[-1])
+            if upper <= lower:
+                raise ValueError(f"Data sets {i} and {i+1} do not overlap in x.")
+            npts = points
+            if npts is None:
+                npts = max(
+                    count_nonzero((x1 >= lower) & (x1 <= upper)), count_nonzero((x2 >= lower) & (x2 <= upper)), 2
+                )
+            grids.append(linspace(lower, upper, npts))
+
+        def _coeffs(p):
+            """Return the (num,3) array of A,B,C for parameter vector p."""
+            coeffs = zeros((num, 3))
+            coeffs[:, 1] = 1.0
+            coeffs[~fixed] = p[index[~fixed]]
+            return coeffs
+
+        def _transform(i, coeffs, grid):
+            """Return y', dy'/dB, dy'/dA for data set i on the grid and where the grid is inside the data."""
+            A, B, C = coeffs[i]
+            _, _, x, y, slope = segments[i]
+            xi = grid - A
+            yi = interp(xi, x, y)
+            return B * yi + C, yi, -B * interp(xi, x, slope), (xi >= x[0]) & (xi <= x[-1])
+
+        def _valid(i, coeffs, grid):
+            """Weights that drop the grid points that have been shifted outside either data set."""
+            return (_transform(i, coeffs, grid)[3] & _transform(i + 1, coeffs, grid)[3]).astype(float)
+
+        def _residuals(p):
+            """Differences between neighbouring data sets in each overlap."""
+            coeffs = _coeffs(p)
+            return hstack(
+                [
+                    (_transform(i, coeffs, grid)[0] - _transform(i + 1, coeffs, grid)[0]) * _valid(i, coeffs, grid)
+                    for i, grid in enumerate(grids)
+                ]
+            )
+
+        def _jacobian(p):
+            """Sparse Jacobian - each overlap only depends on the parameters of its two data sets."""
+            coeffs = _coeffs(p)
+            rows, cols, vals = [], [], []
+            offset = 0
+            for i, grid in enumerate(grids):
+                m = len(grid)
+                weight = _valid(i, coeffs, grid)
+                for j, sign in ((i, 1.0), (i + 1, -1.0)):
+                    _, d_b, d_a, _ = _transform(j, coeffs, grid)
+                    for param, deriv in zip(index[j], (d_a, d_b, ones(m))):
+                        if param >= 0:
+                            rows.append(arange(offset, offset + m))
+                            cols.append(full(m, param))
+                            vals.append(sign * deriv * weight)
+                offset += m
+            return coo_matrix((hstack(vals), (hstack(rows), hstack(cols))), shape=(offset, nparams)).tocsr()
+
+        # Damped Gauss-Newton on the sparse normal equations - exact in one step if x is not being shifted.
+        p = zeros(nparams)
+        p[index[:, 1][index[:, 1] >= 0]] = 1.0
+        for _ in range(50):
+            jac = _jacobian(p)
+            normal = (jac.T @ jac).tocsc()
+            normal += identity(nparams, format="csc") * (1e-12 * abs(normal.diagonal()).max())
+            step = spsolve(normal, -(jac.T @ _residuals(p)))
+            if not isfinite(step).all():
+                raise RuntimeError("Stitching failed - the overlaps do not constrain the stitching parameters.")
+            p += step
+            if norm(step) <= 1e-10 * (1e-10 + norm(p)):
+                break
+        else:
+            warn(f"Stitching did not converge after 50 iterations - the last step was {norm(step):.3g}.")
+        jac = _jacobian(p)
+        res = _residuals(p)
+        dof = max(jac.shape[0] - nparams, 1)
+        perr = sqrt(abs(diag(pinv((jac.T @ jac).toarray())))) * sqrt((res**2).sum() / dof)
+        coeffs = _coeffs(p)
+        errors = zeros((num, 3))
+        errors[~fixed] = perr[index[~fixed]]
+
+        for i, d in enumerate(self):
+            xc, yc = segments[i][:2]
+            A, B, C = coeffs[i]
+            data = asarray(d.data)
+            data[:, xc], data[:, yc] = data[:, xc] + A, data[:, yc] * B + C
+            grid = grids[max(i - 1, 0)]
+            d["Stitching Coefficients"] = list(coeffs[i, free])
+            d["Stitching Coeffient Errors"] = list(errors[i, free])
+            d["Stitching overlap"] = (grid[0], grid[-1])
+            d["Stitching Window"] = len(grid)
+        return self
+
+    def threshold(self, threshold, **kargs):
+        """Find partial indices where the data in each file passes the threshold, rising or falling.
+
+        Args:
+            threshold (float or list of floats):
+                Value to look for in each file.
+
+        Keyword Arguments:
+            col, xcol (index or None):
+                The y and x columns in each file. If left as None then the setas attribute of each file is used.
+
+            All the other keyword arguments are the same as for :py:meth:`Stoner.Data.threshold`.
+
+        Returns:
+            (list):
+                The result of :py:meth:`Stoner.Data.threshold` for each file in the folder.
+
+        If all the files have the same x data and *threshold* is a single value, then the y columns of the files are
+        stacked into a single array and all the crossings are found in one pass. Otherwise each file is processed in
+        turn.
+        """
+        xcol, col = kargs.pop("xcol", None), kargs.pop("col", None)
+        stack, cols = (None, None) if isIterable(threshold) else self._stack_columns(xcol, col)
+        if stack is None:
+            return [d.threshold(threshold, col=col, xcol=xcol, **kargs) for d in self]
+        rising = kargs.pop("rising", True)
+        falling = kargs.pop("falling", False)
+        all_vals = kargs.pop("all_vals", False)
+        found, roots = crossings(threshold, asarray(stack.data)[:, 1:], rising=rising, falling=falling)
+        ret = []
+        for ix, (d, _) in enumerate(zip(self, cols)):
+            dxcol = _.xcol if xcol is None and _.has_xcol else xcol
+            ret.append(d._threshold_result(roots[found == ix], dxcol, all_vals))
+        return ret
+
 
 class PlotMethodsMixin:
 
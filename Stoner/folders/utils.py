@@ -16,7 +16,7 @@ import fnmatch
 import pathlib
 from multiprocessing.pool import ThreadPool
 
-from numpy import array
+from numpy import array, asarray, atleast_1d, result_type, zeros
 import multiprocess as multiprocessing
 
 from Stoner.compat import string_types, _pattern_type
@@ -139,3 +139,66 @@ def removeDisallowedFilenameChars(filename):
     """
     validFilenameChars = "-_.() %s%s" % (string.ascii_letters, string.digits)
     return "".join([c for c in filename if c in validFilenameChars])
+
+
+class _ColumnBuilder:
+
+    """Collect the columns or rows of a new metadataObject and assemble them with a single allocation.
+
+    Adding columns one at a time to a :py:class:`Stoner.Data` object copies all of the existing data each time, so
+    gathering many files is quadratic in the size of the result. This builder instead keeps a list of the columns (or
+    rows) with their headers and setas values and only allocates the data array in :py:meth:`build`.
+
+    Args:
+        cls (type):
+            The metadataObject class to build.
+
+    Keyword Arguments:
+        metadata (dict or None):
+            Metadata to give the new object.
+
+    Notes:
+        Like :py:meth:`Stoner.Data.add_column`, columns of different lengths are padded with zeros to the length of
+        the longest column. Columns and rows should not be mixed in the same builder.
+    """
+
+    def __init__(self, cls, metadata=None):
+        """Start with no columns or rows."""
+        self.cls = cls
+        self.metadata = metadata
+        self.columns = []
+        self.rows = []
+        self.headers = []
+        self.setas = []
+
+    def add_column(self, data, header=None, setas="."):
+        """Queue a column of data to add."""
+        self.columns.append(asarray(data).ravel())
+        self.headers.append(f"Column {len(self.headers)}" if header is None else header)
+        self.setas.append(setas)
+        return self
+
+    def add_row(self, row):
+        """Queue a row of data to add."""
+        self.rows.append(atleast_1d(asarray(row)))
+        return self
+
+    def build(self):
+        """Allocate the data and return the new metadataObject."""
+        ret = self.cls()
+        if self.metadata is not None:
+            ret.metadata = self.metadata
+        if self.rows:
+            ret.data = array(self.rows)
+        elif self.columns:
+            data = zeros((max(len(c) for c in self.columns), len(self.columns)), dtype=result_type(*self.columns))
+            for ix, column in enumerate(self.columns):
+                data[: len(column), ix] = column
+            ret.data = data
+        else:
+            return ret
+        if self.headers:
+            ret.column_headers = list(self.headers)
+        if self.setas:
+            ret.setas = "".join(self.setas)
+        return ret
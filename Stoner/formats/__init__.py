@@ -17,5 +17,75 @@ Classes may also provide :py:attr:`Stoner.Core.DataFile.patterns` atribute which
 provide a :py:attr:`Stoner.Core.DataFile.mime_type` attribute which gives a list of mime types that this class might
 be able to open. This helps identify classes that could be use to load particular file types.
 """
-__all__ = ["instruments", "generic", "rigs", "facilities", "simulations", "attocube"]
-from . import instruments, generic, rigs, facilities, simulations, attocube
+__all__ = ["instruments", "generic", "rigs", "facilities", "simulations", "attocube", "registry", "load_formats"]
+from importlib import import_module
+
+#: Static registry of the file format classes supplied with the package and the modules that define them. The
+#: format modules are only imported when a format is needed rather than when the package is imported.
+registry = {
+    "CSVFile": "Stoner.formats.generic",
+    "JustNumbersFile": "Stoner.formats.generic",
+    "KermitPNGFile": "Stoner.formats.generic",
+    "TDMSFile": "Stoner.formats.generic",
+    "HyperSpyFile": "Stoner.formats.generic",
+    "LSTemperatureFile": "Stoner.formats.instruments",
+    "QDFile": "Stoner.formats.instruments",
+    "RigakuFile": "Stoner.formats.instruments",
+    "SPCFile": "Stoner.formats.instruments",
+    "VSMFile": "Stoner.formats.instruments",
+    "XRDFile": "Stoner.formats.instruments",
+    "BigBlueFile": "Stoner.formats.rigs",
+    "BirgeIVFile": "Stoner.formats.rigs",
+    "MokeFile": "Stoner.formats.rigs",
+    "FmokeFile": "Stoner.formats.rigs",
+    "EasyPlotFile": "Stoner.formats.rigs",
+    "PinkLibFile": "Stoner.formats.rigs",
+    "BNLFile": "Stoner.formats.facilities",
+    "MDAASCIIFile": "Stoner.formats.facilities",
+    "OpenGDAFile": "Stoner.formats.facilities",
+    "RasorFile": "Stoner.formats.facilities",
+    "SNSFile": "Stoner.formats.facilities",
+    "GenXFile": "Stoner.formats.simulations",
+    "OVFFile": "Stoner.formats.simulations",
+    "AttocubeScan": "Stoner.formats.attocube",
+    "HDF5File": "Stoner.HDF5",
+    "HGXFile": "Stoner.HDF5",
+    "SLS_STXMFile": "Stoner.HDF5",
+    "STXMImage": "Stoner.HDF5",
+    "ZippedFile": "Stoner.Zip",
+}
+
+
+def load_formats(*names):
+    """Import the modules that define file format classes so that they are available for loading files.
+
+    Args:
+        *names (str):
+            The names of the format classes to make available. If no names are given then all of the format
+            modules in the :py:data:`registry` are imported.
+
+    Returns:
+        (list of types):
+            The format classes that were asked for (or all of the registered format classes) that could be
+            imported.
+
+    Notes:
+        Names that are not in the registry are ignored - they may be user defined classes that have been imported
+        directly.
+    """
+    names = names if names else tuple(registry)
+    ret = []
+    for name in names:
+        if name not in registry:
+            continue
+        module = import_module(registry[name])
+        if getattr(module, name, None) is not None:  # Formats with missing optional dependencies may not exist
+            ret.append(getattr(module, name))
+    return ret
+
+
+def __getattr__(name):
+    """Import the format modules on first access."""
+    if name in __all__:
+        return import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
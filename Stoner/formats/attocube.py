@@ -8,8 +8,8 @@ from glob import glob
 import re
 import importlib
 
-from numpy import genfromtxt, linspace, meshgrid, array, product
-from scipy.interpolate import griddata
+import numpy as np
+from numpy import genfromtxt, linspace, meshgrid, array, product, stack
 from scipy.optimize import curve_fit
 import h5py
 
@@ -17,7 +17,9 @@ from Stoner.compat import string_types, bytes2str
 from Stoner.core.base import typeHintedDict
 from Stoner.core.exceptions import StonerLoadError
 from Stoner.Image import ImageStack, ImageFile, ImageArray
+from Stoner.Image.util import fit_surface
 from Stoner.HDF5 import confirm_hdf5, close_file
+from Stoner.analysis.utils import regrid
 
 PARAM_RE = re.compile(r"^([\d\\.eE\+\-]+)\s*([\%A-Za-z]\S*)?$")
 SCAN_NO = re.compile(r"SC_(\d+)")
@@ -329,10 +331,16 @@ class AttocubeScanMixin:
             in_place (bool):
                 If True then replace the existing datasets with the regridded data, otherwise create a new copy
                 of the scan object. Default is False.
+            method (str):
+                The interpolation method - "cubic" (default), "linear" or "nearest".
 
         Returns:
             (AttocubeScan):
                 Scan object with regridded data. May be the same as the source object if in_place is True.
+
+        Notes:
+            All the channels are regridded together with :py:func:`Stoner.analysis.utils.regrid`, so the PosX and
+            PosY positions are only triangulated once.
         """
         if not kargs.get("in_place", False):
             new = self.clone
@@ -346,52 +354,73 @@ class AttocubeScanMixin:
 
         xrange = kargs.pop("x_range", (x[:, 0].max(), x[:, -1].min(), x.shape[1]))
         yrange = kargs.pop("y_range", (y[0].max(), y[-1].min(), y.shape[0]))
+        method = kargs.pop("method", "cubic")
         nX, nY = meshgrid(linspace(*xrange), linspace(*yrange))
-        for data in self.channels:
-            if "PosX" in data or "PosY" in data:
-                continue
-            z = self[data]
-            nZ = griddata((x.ravel(), y.ravel()), z.ravel(), (nX.ravel(), nY.ravel()), method="cubic").reshape(
-                nX.shape
-            )
-            new[data].data = nZ
+        channels = [data for data in self.channels if not ("PosX" in data or "PosY" in data)]
+        if channels:
+            values = stack([self[data].ravel() for data in channels], axis=-1)
+            nZ = regrid((x.ravel(), y.ravel()), values, (nX, nY), method=method)
+            for ix, data in enumerate(channels):
+                new[data].data = nZ[..., ix]
         new["PosX"].data = nX
         new["PosY"].data = nY
 
         return new
 
-    def level_image(self, method="plane", signal="Amp"):
+    def level_image(self, method="plane", signal="Amp", box=None):
         """Remove a background signla by fitting an appropriate function.
 
         Keyword Arguments:
             method (str or callable):
                 Eirther the name of a fitting function in the global scope, or a callable. *plane* and *parabola*
                 are already defined.
-            signal (str):
-                The name of the dataset to be flattened. Defaults to the Amplitude signal
+            signal (str, list of str or None):
+                The name of the dataset to be flattened, a list of names or None for all the images except the
+                PosX and PosY positions. Defaults to the Amplitude signal
+            box (tuple of 4 ints or None):
+                (xmin, xmax, ymin, ymax) region to fit the *plane* or *parabola* backgrounds to - None for the whole
+                image.
 
         Returns:
             (AttocubeScan):
                 The current scan object with the data modified.
+
+        Notes:
+            The *plane* and *parabola* backgrounds are linear in their coefficients once the parabola is expanded, so
+            they are fitted with :py:func:`Stoner.Image.util.fit_surface`. The least-squares basis is factorised once
+            for each image shape and all the channels of the same shape are levelled with a single matrix product.
+            Masked pixels are left out of the fit. Other fitting functions are passed to
+            :py:func:`scipy.optimize.curve_fit` for each channel in turn.
         """
+        if signal is None:
+            signals = [data for data in self.__names__() if not ("PosX" in data or "PosY" in data)]
+        elif isinstance(signal, string_types):
+            signals = [signal]
+        else:
+            signals = list(signal)
+        if method in ("plane", "parabola"):
+            by_shape = {}
+            for name in signals:
+                by_shape.setdefault(self[name].shape, []).append(name)
+            for names in by_shape.values():
+                frames = np.ma.stack([self[name].image for name in names])
+                background = fit_surface(frames, terms=method, box=box)[0]
+                for name, surface in zip(names, background):
+                    self[name].data = np.ma.getdata(self[name].image) - surface
+            return self
         if isinstance(method, string_types):
             method = globals()[method]
         if not callable(method):
             raise ValueError("Could not get a callable method to flatten the data")
-        data = self[signal]
-        ys, xs = data.shape
-        X, Y = meshgrid(linspace(-1, 1, xs), linspace(-1, 1, ys))
-        Z = data.data
-        X = X.ravel()
-        Y = Y.ravel()
-        Z = Z.ravel()
-
-        popt = curve_fit(method, (X, Y), Z)[0]
-
-        nZ = method((X, Y), *popt)
-        Z -= nZ
-
-        data.data = Z.reshape(xs, ys)
+        for name in signals:
+            data = self[name]
+            ys, xs = data.shape
+            X, Y = meshgrid(linspace(-1, 1, xs), linspace(-1, 1, ys))
+            X = X.ravel()
+            Y = Y.ravel()
+            Z = np.ma.getdata(data.image).ravel()
+            popt = curve_fit(method, (X, Y), Z)[0]
+            data.data = (Z - method((X, Y), *popt)).reshape(ys, xs)
         return self
 
     def to_HDF5(self, filename=None):
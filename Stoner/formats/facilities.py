@@ -11,8 +11,8 @@ import re
 import numpy as np
 
 import Stoner.Core as Core
-from Stoner.compat import str2bytes
 from Stoner.core.base import string_to_type
+from Stoner.tools.file import read_delimited
 
 
 class BNLFile(Core.DataFile):
@@ -134,8 +134,15 @@ class MDAASCIIFile(Core.DataFile):
     priority = 16
     patterns = ["*.txt"]  # Recognised filename patterns
 
-    def _load(self, filename=None, *args, **kargs):
-        """Load function. File format has space delimited columns from row 3 onwards."""
+    def _load(self, filename=None, *args, columns=None, rows=None, **kargs):
+        """Load function. File format has space delimited columns from row 3 onwards.
+
+        Keyword Arguments:
+            columns (index types or None):
+                If given, only read these columns of the file.
+            rows (int, slice, sequence of int or None):
+                If given, only read these rows of data.
+        """
         if filename is None or not filename:
             self.get_filename("r")
         else:
@@ -208,8 +215,11 @@ class MDAASCIIFile(Core.DataFile):
                     column_headers.append(colname)
             else:
                 raise Core.StonerLoadError("Overand the end of file without reading data")
-        self.data = np.genfromtxt(self.filename, skip_header=sum(i))  # so that's ok then !
-        self.column_headers = column_headers
+        usecols = self._load_columns(column_headers, columns)
+        self.data = read_delimited(
+            self.filename, delimiter=None, skip_header=sum(i), usecols=usecols, rows=rows
+        )  # so that's ok then !
+        self.column_headers = column_headers if usecols is None else [column_headers[ix] for ix in usecols]
         return self
 
 
@@ -220,13 +230,17 @@ class OpenGDAFile(Core.DataFile):
     priority = 16  # Makes a positive ID of it's file type so give priority
     patterns = ["*.dat"]  # Recognised filename patterns
 
-    def _load(self, filename=None, *args, **kargs):
+    def _load(self, filename=None, *args, columns=None, rows=None, **kargs):
         """Load an OpenGDA file.
 
         Args:
             filename (string or bool): File to load. If None then the existing filename is used,
                 if False, then a file dialog will be used.
 
+        Keyword Arguments:
+            columns (index types or None): If given, only read these columns of the file.
+            rows (int, slice, sequence of int or None): If given, only read these rows of data.
+
         Returns:
             A copy of the itself after loading the data.
         """
@@ -249,8 +263,11 @@ class OpenGDAFile(Core.DataFile):
                 value = parts[1].strip()
                 self.metadata[key] = string_to_type(value)
             column_headers = f.readline().strip().split("\t")
-            self.data = np.genfromtxt([str2bytes(l) for l in f], dtype="float", invalid_raise=False)
-        self.column_headers = column_headers
+        usecols = self._load_columns(column_headers, columns)
+        self.data = read_delimited(
+            self.filename, delimiter=None, skip_header=i + 2, usecols=usecols, rows=rows, invalid_raise=False
+        )
+        self.column_headers = column_headers if usecols is None else [column_headers[ix] for ix in usecols]
         return self
 
 
@@ -15,6 +15,7 @@ import numpy as np
 from ..Core import DataFile
 from ..compat import str2bytes, Hyperspy_ok, hs
 from ..core.exceptions import StonerLoadError
+from ..tools.file import read_delimited
 
 
 class CSVFile(DataFile):
@@ -34,7 +35,7 @@ class CSVFile(DataFile):
 
     mime_type = ["application/csv", "text/plain"]
 
-    def _load(self, filename, *args, **kargs):
+    def _load(self, filename, *args, columns=None, rows=None, **kargs):
         """Load generic deliminated files.
 
         Args:
@@ -47,6 +48,8 @@ class CSVFile(DataFile):
             data_line (int): The line on which the data starts
             data_delim (string): Thge delimiter used for separating data values
             header_delim (strong): The delimiter used for separating header values
+            columns (index types or None): If given, only read these columns of the file.
+            rows (int, slice, sequence of int or None): If given, only read these rows of data.
 
         Returns:
             A copy of the current object after loading the data.
@@ -63,6 +66,7 @@ class CSVFile(DataFile):
             self.get_filename("r")
         else:
             self.filename = filename
+        usecols = None
         if header_line is not None:
             try:
                 header_string = linecache.getline(self.filename, header_line + 1)
@@ -72,6 +76,13 @@ class CSVFile(DataFile):
                 linecache.clearcache()
                 raise StonerLoadError("No Delimiters in header line") from err
             column_headers = [x.strip() for x in header_string.split(header_delim)]
+            try:
+                usecols = self._load_columns(column_headers, columns)
+            except (KeyError, IndexError) as err:
+                linecache.clearcache()
+                raise StonerLoadError(f"Unable to find the columns {columns} in the header line") from err
+            if usecols is not None:
+                column_headers = [column_headers[ix] for ix in usecols]
         else:
             column_headers = ["Column" + str(x) for x in range(np.shape(self.data)[1])]
             try:
@@ -88,8 +99,12 @@ class CSVFile(DataFile):
                 linecache.clearcache()
                 raise StonerLoadError("No delimiters in data lines")
 
-        self.data = np.genfromtxt(self.filename, dtype="float", delimiter=data_delim, skip_header=data_line)
+        self.data = read_delimited(
+            self.filename, delimiter=data_delim, skip_header=data_line, usecols=usecols, rows=rows
+        )
         self.column_headers = column_headers
+        if usecols is None:  # No column headers to select from before reading the data
+            self._select(columns=columns)
         linecache.clearcache()
         self._kargs = kargs
         return self
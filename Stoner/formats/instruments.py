@@ -16,6 +16,7 @@ import Stoner.Core as Core
 from Stoner.compat import str2bytes, bytes2str
 from Stoner.core.exceptions import StonerAssertionError, assertion, StonerLoadError
 from Stoner.core.base import string_to_type
+from Stoner.tools.file import read_delimited
 
 
 class LSTemperatureFile(Core.DataFile):
@@ -160,13 +161,19 @@ class QDFile(Core.DataFile):
 
     mime_type = ["application/x-wine-extension-ini", "text/plain"]
 
-    def _load(self, filename=None, *args, **kargs):
+    def _load(self, filename=None, *args, columns=None, rows=None, **kargs):
         """QD system file loader routine.
 
         Args:
             filename (string or bool):
                 File to load. If None then the existing filename is used, if False, then a file dialog will be used.
 
+        Keyword Arguments:
+            columns (index types or None):
+                If given, only read these columns of the file.
+            rows (int, slice, sequence of int or None):
+                If given, only read these rows of data.
+
         Returns:
             A copy of the itself after loading the data.
         """
@@ -222,19 +229,27 @@ class QDFile(Core.DataFile):
                 raise Core.StonerLoadError("Not a Quantum Design File !")
 
             column_headers = f.readline().strip().split(",")
-            data = np.genfromtxt([str2bytes(l) for l in f], dtype="float", delimiter=",", invalid_raise=False)
-            if data.shape[0] == 0:
-                raise Core.StonerLoadError("No data in file!")
-            if data.shape[1] < len(column_headers):  # Trap for buggy QD software not giving ewnough columns of data
-                data = np.append(data, np.ones((data.shape[0], len(column_headers) - data.shape[1])) * np.NaN, axis=1)
-            elif data.shape[1] > len(column_headers):  # too much data
-                data = data[:, : len(column_headers) - data.shape[1]]
-            self.data = data
+        usecols = self._load_columns(column_headers, columns)
+        data = read_delimited(
+            self.filename, delimiter=",", skip_header=i + 2, usecols=usecols, rows=rows, invalid_raise=False
+        )
+        if data.ndim < 2 or data.shape[0] == 0:
+            raise Core.StonerLoadError("No data in file!")
+        if usecols is not None:
+            column_headers = [column_headers[ix] for ix in usecols]
+        elif data.shape[1] < len(column_headers):  # Trap for buggy QD software not giving ewnough columns of data
+            data = np.append(data, np.ones((data.shape[0], len(column_headers) - data.shape[1])) * np.NaN, axis=1)
+        elif data.shape[1] > len(column_headers):  # too much data
+            data = data[:, : len(column_headers) - data.shape[1]]
+        self.data = data
         self.column_headers = column_headers
         s = self.setas
         for k in setas:
             for ix in setas[k]:
-                s[ix - 1] = k
+                if usecols is None:
+                    s[ix - 1] = k
+                elif ix - 1 in usecols:
+                    s[usecols.index(ix - 1)] = k
         self.setas = s
         return self
 
@@ -711,18 +726,10 @@ class VSMFile(Core.DataFile):
                         break
         except (StonerAssertionError, ValueError, AssertionError, TypeError) as err:
             raise Core.StonerLoadError(f"Not a VSM File {err}") from err
-        self.data = np.genfromtxt(
-            self.filename,
-            dtype="float",
-            usemask=True,
-            skip_header=data_line - 1,
-            missing_values=["6:0", "---"],
-            invalid_raise=False,
+        data = read_delimited(
+            self.filename, delimiter=None, skip_header=data_line + 1, missing=["6:0", "---"], invalid_raise=False
         )
-
-        self.data = np.ma.mask_rows(self.data)
-        cols = self.data.shape[1]
-        self.data = np.reshape(self.data.compressed(), (-1, cols))
+        self.data = data[~np.isnan(data[:, :2]).any(axis=1)]  # Drop rows with a missing time or field
         self.column_headers = column_headers
         self.setas(x="H_vsm (T)", y="m (emu)")  # pylint: disable=not-callable
 
@@ -28,13 +28,17 @@ class BigBlueFile(CSVFile):
     # the file load/save dialog boxes.
     patterns = ["*.dat", "*.iv", "*.rvt"]  # Recognised filename patterns
 
-    def _load(self, filename, *args, **kargs):
+    def _load(self, filename, *args, columns=None, rows=None, **kargs):
         """Just call the parent class but with the right parameters set.
 
         Args:
             filename (string or bool): File to load. If None then the existing filename is used,
                 if False, then a file dialog will be used.
 
+        Keyword Arguments:
+            columns (index types or None): If given, only read these columns of the file.
+            rows (int, slice, sequence of int or None): If given, only read these rows of data.
+
         Returns:
             A copy of the itself after loading the data.
         """
@@ -43,7 +47,16 @@ class BigBlueFile(CSVFile):
         else:
             self.filename = filename
 
-        super()._load(self.filename, *args, header_line=3, data_line=7, data_delim=" ", header_delim=",")
+        super()._load(
+            self.filename,
+            *args,
+            header_line=3,
+            data_line=7,
+            data_delim=" ",
+            header_delim=",",
+            columns=columns,
+            rows=rows,
+        )
         if np.all(np.isnan(self.data)):
             raise Core.StonerLoadError("All data was NaN in Big Blue format")
         return self
@@ -14,7 +14,6 @@ from functools import wraps
 import copy
 
 import numpy as np
-from scipy.interpolate import griddata
 
 from matplotlib import pyplot as plt
 from matplotlib import figure as mplfig
@@ -22,6 +21,7 @@ from matplotlib import cm, colors
 
 from Stoner.compat import string_types, index_types, int_types, getargspec
 from Stoner.tools import AttributeStore, isNone, isAnyNone, all_type, isIterable, typedList, get_option, fix_signature
+from Stoner.analysis.utils import regrid
 from .formats import DefaultPlotStyle
 from .utils import errorfill
 from .utils import hsl2rgb
@@ -841,6 +841,9 @@ class PlotMixin:
         Notes:
             Depending on whether 3 or 4 columns of data can be identified, this method will produce data for a
             :math:`Z(X,Y)` plot or a :math:`M(X,Y,Z)` volumetric plot.
+
+            If *zcol* (or *ucol*) is 2D data with several columns, they are all interpolated together with
+            :py:func:`Stoner.analysis.utils.regrid`, which only triangulates the points once.
         """
         startx = kargs.pop("startx", 0)
         cols = self.setas._get_cols(startx=startx)
@@ -890,12 +893,7 @@ class PlotMixin:
                 zdata = zcol
             else:
                 zdata = self.column(zcol)
-            if len(zdata.shape) == 1:
-                Z = griddata(points, zdata, pts, method=method)
-            elif len(zdata.shape) == 2:
-                Z = np.zeros((pts.shape[0], pts.shape[1], zdata.shape[1]))
-                for i in range(zdata.shape[1]):
-                    Z[:, :, i] = griddata(points, zdata[:, i], pts, method=method)
+            Z = regrid(points, zdata, pts, method=method)
 
             return pts[:, :, 0], pts[:, :, 1], Z
         elif dims == 3:
@@ -909,12 +907,7 @@ class PlotMixin:
                 udata = ucol
             else:
                 udata = self.column(ucol)
-            if len(udata.shape) == 1:
-                U = griddata(points, udata, pts, method=method)
-            elif len(udata.shape) == 2:
-                U = np.zeros((pts.shape[0], pts.shape[1], udata.shape[1]))
-                for i in range(udata.shape[1]):
-                    U[:, :, i] = griddata(points, udata[:, i], pts, method=method)
+            U = regrid(points, udata, pts, method=method)
 
             return vpts[:, :, :, 0], vpts[:, :, :, 1], vpts[:, :, :, 2], U
 
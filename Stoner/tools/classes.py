@@ -20,6 +20,7 @@ _options = {
 }
 
 _subclasses: Optional[Dict] = None  # Cache for DataFile Subclasses
+_formats_loaded: bool = False  # Whether the file format modules have been imported yet
 
 
 class attributeStore(dict):
@@ -87,8 +88,18 @@ def itersubclasses(cls: type, _seen: Optional[set] = None) -> List[type]:
 
 
 def subclasses(cls: Optional[type] = None) -> Dict:  # pylint: disable=no-self-argument
-    """Return a list of all in memory subclasses of this DataFile."""
-    global _subclasses  # pylint: disable=global-statement
+    """Return a list of all in memory subclasses of this DataFile.
+
+    Notes:
+        The first call imports the file format modules listed in :py:data:`Stoner.formats.registry` so that the
+        format classes are in memory without having to import them all when the package is imported.
+    """
+    global _subclasses, _formats_loaded  # pylint: disable=global-statement
+    if not _formats_loaded:
+        _formats_loaded = True
+        from ..formats import load_formats  # pylint: disable=import-outside-toplevel
+
+        load_formats()
     if cls is None:
         from ..Core import DataFile  # pylint: disable=import-outside-toplevel
 
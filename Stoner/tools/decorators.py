@@ -24,6 +24,115 @@ except ImportError:
 _RTD = "READTHEDOCS" in environ
 
 
+class _LazyMethod:
+
+    """A placeholder for a method that is only wrapped by its adaptor when it is first accessed.
+
+    :py:func:`class_modifier` binds several hundred functions to the image classes. Rather than generating all the
+    wrapper functions (and their signatures) when the class is defined, each name in the class' dispatch table
+    holds one of these descriptors. On first access the wrapper is made and replaces the descriptor in the class
+    __dict__ so that subsequent look ups are just normal method look ups.
+
+    Args:
+        func (callable):
+            The function that is being bound as a method.
+        adaptor (callable):
+            The factory function that makes the method from *func*.
+        owner (type):
+            The class that the method is being added to.
+        names (list of str):
+            The names in *owner* that refer to this method.
+        src_mod (str):
+            The module that *func* came from.
+    """
+
+    def __init__(self, func, adaptor, owner, names, src_mod=None):
+        """Store the details to build the method later."""
+        self.func = func
+        self.adaptor = adaptor
+        self.owner = owner
+        self.names = list(names)
+        self.src_mod = src_mod
+        self.__doc__ = getattr(func, "__doc__", None)
+
+    def build(self):
+        """Make the wrapped method and store it in the owner class' dispatch table."""
+        proxy = self.adaptor(self.func)
+        if self.src_mod is not None:
+            setattr(proxy, "_src_mod", self.src_mod)
+        for name in self.names:
+            if self.owner.__dict__.get(name, None) is self:  # Don't replace something that has been overwritten.
+                setattr(self.owner, name, proxy)
+        return proxy
+
+    def __get__(self, instance, owner=None):
+        """Build the method and then bind it."""
+        return self.build().__get__(instance, owner)
+
+
+def _adopt_image(obj, result, image=None):
+    """Make *result* the image of ImageFile *obj* without copying the data if possible.
+
+    Args:
+        obj (ImageFile):
+            The ImageFile to store the new image in.
+        result (ImageArray):
+            The new image data, which should be the same shape as the current image.
+
+    Keyword Arguments:
+        image (ImageArray):
+            The image that was passed to the function that made *result*, if *result* shares memory with this (or
+            with the current image of *obj*) then it is copied, otherwise it is used directly.
+
+    Notes:
+        Images that are part of an :py:class:`Stoner.Image.ImageStack` must have their data copied back into the
+        stack's memory, which the :py:attr:`Stoner.Image.ImageFile.image` setter does.
+    """
+    metadata = copy(result.metadata)
+    if getattr(obj, "_fromstack", False) or any(
+        np.shares_memory(result, im) for im in (image, obj.image) if im is not None
+    ):
+        obj.image = obj.image.clone.astype(result.dtype)  # Ensure we're replacing out own image
+        obj.image[...] = result[...]
+    else:
+        obj.image = result
+    obj.metadata.update(metadata)
+    return obj
+
+
+def _store_out(out, result, source):
+    """Copy *result* into *out* for the in-place (_out) mode of the ImageArray methods.
+
+    Args:
+        out (ndarray or True):
+            The array to store the result in, or True to store the result in *source*.
+        result (ndarray):
+            The result of the function call.
+        source (ImageArray):
+            The ImageArray that the method was called on.
+
+    Returns:
+        (ndarray):
+            *out* with the data from *result*.
+
+    Raises:
+        ValueError:
+            If the result is not the same shape as *out*.
+    """
+    if isinstance(out, bool):
+        out = source
+    if getattr(out, "image", None) is not None and not isinstance(out, np.ndarray):  # ImageFile
+        out = out.image
+    if out.shape != result.shape:
+        raise ValueError(f"Cannot store a result of shape {result.shape} in an output of shape {out.shape}.")
+    if np.shares_memory(out, result) and out is not result:
+        result = result.copy()
+    out[...] = result
+    if hasattr(out, "metadata") and hasattr(result, "metadata") and out.metadata is not result.metadata:
+        out.metadata.update(result.metadata)
+    return out
+
+
 def image_file_adaptor(workingfunc):
     """Make wrappers for ImageFile functions.
 
@@ -79,10 +188,7 @@ def image_file_adaptor(workingfunc):
                 return self
             r = r.view(type(im))
             if r.shape == self.shape:
-                self.image = self.image.clone.astype(r.dtype)  # Ensure we're replacing out own image
-                self.image[...] = r[...]
-                self.metadata.update(r.metadata)
-                return self
+                return _adopt_image(self, r, im)
             ret = self.clone if not force else self
             ret.image = r.view(type(im))
             metadata = copy(self.metadata)
@@ -150,10 +256,7 @@ def image_file_raw_adaptor(workingfunc):
                 return ret
             r = r.view(type(im))
             if r.shape == ret.shape:
-                ret.image = ret.image.astype(r.dtype)
-                ret.image[...] = r[...]
-                ret.metadata.update(r.metadata)
-                return ret
+                return _adopt_image(ret, r, im)
             ret = self.clone if not force else self
             ret.image = r.view(type(im))
             metadata = copy(ret.metadata)
@@ -235,12 +338,16 @@ def image_array_adaptor(workingfunc):
     This method also updates the name and documentation strings for the wrapper to match the wrapped function -
     thus ensuring that Spyder's help window can generate useful information.
 
+    The wrapped methods take an additional keyword argument *_out* which can be True to write an ImageArray result
+    back into this ImageArray's data, or an array to write the result into. This avoids keeping a new array for the
+    result of each step of a chain of operations.
     """
     # Avoid PEP257/black issue
 
     @wraps(workingfunc)
     def gen_func(self, *args, **kwargs):
         """Wrap magic proxy function call."""
+        out = kwargs.pop("_out", None)
         transpose = getattr(workingfunc, "transpose", False)
         if transpose:
             change = self.T
@@ -256,6 +363,8 @@ def image_array_adaptor(workingfunc):
         elif isinstance(r, np.ndarray):  # make sure we return a ImageArray
             if transpose:
                 r = r.T
+            if out is not None:
+                return _store_out(out, r, self)
             if isinstance(r, type(self)) and np.shares_memory(r, self):  # Assume everything was inplace
                 return r
             r = r.view(type(self))
@@ -281,7 +390,8 @@ def class_modifier(
     """Decorate  a class by addiding member functions from module.
 
     The purpose of this is to incorporate the functions within a module into being methods of the class being
-    defined here.
+    defined here. The methods are entered in the class as a dispatch table of placeholders and the actual wrapper
+    for each function is only made (and then cached in the class) the first time it is used.
 
     Args:
         cls (class):
@@ -325,13 +435,14 @@ def class_modifier(
                     if callable(func) and isinstance(fmod, str) and fmod[:5] in ["Stone", "scipy", "skima"]:
                         if transpose:
                             func.transpose = transpose
-                        name = f"{fmod}__{fname}".replace(".", "__")
-                        proxy = adaptor(func)
-                        setattr(proxy, "_src_mod", fmod)
-                        if not no_long_names:
-                            setattr(cls, name, proxy)
+                        names = [] if no_long_names else [f"{fmod}__{fname}".replace(".", "__")]
                         if overload or fname not in dir(proxy_class):
-                            setattr(cls, fname, proxy)
+                            names.append(fname)
+                        if not names:
+                            continue
+                        proxy = _LazyMethod(func, adaptor, cls, names, fmod)
+                        for name in names:
+                            setattr(cls, name, proxy)
         return cls
 
     return actual_decorator
@@ -366,6 +477,11 @@ def class_wrapper(
         for name in dir(target):
             if name.startswith("_"):
                 continue
+            attr = inspect.getattr_static(target, name, None)
+            if isinstance(attr, _LazyMethod):  # Chain the adaptors without building the target's method.
+                if name not in dir(cls):
+                    setattr(cls, name, _LazyMethod(attr, _chain_adaptor(adaptor), cls, [name], attr.src_mod))
+                continue
             attr = getattr(target, name)
             if callable(attr) and not isProperty(target, name) and name not in dir(cls):
                 proxy = adaptor(attr)
@@ -387,6 +503,15 @@ def class_wrapper(
     return actual_decorator
 
 
+def _chain_adaptor(adaptor):
+    """Make an adaptor that builds a :py:class:`_LazyMethod` and then applies *adaptor* to the result."""
+
+    def chained(lazy):
+        return adaptor(lazy.__get__(None, lazy.owner))
+
+    return chained
+
+
 def changes_size(func):
     """Mark a function as one that changes the size of the ImageArray."""
     func.changes_size = True
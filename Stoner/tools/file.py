@@ -1,26 +1,43 @@
 # -*- coding: utf-8 -*-
 """General fle related tools."""
 from importlib import import_module
+from inspect import signature
 import io
+import mmap
 import pathlib
+import re
 from traceback import format_exc
 from typing import Union, Sequence, Dict, Type, Tuple, Optional
 
+import numpy as np
+
 from ..compat import string_types
 from .widgets import fileDialog
 from .classes import subclasses
+from ..formats import load_formats
 from ..core.exceptions import StonerLoadError, StonerUnrecognisedFormat
 from ..core.base import regexpDict, metadataObject
 
 from ..core.Typing import Filename
 
-__all__ = ["file_dialog", "get_file_name_type", "auto_load_classes", "get_mime_type"]
+__all__ = [
+    "file_dialog",
+    "get_file_name_type",
+    "auto_load_classes",
+    "get_mime_type",
+    "load_selects",
+    "row_index",
+    "read_delimited",
+]
 
 try:
     from magic import Magic as filemagic, MAGIC_MIME_TYPE
 except ImportError:
     filemagic = None
 
+#: Size in bytes of the blocks of a file that :py:func:`read_delimited` parses at once.
+READ_CHUNK_SIZE = 1 << 22
+
 
 def file_dialog(
     mode: str, filename: Filename, filetype: Union[Type[metadataObject], str], baseclass: Type[metadataObject]
@@ -82,6 +99,10 @@ def get_file_name_type(
     """Rationalise a filename and filetype."""
     if isinstance(filename, string_types):
         filename = pathlib.Path(filename)
+    if isinstance(filetype, string_types):  # Only import the module we need
+        formats = load_formats(filetype)
+        if formats:
+            filetype = formats[0]
     if isinstance(filetype, string_types):  # We can specify filetype as part of name
         try:
             filetype = regexpDict(subclasses(parent))[filetype]  # pylint: disable=E1136
@@ -106,17 +127,52 @@ def get_file_name_type(
     return filename, filetype
 
 
+def load_selects(cls: Type[metadataObject]) -> bool:
+    """Check whether a class's *_load* method reads just the *columns* and *rows* that are asked for.
+
+    Args:
+        cls (subclass of metadataObject):
+            The class to check.
+
+    Returns:
+        (bool):
+            True if the *_load* method of *cls* takes *columns* and *rows* keyword arguments.
+
+    Notes:
+        Classes that don't take these arguments have the unwanted columns and rows dropped after they have loaded the
+        whole file.
+    """
+    try:
+        parameters = signature(cls._load).parameters
+    except (AttributeError, TypeError, ValueError):
+        return False
+    return "columns" in parameters and "rows" in parameters
+
+
+def row_index(rows: Union[int, slice, Sequence[int], None]) -> Union[slice, Sequence[int], None]:
+    """Turn a *rows* argument into an index that always keeps the data 2D."""
+    if isinstance(rows, int):
+        return slice(rows, rows + 1 or None)
+    return rows
+
+
 def auto_load_classes(
     filename: Filename,
     baseclass: Type[metadataObject],
     debug: bool = False,
     args: Optional[Tuple] = None,
     kargs: Optional[Dict] = None,
+    selection: Optional[Dict] = None,
 ) -> Type[metadataObject]:
-    """Work through subclasses of parent to find one that will load this file."""
+    """Work through subclasses of parent to find one that will load this file.
+
+    The *selection* keyword arguments (*columns* and *rows*) are only passed to the classes that accept them - see
+    :py:func:`load_selects`.
+    """
     mimetype = get_mime_type(filename, debug=debug)
     args = args if args is not None else ()
     kargs = kargs if kargs is not None else {}
+    selection = selection if selection is not None else {}
     for cls in subclasses(baseclass).values():  # pylint: disable=E1136, E1101
         if debug:
             print(cls.__name__)
@@ -129,7 +185,8 @@ def auto_load_classes(
             if debug and filemagic is not None:
                 print(f"Trying: {cls.__name__} =mimetype {test.mime_type}")
 
-            test = test._load(filename, auto_load=False, *args, **kargs)
+            extra = selection if load_selects(cls) else {}
+            test = test._load(filename, auto_load=False, *args, **kargs, **extra)
             if test is None:
                 raise SyntaxError(f"Class {cls.__name__}'s _load returned None !!")
             try:
@@ -170,3 +227,160 @@ def get_mime_type(filename: Union[pathlib.Path, str], debug: bool = False) -> Op
     else:
         mimetype = None
     return mimetype
+
+
+def _data_offset(buffer: Union[mmap.mmap, bytes], skip_header: int) -> int:
+    """Find the byte offset of the start of the line after skipping *skip_header* lines."""
+    pos = 0
+    for _ in range(skip_header):
+        pos = buffer.find(b"\n", pos) + 1
+        if pos == 0:
+            return len(buffer)
+    return pos
+
+
+def _chunks(buffer: Union[mmap.mmap, bytes], start: int, chunk_size: int):
+    """Yield blocks of about *chunk_size* bytes of buffer from start that end on a whole line."""
+    size = len(buffer)
+    while start < size:
+        end = min(start + chunk_size, size)
+        if end < size:
+            end = buffer.find(b"\n", end) + 1 or size
+        yield buffer[start:end]
+        start = end
+
+
+def _fill_empty(chunk: bytes, delimiter: bytes) -> bytes:
+    """Put nan into the empty fields of a block of delimited text."""
+    double = delimiter * 2
+    filled = delimiter + b"nan" + delimiter
+    chunk = chunk.replace(double, filled).replace(double, filled)  # Twice to catch runs of empty fields
+    for eol in (b"\r", b"\n"):
+        chunk = chunk.replace(eol + delimiter, eol + b"nan" + delimiter)
+        chunk = chunk.replace(delimiter + eol, delimiter + b"nan" + eol)
+    if chunk.startswith(delimiter):
+        chunk = b"nan" + chunk
+    if chunk.endswith(delimiter):
+        chunk += b"nan"
+    return chunk
+
+
+def _fast_parse(
+    buffer: Union[mmap.mmap, bytes],
+    start: int,
+    delimiter: Optional[str],
+    usecols: Optional[Sequence[int]],
+    comments: Optional[str],
+    missing: Sequence[str],
+    stop: Optional[int],
+    chunk_size: int,
+) -> Optional[np.ndarray]:
+    """Parse a block of purely numeric delimited text with numpy's loadtxt, returning None if it can't."""
+    edge = rb"\s" + (re.escape(delimiter.encode()) if delimiter else b"")
+    missing = [
+        (m.encode(), re.compile(rb"(?<![^%s])%s(?![^%s])" % (edge, re.escape(m.encode()), edge))) for m in missing
+    ]
+    fill = delimiter is not None and not delimiter.isspace()
+    blocks = []
+    read = 0
+    for chunk in _chunks(buffer, start, chunk_size):
+        if stop is not None and read >= stop:  # Already have all the rows we need
+            break
+        for marker, pattern in missing:
+            if marker in chunk:
+                chunk = pattern.sub(b"nan", chunk)
+        if fill:
+            chunk = _fill_empty(chunk, delimiter.encode())
+        try:
+            block = np.loadtxt(
+                io.BytesIO(chunk),
+                encoding="latin-1",
+                dtype=float,
+                delimiter=delimiter,
+                usecols=usecols,
+                comments=comments,
+                ndmin=2,
+            )
+        except ValueError:  # Ragged rows or something that isn't a number
+            return None
+        if blocks and block.shape[1] != blocks[0].shape[1]:
+            return None
+        if block.size:
+            blocks.append(block)
+            read += block.shape[0]
+    if not blocks:
+        return None
+    return np.concatenate(blocks) if len(blocks) > 1 else blocks[0]
+
+
+def read_delimited(
+    filename: Filename,
+    delimiter: Optional[str] = ",",
+    skip_header: int = 0,
+    usecols: Optional[Sequence[int]] = None,
+    comments: Optional[str] = "#",
+    missing: Sequence[str] = (),
+    invalid_raise: bool = True,
+    rows: Union[int, slice, Sequence[int], None] = None,
+    chunk_size: int = READ_CHUNK_SIZE,
+) -> np.ndarray:
+    """Read a block of numeric, delimited text data from a file.
+
+    Args:
+        filename (str, Path):
+            The file to read.
+
+    Keyword Arguments:
+        delimiter (str or None):
+            The separator between fields - None for any whitespace.
+        skip_header (int):
+            The number of lines at the start of the file to skip.
+        usecols (sequence of int or None):
+            If given, only parse these columns of the file.
+        comments (str or None):
+            Text that marks the start of a comment.
+        missing (sequence of str):
+            Values in the file that mark missing data and should be read as NaN.
+        invalid_raise (bool):
+            If False, skip rows with the wrong number of fields rather than raising a ValueError.
+        rows (int, slice, sequence of int or None):
+            If given, only return these rows of the data. With a slice, parsing stops once the last row is reached.
+        chunk_size (int):
+            The approximate size in bytes of the blocks of the file that are parsed in one go.
+
+    Returns:
+        (ndarray):
+            The data as a 2D array of floats, with empty fields read as NaN.
+
+    Notes:
+        The file is memory mapped and the data part is parsed in blocks of whole lines by :py:func:`numpy.loadtxt`
+        after filling any empty or missing fields with *nan*. If any block has rows of a different length or
+        something that is not a number, the whole of the data is read again with :py:func:`numpy.genfromtxt`
+        instead, which is slower but more forgiving.
+    """
+    with io.open(filename, "rb") as data:
+        try:
+            buffer = mmap.mmap(data.fileno(), 0, access=mmap.ACCESS_READ)
+        except (ValueError, OSError):  # Empty files and things that can't be mapped
+            buffer = data.read()
+        try:
+            rows = row_index(rows)
+            stop = rows.stop if isinstance(rows, slice) and rows.stop is not None and rows.stop >= 0 else None
+            start = _data_offset(buffer, skip_header)
+            ret = _fast_parse(buffer, start, delimiter, usecols, comments, missing, stop, chunk_size)
+            if ret is None:
+                ret = np.genfromtxt(
+                    io.BytesIO(buffer[start:]),
+                    dtype="float",
+                    delimiter=delimiter,
+                    usecols=usecols,
+                    comments=comments,
+                    missing_values=list(missing) if missing else None,
+                    invalid_raise=invalid_raise,
+                )
+        finally:
+            if isinstance(buffer, mmap.mmap):
+                buffer.close()
+    if rows is not None and ret.ndim == 2:
+        ret = ret[rows]
+    return ret
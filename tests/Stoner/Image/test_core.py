@@ -452,5 +452,83 @@ def test_operators():
     i=-i
     assert i.sum()==50*255,"Negate operators failed"
 
+def test_dispatch():
+    # Methods are only wrapped when first used and then cached in the class
+    assert "sobel" in dir(ImageArray),"Lazy method missing from dir()"
+    meth=ImageArray.sobel
+    assert ImageArray.__dict__["sobel"] is meth,"Lazy method not cached in the class"
+    assert meth.__doc__ is not None
+    # ImageFile adopts new results of the same shape without copying them
+    i=ImageFile(np.random.random((50,50)))
+    i.gaussian(1.0)
+    i2=i.clone
+    old=i2.image
+    i2.gaussian(1.0)
+    assert not shares_memory(old,i2.image),"Result was written into the original image"
+    assert not shares_memory(i.image,i2.image),"Clone shares memory after a method call"
+    # _out writes results back into an existing array
+    im=ImageArray(np.random.random((50,50)))
+    data=im.data
+    ret=im.gaussian(1.0,_out=True)
+    assert ret is im and shares_memory(data,im),"_out=True failed to work in place"
+    out=np.zeros((50,50))
+    ret=im.gaussian(1.0,_out=out)
+    assert ret is out and np.allclose(out,im.gaussian(1.0)),"_out=array failed"
+    with pytest.raises(ValueError):
+        im.gaussian(1.0,_out=np.zeros((5,5)))
+
+def test_wrapper_dispatch():
+    """The ImageFile method wrappers are only built once and then looked up as normal methods."""
+    from Stoner.tools.decorators import _LazyMethod
+    from Stoner.Image.imagefuncs import clip_neg
+    assert any(isinstance(v,_LazyMethod) for v in ImageFile.__dict__.values()),"Method wrappers were built up front"
+    i=ImageFile(np.random.normal(size=(32,32)))
+    expected=clip_neg(i.clone.image)
+    assert np.all(i.clone.clip_neg().image==expected),"Wrapped method gave the wrong answer"
+    method=ImageFile.__dict__["clip_neg"]
+    assert callable(method) and not isinstance(method,_LazyMethod),"Method wrapper not stored in the class after use"
+    i.clone.clip_neg()
+    assert ImageFile.__dict__["clip_neg"] is method,"Method wrapper was built again"
+
+def test_geometry_cache():
+    from Stoner.Image.util import GeometryCache, geometry_cache
+    im=ImageArray(np.random.random((40,30)))
+    geometry_cache.clear()
+    r=im.radial_coordinates(centre=(10,12))
+    assert geometry_cache.info().misses==1,"Radial grid not cached"
+    theta=im.radial_coordinates(centre=(10,12),angle=True)
+    assert geometry_cache.info().hits==1 and geometry_cache.hit_rate==0.5,"Cached radial grid not reused"
+    y,x=np.mgrid[:40,:30]
+    assert np.allclose(r,np.hypot(x-10,y-12)),"Radial distances wrong"
+    assert np.allclose(theta,np.angle(10-x+1j*(y-12))),"Radial angles wrong"
+    r[0,0]=-1
+    assert im.radial_coordinates(centre=(10,12))[0,0]>0,"Changing the returned co-ordinates changed the cache"
+    cache=GeometryCache(max_bytes=1000)
+    cache(1,lambda: np.zeros(100))
+    cache(2,lambda: np.zeros(100))
+    info=cache.info()
+    assert info.entries==1 and info.nbytes==800,"Geometry cache exceeded its size"
+    with pytest.raises(ValueError):
+        cache(2,lambda: np.zeros(100))[0]=1
+
+def test_fit_surface():
+    from Stoner.Image.util import fit_surface, polyfit_rows
+    y,x=np.meshgrid(np.linspace(-1,1,20),np.linspace(-1,1,30),indexing="ij")
+    frames=np.stack([0.5*x-0.2*y+1,2*x**2+y**2-x])
+    background,coeffs=fit_surface(frames,"parabola")
+    assert np.allclose(background,frames) and np.allclose(coeffs[1],[0,-1,0,2,1]),"Parabola background wrong"
+    masked=np.ma.MaskedArray(frames.copy(),mask=np.zeros(frames.shape,dtype=bool))
+    masked[:,:5,:5]=100
+    masked.mask[:,:5,:5]=True
+    assert np.allclose(fit_surface(masked,2)[0],frames),"Masked pixels not left out of the fit"
+    rows=np.random.random((4,25))
+    assert np.allclose(polyfit_rows(rows,3),[np.polyfit(np.arange(25),row,3) for row in rows]),"polyfit_rows wrong"
+
+def test_fft():
+    im=ImageArray(np.random.random((20,30)))
+    assert np.allclose(im.fft(phase=None,shift=False),np.fft.fft2(im)),"Complex fft wrong"
+    real=im.fft(phase=None,shift=False,real=True)
+    assert real.shape==(20,16) and np.allclose(real,np.fft.rfft2(im)),"Real to complex fft wrong"
+
 if __name__=="__main__": # Run some tests manually to allow debugging
     pytest.main(["--pdb",__file__])
@@ -3,7 +3,7 @@
 """
 
 from Stoner import Data
-from Stoner.Image import ImageArray, ImageFolder, ImageStack
+from Stoner.Image import ImageArray, ImageFile, ImageFolder, ImageStack
 import numpy as np
 import pytest
 from os import path
@@ -41,7 +41,63 @@ def test_methods():
     fldr.loadgroup()
     assert len(list(fldr.loaded))==8,"ImageFolder.looadgroup() failed to load!"
 
+def test_reductions():
+    fldr=ImageFolder(testdir, pattern="*.png")
+    av=fldr.average()
+    assert len(list(fldr.loaded))==1,"Streaming average kept images in memory"
+    stack=np.stack([np.asarray(im) for im in fldr.images])
+    weights=np.linspace(1,2,len(fldr))
+    assert np.allclose(av,stack.mean(axis=0)),"Streaming average incorrect"
+    assert np.allclose(fldr.average(weights=weights),np.average(stack,axis=0,weights=weights)),"Weighted average incorrect"
+    std=np.sqrt(((stack-stack.mean(axis=0))**2).sum(axis=0))/len(fldr)
+    assert np.allclose(fldr.stddev(),std),"Streaming stddev incorrect"
+    assert np.allclose(fldr.stderr(),std/np.sqrt(len(fldr))),"Streaming stderr incorrect"
+    mask=np.zeros(fldr.size,dtype=bool)
+    mask[10,10]=True
+    fldr[0].mask=mask
+    assert np.isclose(fldr.mean()[10,10],stack[1:,10,10].mean()),"Masked pixel included in mean"
+    with pytest.raises(ValueError):
+        fldr.average(weights=[1,2])
+
+
+def test_stack_delete_and_masks():
+    ist=ImageStack([ImageFile(np.ones((4,5))*ix) for ix in range(4)])
+    assert len(ist)==4,"Failed to make an ImageStack from a list of images"
+    del ist[-1]
+    assert [im.mean() for im in ist]==[0.0,1.0,2.0],"Deleting the last image with a negative index failed"
+    ist=ImageStack(np.random.random((3,4,5)))
+    for im in ist:
+        im.mean()
+    assert not ist._stack.mask.any(),"Stack mask set by reading the images"
+    ist[1].mask[2,2]=True
+    assert ist._stack.mask[2,2,1] and ist._stack.mask.sum()==1,"Setting a mask on a temporary image was lost"
+    frame=ist[2]
+    frame.mask[0,0]=True
+    assert ist._stack.mask[0,0,2],"Mask set on an image in use did not reach the stack"
+    frame.mask[0,1]=True
+    assert ist[2].mask[0,1],"Image not switched to using the stack mask"
+
+
+def test_stack_average():
+    data=np.random.random((5,4,6))
+    ist=ImageStack(data)
+    weights=np.linspace(1,2,5)
+    assert np.allclose(ist.average(weights=weights).image,np.average(data,axis=0,weights=weights)),"Weighted stack average wrong"
+    ist[0].mask[0,0]=True
+    assert np.isclose(ist.average().image[0,0],data[1:,0,0].mean()),"Masked pixel not left out of the stack average"
 
+def test_stack_mask_write_through():
+    ist=ImageStack(np.ones((3,4,5)))
+    assert ist._mask_buffer is None,"Stack mask allocated for an unmasked stack"
+    ist._stack.mask[1,1,0]=True
+    assert ist._mask_buffer[1,1,0],"Mask set on the stack was lost"
+    bg=np.ma.MaskedArray(np.ones((4,5))*0.5,mask=np.zeros((4,5),dtype=bool))
+    bg.mask[2,2]=True
+    ist._stack[:,:,1]-=bg
+    assert ist._stack.mask[2,2,1] and ist._stack.mask.sum()==2,"In place masked arithmetic lost the mask"
+    ist.subtract(ImageFile(bg))
+    assert ist[2].mask[2,2],"Subtracting a masked background lost the mask"
+    assert np.allclose(ist[0].data,0.0),"Subtracting a masked background gave the wrong result"
 
 if __name__=="__main__":
     pytest.main(["--pdb",__file__])
@@ -6,7 +6,8 @@ Created on Fri May 27 17:09:04 2016
 """
 
 from Stoner.Image import ImageArray, ImageFile
-from Stoner.Image.kerr import KerrArray, KerrImageFile,KerrStack
+from Stoner.Image.kerr import KerrArray, KerrImageFile,KerrStack,MaskStack
+from Stoner.Image import kerrfuncs
 from Stoner.Core import typeHintedDict
 from Stoner import Data,__home__
 import numpy as np
@@ -86,6 +87,43 @@ def test_tesseract_ocr():
     m_un=selfimage2.metadata
     assert 'ocr_field' not in m_un.keys(), 'Unannotated image has wrong metadata'
 
+def test_ocr_templates(monkeypatch):
+    im=KerrArray(os.path.join(testdir,"kermit3.png"),asfloat=False,crop_text=False)
+    field=kerrfuncs._binarise(np.asarray(im)[527:540,110:165])
+    templates=kerrfuncs._GlyphTemplates(agree=1)
+    assert templates.read(field) is None,"Read text without any templates"
+    assert not templates.learn(field,"-0.1"),"Learnt from text with the wrong number of characters"
+    assert templates.learn(field,"-0.13") and templates.read(field)=="-0.13","Failed to learn glyph templates"
+    # Made up glyphs and a fake tesseract that reads them from a table
+    rng=np.random.default_rng(5)
+    shapes={c:np.vstack([np.ones((1,4),bool),rng.random((6,4))>0.5]) for c in "12345"}
+    gap=np.zeros((7,1),bool)
+    box=lambda text:np.hstack([gap]+[p for c in text for p in (shapes[c],gap)]).astype(float)
+    reads={"12":"12","21":"21","3":"3","34":"84","1221":"1221","43":"43","5":""}
+    table={box(k).tobytes():v for k,v in reads.items()}
+    calls=[]
+    def fake_tesseract(kerr_im,tesseract):
+        calls.append(table[np.asarray(kerr_im).tobytes()])
+        return calls[-1]
+    monkeypatch.setattr(kerrfuncs,"_tesseract_text",fake_tesseract)
+    monkeypatch.setattr(kerrfuncs,"OCR_BATCH",2)
+    kerrfuncs._ocr_cache.clear()
+    try:
+        texts=kerrfuncs._recognise([box(k) for k in ("12","21","3","34","1221","43","5")],"tesseract")
+        assert texts==["12","21","3","84","1221","43",""],"Boxes read wrongly"
+        assert "1221" not in calls,"Box made of agreed characters was not read from the templates"
+        assert "43" in calls,"Glyph read as two different characters was used as a template"
+        calls.clear()
+        assert kerrfuncs._recognise([box("5"),box("12")],"tesseract")==["","12"] and calls==[""],"Empty read was cached"
+        ks=KerrStack(np.stack([np.asarray(im)]*4))
+        monkeypatch.setattr(kerrfuncs,"_tesseract_text",lambda kerr_im,tesseract:"-0.13")
+        monkeypatch.setattr("Stoner.Image.kerr._tesseractable",True)
+        monkeypatch.setattr("Stoner.Image.kerr.which",lambda name:"tesseract")
+        ks.ocr_metadata(field_only=True)
+        assert all(ks[i]["ocr_field"]==-0.13 for i in range(len(ks))),"KerrStack.ocr_metadata failed to read the field"
+    finally:
+        kerrfuncs._ocr_cache.clear()
+
 def test_kerrstack():
     print("X"*80+"\n"+"Test Kerrstack")
     ks=selfks.clone
@@ -95,5 +133,22 @@ def test_kerrstack():
     assert isinstance(d, Data), 'hysteresis didnt return Data'
     assert d.data.shape==(len(ks),2), 'hysteresis didnt return correct shape'
 
+def test_kerrstack_masks():
+    from skimage.restoration import denoise_tv_chambolle
+    ks=KerrStack(selfks.imarray[:3,:160,:200])
+    ks.asfloat()
+    masks=ks.denoise_thresh(denoise_weight=0.1,thresh=0.5)
+    denoised=np.stack([denoise_tv_chambolle(np.asarray(im),weight=0.1) for im in ks.imarray])
+    expected=(denoised>0.5) & (denoised<denoised.max())
+    assert isinstance(masks,MaskStack) and masks.imarray.dtype==bool,"denoise_thresh didn't make a MaskStack"
+    assert np.all(masks.imarray==expected),"denoise_thresh gave the wrong masks"
+    assert np.all(ks.denoise_thresh(invert=True).imarray==~expected),"denoise_thresh invert failed"
+    assert masks.__names__()==ks.__names__(),"Mask stack lost the image names"
+    tiled=ks.denoise_thresh(tile=64)
+    assert np.mean(tiled.imarray!=expected)<0.01,"Tiled denoising too different from whole images"
+    defects=ks.defect_mask(radius=4,workers=2)
+    for ix in range(len(ks)):
+        assert np.array_equal(defects.imarray[ix],np.asarray(ks[ix].image.defect_mask(radius=4))),"Stack defect_mask differs from images"
+
 if __name__=="__main__": # Run some tests manually to allow debugging
     pytest.main(["--pdb",__file__])
\ No newline at end of file
@@ -70,6 +70,14 @@ def test_ImageStack_align():
     assert data.shape==(16,4),"Slice metadata went a bit funny"
     assert sorted(data.column_headers)==['angle','scale','tvec[0]', 'tvec[1]'],"slice metadata column headers wrong at {}".format(data.column_headers)
 
+    istack2=selfistack2.clone
+    istack2.align(i,method="fft",upsample_factor=20)
+    data=istack2.metadata.slice(["tvec"],output="Data")
+    assert data.shape==(16,2),"Slice metadata went a bit funny with fft align"
+    assert np.allclose(np.sqrt((np.array(data)**2).sum(axis=1)),10.0,atol=0.2),"fft align found the wrong shifts"
+    assert "translation_limits" in istack2.metadata,"fft align didn't set the translation_limits"
+    assert np.abs(istack2.stddev().image[20:80,20:80]).mean()<0.05,"fft align didn't align the stack"
+
 @pytest.mark.filterwarnings("ignore:.*:UserWarning")
 def test_ImageStack_methods():
 
@@ -236,6 +244,50 @@ def test_mask():
     assert istack2[0].mask[0,0],"Mask not set correctly in stack"
     assert not istack2[0].mask[20,20],"Mask not set correctly in stack"
 
+@pytest.mark.parametrize("backing_store",[None,True])
+def test_backing_store(backing_store):
+    ist=ImageStack(backing_store=backing_store)
+    for ix in range(20):
+        ist.append(ImageFile(np.ones((10,12))*ix))
+    assert len(ist)==20 and ist.shape==(20,10,12),"Appending to ImageStack failed"
+    assert ist._buffer.shape[2]>=20,"Stack buffer did not grow"
+    if backing_store:
+        assert isinstance(ist._buffer,np.memmap),"Backing store was not used"
+    assert ist._mask_buffer is None or not ist._mask_buffer.any(),"Mask allocated when no mask was set"
+    del ist[5]
+    ist.insert(0,ImageFile(np.ones((10,12))*-1))
+    assert [int(im.mean()) for im in ist][:7]==[-1,0,1,2,3,4,6],"Insert/delete order wrong"
+    ist[2].mask[3,3]=True
+    assert ist._stack.mask[3,3,2],"Frame mask did not reach the stack"
+    assert np.all(ist.clone._stack==ist._stack),"Clone of a backed stack differs"
+
+def test_level_image():
+    y,x=np.mgrid[:20,:30]
+    arr=np.random.random((3,20,30))*0.1+0.01*x+0.001*y**2
+    ist=ImageStack(arr.copy())
+    ist[1].mask[5:8,3:9]=True
+    ist.level_image(poly_vert=2,poly_horiz=1,box=(2,25,1,18),mode=None)
+    for ix in range(3):
+        im=ImageFile(arr[ix].copy())
+        im.mask=ist[ix].mask
+        im=im.level_image(poly_vert=2,poly_horiz=1,box=(2,25,1,18),mode=None)
+        assert np.allclose(ist[ix].image[~im.mask],im.image[~im.mask]),"Stack level_image differs from ImageFile"
+        assert np.allclose(ist[ix]["poly_sub"][1],im["poly_sub"][1]),"Stack level_image polynomial wrong"
+
+def test_fft():
+    arr=np.random.random((5,20,30))
+    ist=ImageStack(arr.copy())
+    spectra=ist.fft(window="hann",remove_dc=True,chunk_size=2)
+    assert isinstance(spectra,ImageStack) and spectra.shape==(5,20,30),"Stack fft returned the wrong thing"
+    for ix in range(5):
+        im=ImageFile(arr[ix].copy())
+        im.fft(window="hann",remove_dc=True)
+        assert np.allclose(spectra[ix].image,im.image),"Stack fft differs from ImageFile.fft"
+    power=ist.power_spectrum(real=True,chunk_size=3)
+    expected=np.mean([np.abs(np.fft.fftshift(np.fft.rfft2(frame),axes=0))**2 for frame in arr],axis=0)
+    assert power.shape==(20,16) and np.allclose(power.image,expected),"Average power spectrum wrong"
+    assert power["frames"]==5
+
 if __name__=="__main__":
     pytest.main(["--pdb", __file__])
 
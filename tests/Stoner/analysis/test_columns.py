@@ -12,9 +12,11 @@ import unittest
 import sys
 import os.path as path
 import numpy as np
+import tempfile
 
 
 from Stoner import Data
+from Stoner.analysis.columns import _memmap_base
 
 class ColumnOps_test(unittest.TestCase):
 
@@ -98,6 +100,31 @@ class ColumnOps_test(unittest.TestCase):
         self.assertAlmostEqual(self.data.std(1), 6.0553007081949835,msg="Simple Standard Deviation failed")
         self.assertAlmostEqual(self.data.std(1,2), 2.7067331877422456,msg="Simple Standard Deviation failed")
 
+    def test_chunked(self):
+        self.data.setas="x..ye"
+        for meth,args in [("min",(1,)),("max",()),("span",(1,)),("mean",(1,)),("std",(1,)),("std",(1,2))]:
+            self.assertTrue(np.allclose(getattr(self.data,meth)(*args),getattr(self.data,meth)(*args,chunk=3)),
+                            f"Chunked {meth} gave a different result")
+        self.assertTrue(np.allclose(self.data.mean(1,sigma=2,chunk=4),self.data.mean(1,sigma=2)),"Chunked mean with sigma failed")
+        whole=self.data.clone.diffsum((1,2),(3,4))
+        chunked=self.data.clone.diffsum((1,2),(3,4),chunk=3)
+        self.assertTrue(np.allclose(whole.data,chunked.data) and whole.column_headers==chunked.column_headers,"Chunked diffsum failed")
+        with tempfile.TemporaryDirectory() as tmpdir:
+            filename=path.join(tmpdir,"data.npy")
+            np.save(filename,self.data.data.view(np.ndarray))
+            mapped=Data(np.load(filename,mmap_mode="r+"),column_headers=list(self.data.column_headers),setas="x..ye")
+            self.assertEqual(len(mapped._chunks(4)),3,"Memory mapped data not split into chunks")
+            mapped.add(1,3,header="Add",index=1,chunk=4)
+            self.assertIsNotNone(_memmap_base(mapped.data),"New column was not added on disc")
+            self.assertTrue(np.all(mapped//"Add"==self.data//1+self.data//3) and mapped.setas.to_string()=="x...ye","Add to memory mapped data failed")
+            store=_memmap_base(mapped.data)
+            mapped.subtract("Signal 1",2.0,header="Sub",index=0,chunk=4)
+            self.assertIs(_memmap_base(mapped.data),store,"Second new column did not use the spare columns on disc")
+            self.assertIs(mapped.data._mask,np.ma.nomask,"Mask built for memory mapped data with nothing masked")
+            self.assertTrue(np.all(mapped//"Sub"==self.data//1-2.0) and np.all(mapped//"Add"==self.data//1+self.data//3),
+                            "Inserting a column into the spare columns failed")
+            del mapped
+
 
 if __name__=="__main__": # Run some tests manually to allow debugging
     test=ColumnOps_test("test_add")
@@ -40,6 +40,55 @@ def test_sgfilter():
     testd.setas="xyyy"
     assert np.abs(testd//3-1.0).max()<0.07
 
+def test_sg_cache():
+    from scipy.signal import savgol_filter
+    from Stoner.analysis.utils import sg_filter, _sg_tables
+    rng=np.random.default_rng(0)
+    data=rng.normal(size=(5,200))
+    for points,poly,deriv in [(15,1,0),(21,3,1),(7,2,2)]:
+        assert np.allclose(sg_filter(data,points,poly,deriv,0.5),savgol_filter(data,points,poly,deriv,0.5,mode="interp"))
+    hits=_sg_tables.cache_info().hits
+    sg_filter(data[0],21,3,1,0.5)
+    assert _sg_tables.cache_info().hits==hits+1,"Savitzky-Golay coefficients were not cached"
+    with pytest.raises(ValueError):
+        _sg_tables(21,3,1,0.5)[0][0]=1.0
+
+def test_interpolant_cache():
+    x=np.linspace(0,10,501)
+    d=Data(np.column_stack([x,np.sin(x),np.cos(x)]),setas="xyy")
+    grids=[np.linspace(1,2,11),np.linspace(3,9,7)]
+    first=d.interpolate(grids[0],kind="cubic",xcol=0)
+    assert len(d._interpolants)==2,"Interpolants were not cached"
+    batch=d.interpolate(grids,kind="cubic",xcol=0)
+    assert np.allclose(batch[0],first) and np.allclose(batch[1][:,1],np.sin(grids[1]),atol=1E-6),"Batch interpolate failed"
+    d.data[:,1]*=2
+    assert np.allclose(d.interpolate(grids[0],kind="cubic",xcol=0)[:,1],2*np.sin(grids[0]),atol=1E-6),"Stale interpolant used"
+    assert d.spline(ycol=2,result=False) is d.spline(ycol=2,result=False),"Spline was not cached"
+    assert "_interpolants" not in d.clone.__dict__,"Cached interpolants were copied"
+    version=d.data._version
+    d.data[:,2]+=1
+    assert d.data._version!=version,"Writing to a column did not change the data version"
+    assert np.allclose(d.spline(ycol=2,result=False)(x),d.clone.spline(ycol=2,result=False)(x)),"Stale spline used"
+    d.data=d.data[::-1] # A view of the same buffer in a different order
+    assert np.allclose(d.interpolate(grids[0],kind="cubic",xcol=0)[:,1],2*np.sin(grids[0]),atol=1E-6),"Stale interpolant after reversing"
+
+def test_regrid():
+    from scipy.interpolate import griddata
+    from Stoner.analysis.utils import regrid, _regridders
+    rng=np.random.default_rng(1)
+    pts=rng.uniform(size=(400,2))
+    vals=np.column_stack([np.sin(5*pts[:,0]),pts[:,0]*pts[:,1],np.cos(3*pts[:,1])])
+    gx,gy=np.meshgrid(np.linspace(0,1,15),np.linspace(0,1,12))
+    for method in ["nearest","linear","cubic"]:
+        res=regrid((pts[:,0],pts[:,1]),vals,(gx,gy),method=method)
+        assert res.shape==(12,15,3)
+        for i in range(3):
+            exp=griddata(pts,vals[:,i],(gx,gy),method=method)
+            assert np.allclose(res[...,i],exp,equal_nan=True),f"regrid {method} differs from griddata"
+    cached=len(_regridders)
+    regrid(pts,vals[:,0],(gx,gy),method="linear")
+    assert len(_regridders)==cached,"Triangulation was not reused"
+
 def test_extrapolate():
     global testd
     testd.setas="xy"
@@ -24,6 +24,7 @@ from Stoner.folders import PlotFolder
 from Stoner import Data
 from Stoner.core.base import regexpDict
 from Stoner.folders.core import baseFolder
+from Stoner.folders.utils import _ColumnBuilder
 import matplotlib.pyplot as plt
 
 import tempfile
@@ -62,6 +63,13 @@ def test_loader_opts():
     fldr7.concatenate()
     assert fldr7[0].shape==(909,4),"Concatenate failed."
 
+def test_loader_selection():
+    fldr=DataFolder(datadir,pattern="QD-*.dat",columns=["Temperature","Time"],rows=slice(0,10))
+    assert fldr.extra_args=={"columns":["Temperature","Time"],"rows":slice(0,10)},"Selection not passed to the loader"
+    for d in fldr:
+        assert d.column_headers==["Temperature (K)","Time Stamp (sec)"] and len(d)==10,"Folder selection not applied"
+    assert DataFolder(datadir,pattern="QD-*.dat").extra_args=={},"Selection leaked into another folder"
+
 def test_groups_methods():
     fldr=DataFolder(datadir,debug=False,recursive=False)
     fldr.group("Loaded as")
@@ -313,5 +321,58 @@ def test_saving():
 
 
 
+def test_gather_builder():
+    fldr=DataFolder()
+    for i in range(20):
+        d=Data(np.column_stack([np.linspace(0,1,10+i%2),np.ones(10+i%2)*i]),column_headers=["X","Y"],setas="xy")
+        d["Field"]=float(i)
+        d.filename=f"curve_{i}.txt"
+        fldr+=d
+    g=fldr.clone.gather(0,1)
+    assert g.shape==(11,21) and g.setas.to_string()=="x"+"y"*20,"Gather with setas failed"
+    assert g.column_headers[1]=="curve_0.txt:Y" and np.all(g[:10,5]==4) and g[10,5]==0,"Gather columns not padded correctly"
+    e=fldr.clone.extract("Field")
+    assert e.shape==(20,1) and np.all(e.column(0)==np.arange(20)),"Extract failed"
+    def _walker(group,trail):
+        builder=_ColumnBuilder(group.type)
+        for ix,f in enumerate(group):
+            builder.add_column(f.y,header=f.filename,setas="y")
+        return builder
+    res=fldr.clone.walk_groups(_walker,group=True)
+    assert isinstance(res,Data) and res.shape==(11,20),"walk_groups did not build the _ColumnBuilder"
+
+def test_stitch():
+    fldr=DataFolder()
+    truth=[(0.0,1.0,0.0),(0.0,2.0,-1.0),(0.0,0.5,3.0),(0.0,1.5,0.5)]
+    for i,(A,B,C) in enumerate(truth):
+        x=np.linspace(i,i+1.5,300+7*i) # Different numbers of points in each segment
+        y=np.sin(3*x)+x**2/10
+        d=Data(np.column_stack([x,(y-C)/B]),column_headers=["X","Y"],setas="xy")
+        d.filename=f"seg_{i}.txt"
+        fldr+=d
+    fldr.stitch(mode="Scale and shift y")
+    for d,coeffs in zip(fldr,truth):
+        assert np.allclose(d["Stitching Coefficients"],coeffs[1:],atol=1E-3),"Bulk stitch coefficients wrong"
+        assert np.allclose(d.y,np.sin(3*d.x)+d.x**2/10,atol=1E-3),"Bulk stitch did not transform data"
+    assert fldr[1]["Stitching overlap"]==(1.0,1.5)
+    fldr[2].x+=10
+    with pytest.raises(ValueError):
+        fldr.stitch()
+
+def test_peaks_threshold():
+    fldr=DataFolder()
+    x=np.linspace(0,20,501)
+    for i in range(5):
+        d=Data(np.column_stack([x,np.sin(x*(1+0.05*i))]),column_headers=["X","Y"],setas="xy")
+        d.filename=f"sin_{i}.txt"
+        fldr+=d
+    for stacked,single in zip(fldr.peaks(width=20,full_data=False),[d.peaks(width=20,full_data=False) for d in fldr]):
+        assert np.allclose(stacked,single),"Stacked peak finding in a folder differs from one file at a time"
+    for stacked,single in zip(fldr.threshold(0.5,all_vals=True),[d.threshold(0.5,all_vals=True) for d in fldr]):
+        assert np.allclose(np.asarray(stacked),np.asarray(single)),"Stacked threshold in a folder differs"
+    fldr[2].x+=1 # Different x data - falls back to working through the files
+    rows=fldr.peaks(width=20)
+    assert len(rows)==5 and rows[0].shape==(3,2),"peaks in a folder with different x data failed"
+
 if __name__=="__main__": # Run some tests manually to allow debugging
     pytest.main(["--pdb",__file__])
@@ -82,5 +82,40 @@ def test_metadata_slice():
     with pytest.raises(KeyError):
         ret=fldr6.metadata["Datatype,Comment"]
 
+
+
+def test_metadata_table():
+    os.chdir(datadir)
+    fldr6=DataFolder(".",pattern="QD*.dat",pruned=True)
+    fldr6.sort()
+    fldr6[0]["extra"]=1.5
+    fldr6[2]["extra"]=2.5
+    fldr6[1]["vec"]=[1,2]
+    fldr6[3]["vec"]=[3,4,5]
+    ret=fldr6.metadata.slice("extra",output="data",mask_missing=True)
+    assert np.all(ret.mask[:,0]==[False,True,False,True]),"Missing metadata not masked."
+    assert np.allclose(ret.data[[0,2],0],[1.5,2.5]),"Columnar metadata values wrong."
+    frame=fldr6.metadata.slice("vec",output="frame",mask_missing=True)
+    assert list(frame.columns)==["vec[0]","vec[1]","vec[2]"],"List valued metadata not expanded."
+    assert np.isnan(frame["vec[2]"][1]) and frame["vec[2]"][3]==5,"Expanded list metadata wrong."
+    table=fldr6.__dict__["_metadata_table"]
+    assert table.key_counts["extra"]==2
+    fldr6[1]["extra"]=3.5
+    assert np.allclose(fldr6.metadata["extra"].data,[1.5,3.5,2.5,np.nan],equal_nan=True),"Table not updated after change."
+    assert fldr6.__dict__["_metadata_table"] is table,"Metadata table not reused."
+    assert fldr6.metadata.common_metadata["Startupaxis-X"]==fldr6[0]["Startupaxis-X"]
+    del fldr6.metadata["extra"]
+    assert "extra" not in fldr6.metadata.all_keys(),"Table not updated after deleting a key."
+    value=fldr6[0].metadata.pop("Startupaxis-X")
+    fldr6[0]["Startupaxis-X"]=value+1
+    assert fldr6.metadata.slice("Startupaxis-X",output="list")[0]==value+1,"Table not updated after pop and set."
+    fldr6[2].metadata={"replaced":True}
+    assert fldr6.metadata.slice("replaced",output="list",mask_missing=True)[2],"Table not updated for new dictionary."
+    fldr6[1]["vec"].append(9)
+    assert fldr6.metadata.slice("vec",output="array",mask_missing=True)[1,2]==9,"Nested change to metadata missed."
+    del fldr6[0]
+    assert fldr6.__dict__.get("_metadata_table") is None,"Metadata table kept after deleting a member."
+    assert len(fldr6.metadata.slice("replaced",output="list",mask_missing=True))==len(fldr6)
+
 if __name__=="__main__": # Run some tests manually to allow debugging
     pytest.main(["--pdb",__file__])
\ No newline at end of file
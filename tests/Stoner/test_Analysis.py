@@ -61,6 +61,20 @@ class Analysis_test(unittest.TestCase):
         self.assertTrue(np.allclose(result,np.array([[ 24.5,   0. ],[124.5,   0. ],[224.5,   0. ],[324.5,   0. ]])),
                         "Failed threshold with False scol - result was {}".format(result))
 
+    def test_threshold_columns(self):
+        x=np.linspace(0,20,1001)
+        d=Data(np.column_stack([x,np.sin(x),np.cos(x)]),setas="xyy")
+        both=d.threshold(0.5,col=[1,2],all_vals=True)
+        for ix,col in enumerate([1,2]):
+            self.assertTrue(np.allclose(np.asarray(both[ix]),np.asarray(d.threshold(0.5,col=col,all_vals=True))),
+                            "Threshold on several columns differs from one column at a time")
+        self.assertTrue(np.allclose(d.threshold([0.25,0.5],col=1),[d.threshold(0.25,col=1),d.threshold(0.5,col=1)]))
+        peaks=d.peaks(ycol=[1,2],width=20,full_data=False)
+        self.assertTrue(np.allclose(peaks[0],np.pi*np.array([0.5,2.5,4.5]),atol=1E-3),"Multi-column peaks failed")
+        self.assertTrue(np.allclose(peaks[1],np.pi*np.array([2,4]),atol=1E-3),"Multi-column peaks failed")
+        with self.assertRaises(RuntimeError):
+            d.peaks(ycol=[1,2],modify=True)
+
     def test_apply(self):
         self.app=Data(np.zeros((100,1)),setas="y")
         self.app.apply(lambda r:r.i[0],header="Counter")
@@ -71,6 +85,34 @@ class Analysis_test(unittest.TestCase):
         self.app.setas="xy"
         self.assertAlmostEqual(self.app.integrate(output="result"),18.87616564214,msg="Integrate after aplies failed.")
 
+    def test_apply_vectorised(self):
+        calls=[]
+        def calc(r,omega=1.0):
+            calls.append(r.ndim)
+            return np.sin(r.y*omega)
+        d=Data(np.column_stack([np.arange(50.0),np.linspace(0,5,50)]),setas="xy")
+        buffer=np.ma.getdata(d.data)
+        d.apply(calc,header="Sin",omega=2.0)
+        self.assertEqual(calls.count(2),2,"Vectorisable function was not called with the whole data")
+        self.assertTrue(np.allclose(d.y,np.sin(np.linspace(0,10,50))),"Vectorised apply gave the wrong answer")
+        self.assertTrue(np.shares_memory(np.ma.getdata(d.data),buffer),"Replacing a column reallocated the data")
+        self.assertEqual(d.column_headers[1],"Sin","Header not set when replacing a column")
+        d.apply(lambda r:float(r.i)*2,header="Counter")
+        self.assertTrue(np.allclose(d.y,np.arange(0,100,2)),"Row by row fallback failed")
+        calls.clear()
+        d.apply(calc,vectorised=False)
+        self.assertTrue(all(c==1 for c in calls),"vectorised=False did not work row by row")
+        calls.clear()
+        def counter(r):
+            calls.append(r.ndim)
+            return float(r.i)
+        d.apply(counter,header="Counter")
+        self.assertEqual((calls.count(1),calls.count(2)),(50,1),"Trial rows were evaluated more than once")
+        d.apply(lambda r:r.x[:5]*3 if r.ndim==2 else r.x*3,header="Triple") # Only looks vectorised for 5 rows
+        self.assertTrue(np.allclose(d.y,np.arange(50)*3),"Full data result not checked before using it")
+        with self.assertRaises(ValueError):
+            d.apply(lambda r:np.ones(3),vectorised=True)
+
     def test_scale(self):
         x=np.linspace(-5,5,101)
         y=np.sin(x)
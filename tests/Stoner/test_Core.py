@@ -12,6 +12,7 @@ import pandas as pd
 import pytest
 from numpy import all,sqrt,nan
 from collections.abc import MutableMapping
+from copy import copy
 
 pth=path.dirname(__file__)
 pth=path.realpath(path.join(pth,"../../"))
@@ -364,6 +365,64 @@ def test_methods():
 
 
 
+def test_row_buffer():
+    d=Data(np.zeros((1,3)),column_headers=["a","b","c"],setas="xy.")
+    for i in range(1,100):
+        d+=np.array([i,2*i,3*i])
+    assert d.shape==(100,3) and np.all(d.x==np.arange(100)),"Appending rows one at a time failed"
+    assert d._row_buffer.data.shape[0]>=100 and np.shares_memory(d.data,d._row_buffer.data),"Data is not a view of the row buffer"
+    assert d.setas.to_string()=="xy." and d.column_headers==["a","b","c"],"setas lost when appending rows"
+    d.mask[5,1]=True
+    d+={"a":100,"c":300}
+    assert d.mask[5,1] and np.all(d.mask[-1]==[False,True,False]),"Masks not kept when appending rows"
+    d.insert_rows(0,np.array([[-1,-1,-1]]))
+    assert d[0,0]==-1 and d[1,0]==0 and d.mask[6,1] and len(d)==102,"Insert rows into the buffer failed"
+    e=d.clone
+    e+=np.array([0,0,0])
+    assert len(d)==102 and len(e)==103,"Appending to a clone changed the original"
+    d.data=d.data[:10]
+    d+=np.array([1,2,3])
+    assert len(d)==11 and np.all(d[-1]==[1,2,3]),"Append after replacing the data failed"
+    held=d.data
+    shallow=copy(d)
+    d.insert_rows(0,np.array([[9,9,9]]))
+    assert held[0,0]==-1 and shallow.data[0,0]==-1 and len(held)==11,"Inserting rows changed a held reference"
+    d+=np.array([4,5,6])
+    d.data[1,0]=42
+    assert held[0,0]==-1 and len(d)==13 and d[0,0]==9,"Data still shared with a held reference after appending"
+    d+=np.array([7,8,9])
+    buffer=d._row_buffer
+    d+=np.array([7,8,9])
+    assert d._row_buffer is buffer and not buffer.exported,"Appending copied rows that were not handed out"
+    col=d.x
+    assert buffer.exported,"Handing out a column did not mark the rows as exported"
+    d.insert_rows(0,np.array([[0,0,0]]))
+    assert col[0]==9 and d._row_buffer is not buffer and not d._row_buffer.exported,"Rows not copied before changing"
+
+def test_stream(tmp_path):
+    d=Data(np.column_stack([np.arange(50.),np.arange(50.)**2]),column_headers=["t","v"])
+    d["Temp"]=4.2
+    fn=str(tmp_path/"live.txt")
+    d.save(fn)
+    with open(fn) as f:
+        text=f.read()
+    cut=text.index("\n",len(text)//2)+3 # Leave a partial line at the end
+    with open(fn,"w") as f:
+        f.write(text[:cut])
+    live=Data()
+    reader=live.stream(fn)
+    first=reader.read()
+    assert live.column_headers==["t","v"] and live["Temp"]==4.2 and len(live)==first.shape[0],"Initial stream read failed"
+    with open(fn,"w") as f:
+        f.write(text+"\t50\t2500\n")
+    blocks=list(reader.follow(interval=0.01,timeout=0.05,context=2))
+    assert len(blocks)==1 and len(blocks[0])==51-first.shape[0]+2,"follow() did not yield just the new rows"
+    assert len(live)==51 and np.allclose(live.data[:50],d.data) and live[-1,1]==2500,"Streamed rows wrong"
+    assert np.shares_memory(live.data,live._row_buffer.data),"Streamed rows not appended through the row buffer"
+    small=Data()
+    rows=small.stream(fn,chunk_size=64).read() # Many chunks, most ending part way through a line
+    assert len(small)==51 and np.allclose(rows,live.data) and small["Temp"]==4.2,"Reading in small chunks failed"
+
 def test_metadata_save():
     global selfd, selfd1, selfd2, selfd3, selfd4
     local = path.dirname(__file__)
@@ -14,6 +14,7 @@ from Stoner.Core import DataFile
 from Stoner.compat import Hyperspy_ok
 
 import pytest
+import numpy as np
 
 from Stoner.formats.attocube import AttocubeScan
 from Stoner.tools.classes import subclasses
@@ -61,6 +62,19 @@ def test_one_file(tmpdir, filename):
         pathlib.Path(loaded.filename).unlink()
 
 
+def test_load_selection():
+    for name in ["QD-MH.dat","TDI_Format_RT.txt","RASOR.dat","APS_Data.txt","Birge_Group_IV.dat"]:
+        full=Data(datadir/name)
+        columns=[full.column_headers[-1],full.column_headers[0]]
+        part=Data(datadir/name,columns=columns,rows=slice(2,7))
+        assert part["Loaded as"]==full["Loaded as"],f"{name} loaded with a different class when selecting data"
+        assert part.column_headers==columns,f"Wrong columns loaded from {name}"
+        assert np.array_equal(part.data,full.data[2:7,[-1,0]],equal_nan=True),f"Wrong data loaded from {name}"
+    part=Data(datadir/"QD-MH.dat",columns=["Field","Moment"],rows=-1)
+    assert part.shape==(1,2) and part.setas.to_list()==[".","y"],"Setas not mapped onto the selected QD columns"
+    with pytest.raises(KeyError):
+        Data(datadir/"QD-MH.dat",columns=["Not a column"])
+
 def test_csvfile():
 
     csv=Data(datadir/"working"/"CSVFile_test.dat",filetype="JustNumbers",column_headers=["Q","I","dI"],setas="xye")
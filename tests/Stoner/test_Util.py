@@ -10,7 +10,8 @@ Created on Mon Jul 18 14:13:39 2016
 import sys
 import os.path as path
 import Stoner.Util as SU
-from Stoner import Data
+from Stoner import Data, DataFolder
+import numpy as np
 import pytest
 
 pth=path.dirname(__file__)
@@ -45,7 +46,39 @@ def test_split_up_down():
                    "BH_Max_H" in x),"Hystersis loop analysis keys not present."
 
     assert x["Hc_mean"]-570<1.0,"Failed to find correct Hc in a SQUID loop"
-    assert isinstance(x["Area"],float) and -0.0055<x["Area"]<-0.0054,"Incorrect calculation of area under loop"
+    assert isinstance(x["Area"],float) and -0.0076<x["Area"]<-0.0074,"Incorrect calculation of area under loop"
+    assert np.shares_memory(fldr["rising"][0].data,testd.data),"split_up_down copied the data"
+    fldr=SU.split_up_down(testd,copy=True)
+    assert not np.shares_memory(fldr["rising"][0].data,testd.data),"split_up_down didn't copy the data"
+
+def test_sweep_segments():
+    x=np.tile(np.append(np.linspace(-1,1,21),np.linspace(1,-1,21)[1:-1]),100)
+    x+=np.random.default_rng(1).normal(scale=0.01,size=x.size)
+    ranges,rising=SU.sweep_segments(x)
+    assert len(ranges)==200 and np.all(rising[::2]) and not np.any(rising[1::2]),"Sweeps not found correctly"
+    assert ranges[0,0]==0 and ranges[-1,1]==x.size and np.all(ranges[1:,0]==ranges[:-1,1]),"Sweep ranges don't join up"
+    assert np.all(np.abs(np.diff(ranges[:-1],axis=1)-20)<=1),"Sweeps split at the wrong points"
+
+
+def test_hysteresis_batch():
+    testd=Data(path.join(pth,"./sample-data/QD-SQUID-VSM.dat"),setas="3.xy")
+    single=SU.hysteresis_correct(testd,saturated_fraction=0.25)
+    fldr=DataFolder(readlist=False)
+    fldr+=testd
+    fldr+=testd.clone
+    fldr[1].del_rows(0) # A different length of loop is analysed in a separate batch
+    res=SU.hysteresis_batch(fldr,saturated_fraction=0.25)
+    assert res.shape==(2,len(res.column_headers)),"Wrong shape of results table from hysteresis_batch"
+    assert np.allclose(res.column("Ms"),single["Ms"]),"Batch Ms disagrees with hysteresis_correct"
+    assert np.allclose(res.column("Hc_mean"),single["Hc_mean"],rtol=0.01),"Batch Hc disagrees with hysteresis_correct"
+    assert np.allclose(res.column("Hsat_mean"),single["Hsat_mean"],rtol=0.01),"Batch Hsat disagrees with hysteresis_correct"
+    assert np.allclose(res.column("Area"),single["Area"],rtol=0.01),"Batch area disagrees with hysteresis_correct"
+    stack=np.stack([testd.y,2*testd.y])
+    res=SU.hysteresis_batch(stack,field=testd.x,saturated_fraction=0.25)
+    assert np.allclose(res.column("Ms"),[single["Ms"],2*single["Ms"]]),"Batch Ms of a stack of loops wrong"
+    assert np.allclose(res.column("Hc_mean"),res.column("Hc_mean")[0]),"Scaling a loop changed Hc"
+    with pytest.raises(ValueError):
+        SU.hysteresis_batch(stack,field=testd.x,h_sat_method="delta_M")
 
 
 
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+"""Check that importing Stoner leaves the heavy modules to be loaded lazily."""
+
+import subprocess
+import sys
+import json
+from os import path
+
+import pytest
+
+import Stoner
+
+pth=path.realpath(path.join(path.dirname(__file__),"../../"))
+
+_script="""
+import json, sys
+import Stoner
+heavy=("matplotlib","scipy.optimize","scipy.interpolate","skimage","lmfit","hyperspy","h5py",
+       "Stoner.Core","Stoner.Image","Stoner.plot","Stoner.analysis.fitting","Stoner.formats.generic")
+print(json.dumps({"loaded":[m for m in heavy if m in sys.modules]}))
+"""
+
+def _run(script):
+    """Run a script in a fresh interpreter and return its json output."""
+    result=subprocess.run([sys.executable,"-c",script],cwd=pth,capture_output=True,text=True,check=True)
+    return json.loads(result.stdout.strip().split("\n")[-1])
+
+def test_import_is_lazy():
+    res=_run(_script)
+    assert res["loaded"]==[],f"import Stoner loaded {res['loaded']} eagerly"
+
+def test_lazy_attributes():
+    res=_run("""
+import json, sys
+import Stoner
+from Stoner import Data
+print(json.dumps({"data":Data.__name__,"plot":"Stoner.plot" in sys.modules,"formats":Stoner.formats.registry["QDFile"]}))
+""")
+    assert res=={"data":"Data","plot":True,"formats":"Stoner.formats.instruments"},"Lazy import of Stoner.Data failed"
+    with pytest.raises(AttributeError):
+        Stoner.not_a_module
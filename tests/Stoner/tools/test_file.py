@@ -0,0 +1,30 @@
+# -*- coding: utf-8 -*-
+"""Test Stoner.tools.file module."""
+
+import io
+
+import pytest
+import numpy as np
+
+from Stoner.tools.file import read_delimited
+
+def test_read_delimited(tmp_path):
+    text="Header\n,1,2,,3\r\n,4,5,6,\n\n,,,9,10\n,7,8,9,10\n"
+    fname=tmp_path/"test.csv"
+    fname.write_bytes(text.encode())
+    expected=np.genfromtxt(io.BytesIO(text.encode()),delimiter=",",skip_header=1)
+    for chunk_size in [4,1<<20]:
+        data=read_delimited(fname,skip_header=1,chunk_size=chunk_size)
+        assert np.array_equal(data,expected,equal_nan=True),f"Empty fields not read as NaN with chunk_size {chunk_size}"
+    assert np.array_equal(read_delimited(fname,skip_header=1,usecols=[1,3]),expected[:,[1,3]],equal_nan=True)
+    fname.write_bytes(b"1 --- 2\n3 4 6:0\n")
+    assert np.array_equal(read_delimited(fname,delimiter=None,missing=["---","6:0"]),[[1,np.nan,2],[3,4,np.nan]],
+                          equal_nan=True),"Missing value markers not read as NaN"
+    fname.write_bytes(b"1,2,3\n4,5\n6,7,8\n")
+    with pytest.raises(ValueError):
+        read_delimited(fname)
+    assert read_delimited(fname,invalid_raise=False).shape==(2,3),"Ragged row not skipped"
+
+
+if __name__ == "__main__":
+    pytest.main()